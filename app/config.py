@@ -2,12 +2,19 @@
 Base settings file for FastApi application.
 """
 
+import atexit
 import logging.config
 import os
 import secrets
+from typing import Any
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .loggers.queue_handler import (
+    QueueOverflowPolicy,
+    setup_queue_logging,
+    stop_queue_logging,
+)
 from .loggers.safe_logger import SafeJsonFormatter
 
 
@@ -21,19 +28,66 @@ class Settings(BaseSettings):
     TEST: bool = False
     LOG_LEVEL: str = "INFO"
     LOG_LEVEL_EVENTS_SERVICE: str = "INFO"
+    LOG_QUEUE_ENABLED: bool = False
+    LOG_QUEUE_MAX_SIZE: int = 10000
+    LOG_QUEUE_OVERFLOW_POLICY: QueueOverflowPolicy = QueueOverflowPolicy.DROP_OLDEST
+    HTTP_LOG_SAMPLE_RATE: float = 1.0
+    HTTP_LOG_SLOW_REQUEST_MS: int = 1000
     REDIS_URL: str = "redis://"
+    CACHE_MULTISIG_TRANSACTIONS_TTL_SECONDS: int = 300
     DATABASE_URL: str = "psql://postgres:"
     DATABASE_POOL_CLASS: str = "AsyncAdaptedQueuePool"
     DATABASE_POOL_SIZE: int = 10
+    # Optional read replica, read only sessions use the primary database if not set
+    DATABASE_READ_URL: str | None = None
+    DATABASE_READ_POOL_SIZE: int = 10
+    DATABASE_BULK_UPSERT_CHUNK_SIZE: int = 1000
+    DATABASE_STREAM_YIELD_PER: int = 1000
+    DATABASE_SLOW_QUERY_MS: int = 500
+    DATABASE_REPEATED_QUERY_THRESHOLD: int = 10
+    DATABASE_CONNECTION_HOLD_WARNING_MS: int = 1000
     RABBITMQ_AMQP_URL: str = "amqp://guest:guest@"
     RABBITMQ_AMQP_EXCHANGE: str = "safe-transaction-service-events"
     RABBITMQ_QUEUE_EVENTS_QUEUE_NAME: str = "queue-service"
+    RABBITMQ_PREFETCH_COUNT: int = 200
+    RABBITMQ_CONSUMER_MAX_CONCURRENCY: int = 50
+    RABBITMQ_CONSUMER_BATCH_SIZE: int = 100
+    RABBITMQ_CONSUMER_BATCH_TIMEOUT_MS: int = 500
+    # Delay before every retry of a failed message, it's dead lettered after the last one
+    RABBITMQ_RETRY_DELAYS_MS: list[int] = [1_000, 10_000, 100_000]
+    # Route events to this number of queues by Safe address and split them between
+    # workers, so events of a Safe are processed in order. Disabled if `0`
+    RABBITMQ_PARTITIONS: int = 0
+    PARTITIONS_HEARTBEAT_SECONDS: int = 5
+    # Workers without a heartbeat for this time lose their partitions
+    PARTITIONS_WORKER_TTL_SECONDS: int = 15
+    # Exchange for the events emitted by this service
+    RABBITMQ_AMQP_PUBLISH_EXCHANGE: str = "safe-queue-service-events"
+    RABBITMQ_PUBLISH_CHANNEL_POOL_SIZE: int = 4
+    # Publishing waits while there are more messages pending to be confirmed
+    RABBITMQ_PUBLISH_MAX_UNCONFIRMED: int = 1000
+    RABBITMQ_PUBLISH_RECONNECT_TIMEOUT_SECONDS: int = 30
+    # Changes feed only returns transactions modified before this lag, `modified` is set
+    # before the commit, so transactions committing later than this could be skipped
+    CHANGES_SAFETY_LAG_SECONDS: float = 5
+    OUTBOX_RELAY_BATCH_SIZE: int = 100
+    OUTBOX_RELAY_POLL_INTERVAL_MS: int = 1000
+    # Max time to wait for the broker confirmations while the batch rows are locked
+    OUTBOX_RELAY_PUBLISH_TIMEOUT_SECONDS: float = 30
+    EVENTS_SUBSCRIBER_QUEUE_SIZE: int = 100
+    EVENTS_HEARTBEAT_SECONDS: int = 15
+    # Drop redelivered events already processed by `EventsService`, by AMQP `message_id`
+    EVENTS_DEDUP_ENABLED: bool = False
+    # Processed message ids remembered by `EventDeduplicator`, in memory and optionally in Redis
+    EVENTS_DEDUP_CACHE_SIZE: int = 100_000
+    EVENTS_DEDUP_REDIS_ENABLED: bool = False
+    EVENTS_DEDUP_TTL_SECONDS: int = 3600
     SECRET_KEY: str = secrets.token_urlsafe(32)
 
 
 settings = Settings()
 
-LOGGING_CONFIG = {
+LOGGING_CONFIG: dict[str, Any] = {
     "version": 1,
     "disable_existing_loggers": False,
     "formatters": {"json": {"()": SafeJsonFormatter}},  # Custom formatter class
@@ -59,3 +113,12 @@ LOGGING_CONFIG = {
 }
 
 logging.config.dictConfig(LOGGING_CONFIG)
+
+if settings.LOG_QUEUE_ENABLED:
+    # Format and write logs in a background thread instead of the event loop
+    setup_queue_logging(
+        [logging.getLogger(name) for name in LOGGING_CONFIG["loggers"]],
+        settings.LOG_QUEUE_MAX_SIZE,
+        settings.LOG_QUEUE_OVERFLOW_POLICY,
+    )
+    atexit.register(stop_queue_logging)
@@ -0,0 +1,149 @@
+import logging
+
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from ...config import settings
+from .redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Store the page only if the key was not invalidated since `ARGV[4]` generation was read,
+# so a page built from data read before an invalidation is not cached after it.
+# Set the expiration only when the hash is created, so a missed invalidation
+# cannot be extended forever by clients polling the same key
+_HSET_WITH_TTL_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[4] then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+if redis.call('TTL', KEYS[1]) < 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return 1
+"""
+
+
+class PageCache:
+    """
+    Read-through cache for already serialized responses.
+
+    Pages are stored as fields of one Redis hash per key (e.g. a Safe address),
+    so every page for a key is invalidated at once with a single `DEL`. Every invalidation
+    also increments the generation of the key, pages are only stored if the generation
+    didn't change since `get_generation` was called, before reading the data.
+    Redis errors are logged and handled as cache misses, the cache is never required to serve a request.
+    """
+
+    def __init__(self, prefix: str, ttl: int) -> None:
+        """
+        :param prefix: Prefix for the Redis keys
+        :param ttl: Seconds until a key expires even if it was not invalidated
+        """
+        self.prefix = prefix
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._hset_with_ttl: AsyncScript | None = None
+
+    def _get_redis_key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def _get_generation_redis_key(self, key: str) -> str:
+        return f"{self.prefix}-generation:{key}"
+
+    def _get_hset_with_ttl_script(self) -> AsyncScript:
+        """
+        :return: Script registered once per Redis client
+        """
+        redis = get_redis()
+        if (
+            self._hset_with_ttl is None
+            or self._hset_with_ttl.registered_client is not redis
+        ):
+            self._hset_with_ttl = redis.register_script(_HSET_WITH_TTL_SCRIPT)
+        return self._hset_with_ttl
+
+    async def get_generation(self, key: str) -> int | None:
+        """
+        Must be called before reading the data of a page to store it with `set`.
+
+        :param key:
+        :return: Current generation of the key, `None` if Redis is not available
+        """
+        try:
+            generation = await get_redis().get(self._get_generation_redis_key(key))
+        except RedisError:
+            logger.warning(f"Cannot get generation for {key} from cache", exc_info=True)
+            return None
+        return int(generation or 0)
+
+    async def get(self, key: str, field: str) -> bytes | None:
+        """
+        :param key:
+        :param field: Page identifier inside the key
+        :return: The cached payload, `None` if not found
+        """
+        try:
+            payload = await get_redis().hget(self._get_redis_key(key), field)  # type: ignore[misc]
+        except RedisError:
+            logger.warning(f"Cannot get {field} for {key} from cache", exc_info=True)
+            payload = None
+
+        if payload is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return payload
+
+    async def set(
+        self, key: str, field: str, payload: bytes, generation: int | None
+    ) -> bool:
+        """
+        :param key:
+        :param field: Page identifier inside the key
+        :param payload: Serialized page
+        :param generation: Generation returned by `get_generation` before reading the page data
+        :return: `True` if stored, `False` if the key was invalidated since `generation`
+        """
+        if generation is None:
+            return False
+        try:
+            return bool(
+                await self._get_hset_with_ttl_script()(
+                    keys=[
+                        self._get_redis_key(key),
+                        self._get_generation_redis_key(key),
+                    ],
+                    args=[field, payload, self.ttl, generation],
+                )
+            )
+        except RedisError:
+            logger.warning(f"Cannot store {field} for {key} in cache", exc_info=True)
+            return False
+
+    async def invalidate(self, *keys: str) -> None:
+        """
+        Remove every cached page for the provided keys and increment their generation
+        in one round trip.
+
+        :param keys:
+        """
+        if not keys:
+            return
+        try:
+            async with get_redis().pipeline(transaction=True) as pipeline:
+                pipeline.delete(*[self._get_redis_key(key) for key in keys])
+                for key in keys:
+                    generation_key = self._get_generation_redis_key(key)
+                    pipeline.incr(generation_key)
+                    # Only needs to outlive the requests reading the data of a page
+                    pipeline.expire(generation_key, self.ttl)
+                await pipeline.execute()
+        except RedisError:
+            logger.warning(f"Cannot invalidate cache for {keys}", exc_info=True)
+
+
+multisig_transactions_cache = PageCache(
+    "multisig-transactions", settings.CACHE_MULTISIG_TRANSACTIONS_TTL_SECONDS
+)
@@ -0,0 +1,15 @@
+from functools import cache
+
+from redis.asyncio import Redis
+
+from ...config import settings
+
+
+@cache
+def get_redis() -> Redis:
+    """
+    Get the Redis client for `REDIS_URL`
+
+    :return:
+    """
+    return Redis.from_url(settings.REDIS_URL)
@@ -3,7 +3,7 @@ import uuid
 from collections.abc import Generator
 from contextlib import contextmanager
 from contextvars import ContextVar
-from functools import cache, wraps
+from functools import cache, partial, wraps
 
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -11,9 +11,12 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 
 from ...config import settings
+from ...metrics import db_pool_connections, registry
+from .instrumentation import instrument_engine, track_queries
 
 logger = logging.getLogger(__name__)
 
@@ -23,48 +26,92 @@ pool_classes = {
 }
 
 _db_session_context: ContextVar[str] = ContextVar("db_session_context")
+_db_read_only_context: ContextVar[bool] = ContextVar(
+    "db_read_only_context", default=False
+)
 
 
-@cache
-def get_engine() -> AsyncEngine:
-    """
-    Establish connection to database
-    :return:
-    """
+def _create_engine(url: str, pool_size: int) -> AsyncEngine:
     if settings.TEST:
-        return create_async_engine(
-            settings.DATABASE_URL,
+        engine = create_async_engine(
+            url,
             future=True,
             poolclass=NullPool,
         )
     else:
-        return create_async_engine(
-            settings.DATABASE_URL,
+        engine = create_async_engine(
+            url,
             future=True,
             poolclass=pool_classes.get(settings.DATABASE_POOL_CLASS),
-            pool_size=settings.DATABASE_POOL_SIZE,
+            pool_size=pool_size,
         )
+    instrument_engine(engine)
+    return engine
+
+
+@cache
+def get_engine() -> AsyncEngine:
+    """
+    Establish connection to database
+    :return:
+    """
+    return _create_engine(settings.DATABASE_URL, settings.DATABASE_POOL_SIZE)
+
+
+@cache
+def get_read_engine() -> AsyncEngine:
+    """
+    Establish connection to the read replica database, with its own pool.
+
+    :return: Primary engine if `DATABASE_READ_URL` is not configured
+    """
+    if not settings.DATABASE_READ_URL:
+        return get_engine()
+    return _create_engine(settings.DATABASE_READ_URL, settings.DATABASE_READ_POOL_SIZE)
 
 
 @contextmanager
 def set_database_session_context(
     session_id: str | None = None,
+    read_only: bool = False,
 ) -> Generator[None]:
     """
     Set session ContextVar, at the end it will be removed.
     This context is designed to be used with `async_scoped_session` to define a context scope.
+    Statements repeated more than `DATABASE_REPEATED_QUERY_THRESHOLD` times in the session
+    are logged as a possible N+1 query pattern.
 
     :param session_id:
+    :param read_only: Route queries to the read replica until the session writes
     :return:
     """
     _session_id: str = session_id or str(uuid.uuid4())
     logger.debug("Storing db_session context")
     token = _db_session_context.set(_session_id)
+    read_only_token = _db_read_only_context.set(read_only)
     try:
-        yield
+        with track_queries(session_id=_session_id) as query_stats:
+            yield
     finally:
         logger.debug("Removing db_session context")
+        _db_read_only_context.reset(read_only_token)
         _db_session_context.reset(token)
+        for statement, count in query_stats.get_repeated_statements(
+            settings.DATABASE_REPEATED_QUERY_THRESHOLD
+        ).items():
+            logger.warning(
+                f"Possible N+1 query, statement executed {count} times: {statement}",
+                extra={"db_session": _session_id},
+            )
+
+
+async def read_only_database_session() -> None:
+    """
+    FastAPI dependency routing the queries of the request session to the read replica,
+    until the session writes. Declared `async`, so the ContextVar is set in the request
+    context and not in a threadpool copy.
+    """
+    _db_read_only_context.set(True)
 
 
 def _get_database_session_context() -> str:
@@ -77,16 +124,20 @@ def _get_database_session_context() -> str:
     return _db_session_context.get()
 
 
-def db_session_context(func):
+def db_session_context(func=None, *, read_only: bool = False):
     """
     Wrap the decorated function in the `set_database_session_context` context.
     Decorated function will share the same database session.
     Remove the session at the end of the context.
+
+    Use `@db_session_context(read_only=True)` to route the queries to the read replica.
     """
+    if func is None:
+        return partial(db_session_context, read_only=read_only)
 
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        with set_database_session_context():
+        with set_database_session_context(read_only=read_only):
             try:
                 return await func(*args, **kwargs)
             finally:
@@ -98,7 +149,44 @@ def db_session_context(func):
     return wrapper
 
 
-async_session_factory = async_sessionmaker(get_engine(), expire_on_commit=False)
+class RoutingSession(Session):
+    """
+    Session routing read only contexts to `get_read_engine`.
+
+    Once the session writes (flush or DML statement) every following statement goes to
+    the primary database, so the session reads its own writes even if the replica lags.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info["has_written"] = True
+        if _db_read_only_context.get() and not self.info.get("has_written"):
+            return get_read_engine().sync_engine
+        return get_engine().sync_engine
+
+
+async_session_factory = async_sessionmaker(
+    sync_session_class=RoutingSession, expire_on_commit=False
+)
 db_session = async_scoped_session(
     session_factory=async_session_factory, scopefunc=_get_database_session_context
 )
+
+
+def _collect_pool_metrics() -> None:
+    """
+    Update `db_pool_connections` with the pool state of every engine.
+    """
+    engines = {"primary": get_engine()}
+    if settings.DATABASE_READ_URL:
+        engines["read"] = get_read_engine()
+    for name, engine in engines.items():
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            db_pool_connections.set(pool.size(), name, "size")
+            db_pool_connections.set(pool.checkedout(), name, "checked_out")
+            db_pool_connections.set(pool.checkedin(), name, "checked_in")
+            db_pool_connections.set(pool.overflow(), name, "overflow")
+
+
+registry.add_collector(_collect_pool_metrics)
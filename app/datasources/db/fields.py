@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from decimal import Decimal
 
-from sqlalchemy import Numeric
+from sqlalchemy import BigInteger, Numeric
 from sqlalchemy.types import LargeBinary, TypeDecorator
 
 # Max value for Ethereum numeric fields
 UINT256_MAX = 2**256 - 1
+# Max value for a Postgres `BIGINT` (signed 64 bits)
+BIGINT_MAX = 2**63 - 1
 
 
 class Uint256Type(TypeDecorator[int]):
@@ -33,6 +35,26 @@ class Uint256Type(TypeDecorator[int]):
         return int(value)
 
 
+class UintBigIntegerType(TypeDecorator[int]):
+    """
+    Store unsigned values bounded to `BIGINT_MAX` (e.g. nonce or chain id) in a `BIGINT` column.
+    Cheaper to compare, sort and index than `Uint256Type`, and the driver returns `int`
+    so no conversion is needed when reading.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: None | int, dialect) -> None | int:
+        if value is None:
+            return value
+        if not isinstance(value, int):
+            raise TypeError("UintBigIntegerType expects Python int values")
+        if value < 0 or value > BIGINT_MAX:
+            raise ValueError("UintBigIntegerType value out of range")
+        return value
+
+
 class EthereumAddressType(TypeDecorator[bytes]):
     """Persist Ethereum addresses as 20-byte binaries accepting multiple input formats."""
 
@@ -58,31 +80,57 @@ class EthereumAddressType(TypeDecorator[bytes]):
             )
         return self._coerce_to_bytes(value)
 
+    def result_processor(self, dialect, coltype):
+        if self.impl_instance.result_processor(dialect, coltype) is not None:
+            return super().result_processor(dialect, coltype)
+
+        # Drivers like asyncpg return `bytes` already, return them as they are
+        binary_size = self.binary_size
+        process_result_value = self.process_result_value
+
+        def process(value):
+            if value is None or (type(value) is bytes and len(value) == binary_size):
+                return value
+            return process_result_value(value, dialect)
+
+        return process
+
     def _coerce_to_bytes(self, value: str | memoryview | bytes) -> bytes:
-        if isinstance(value, (memoryview, bytes)):
-            raw = bytes(value)
-            if len(raw) != self.binary_size:
-                raise ValueError(
-                    f"{self.__class__.__name__} expects {self.binary_size}-byte values"
+        # `bytes` are immutable, so they are returned without copying
+        if type(value) is not bytes:
+            if isinstance(value, memoryview):
+                value = value.tobytes()
+            elif isinstance(value, bytes):
+                # Subclasses like `HexBytes`
+                value = bytes(value)
+            elif isinstance(value, str):
+                return self._hex_to_bytes(value)
+            else:
+                raise TypeError(
+                    f"{self.__class__.__name__} expects bytes or hex string inputs"
                 )
-            return raw
 
-        if isinstance(value, str):
-            text = value.strip()
-            if text.startswith("0x") or text.startswith("0X"):
-                text = text[2:]
+        if len(value) != self.binary_size:
+            raise ValueError(
+                f"{self.__class__.__name__} expects {self.binary_size}-byte values"
+            )
+        return value
 
-            try:
-                return bytes.fromhex(text)
-            except ValueError as exc:
-                raise ValueError(
-                    f"{self.__class__.__name__} expects a valid hex string"
-                ) from exc
+    def _hex_to_bytes(self, value: str) -> bytes:
+        text = value.strip()
+        if text.startswith("0x") or text.startswith("0X"):
+            text = text[2:]
 
-        raise TypeError(f"{self.__class__.__name__} expects bytes or hex string inputs")
+        try:
+            return bytes.fromhex(text)
+        except ValueError as exc:
+            raise ValueError(
+                f"{self.__class__.__name__} expects a valid hex string"
+            ) from exc
 
 
 class EthereumHashType(EthereumAddressType):
     """Persist Ethereum keccak 32-byte hashes"""
 
     binary_size = 32
+    cache_ok = True
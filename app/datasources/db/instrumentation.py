@@ -0,0 +1,152 @@
+"""
+SQLAlchemy event hooks to time statements and count them per request or database session,
+and to detect connections held for too long.
+"""
+
+import logging
+import time
+from collections import Counter
+from collections.abc import Generator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ...config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    session_id: str | None = None
+    count: int = 0
+    # Seconds
+    total_time: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[statement] += 1
+
+    def get_repeated_statements(self, threshold: int) -> dict[str, int]:
+        """
+        :param threshold:
+        :return: Statements executed at least `threshold` times, usually caused by N+1 query patterns
+        """
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= threshold
+        }
+
+
+# Every `track_queries` context active, from outer (e.g. request) to inner (e.g. database session)
+_active_query_stats: ContextVar[tuple[QueryStats, ...]] = ContextVar(
+    "active_query_stats", default=()
+)
+
+
+@contextmanager
+def track_queries(session_id: str | None = None) -> Generator[QueryStats]:
+    """
+    Count and time every statement executed inside the context.
+    Contexts can be nested, a statement is recorded in every active context.
+
+    :param session_id: Database session the statements belong to
+    :return: Stats updated as statements are executed
+    """
+    query_stats = QueryStats(session_id=session_id)
+    token = _active_query_stats.set((*_active_query_stats.get(), query_stats))
+    try:
+        yield query_stats
+    finally:
+        _active_query_stats.reset(token)
+
+
+def _get_session_id() -> str | None:
+    session_id = None
+    for query_stats in _active_query_stats.get():
+        session_id = query_stats.session_id or session_id
+    return session_id
+
+
+def _redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """
+    :param parameters: Statement parameters
+    :param executemany: `parameters` is a list of parameter sets
+    :return: Parameters with every value replaced, so no data is logged
+    """
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, Mapping):
+        return dict.fromkeys(parameters, "?")
+    if isinstance(parameters, Sequence):
+        return ["?"] * len(parameters)
+    return parameters
+
+
+def _before_cursor_execute(
+    conn: Connection, cursor, statement, parameters, context, executemany
+) -> None:
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Connection, cursor, statement: str, parameters, context, executemany
+) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    for query_stats in _active_query_stats.get():
+        query_stats.record(statement, elapsed)
+
+    elapsed_ms = int(elapsed * 1000)
+    if elapsed_ms >= settings.DATABASE_SLOW_QUERY_MS:
+        logger.warning(
+            f"Slow query took {elapsed_ms} ms: {statement} "
+            f"parameters={_redact_parameters(parameters, executemany)}",
+            extra={"db_session": _get_session_id()},
+        )
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    connection_record.info["checkout_time"] = time.perf_counter()
+
+
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    checkout_time = connection_record.info.pop("checkout_time", None)
+    if checkout_time is None:
+        return
+    held_ms = int((time.perf_counter() - checkout_time) * 1000)
+    if held_ms >= settings.DATABASE_CONNECTION_HOLD_WARNING_MS:
+        # Usually a session kept open (no commit or rollback) across slow awaits
+        logger.warning(
+            f"Database connection held for {held_ms} ms",
+            extra={"db_session": _get_session_id()},
+        )
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    # `after_cursor_execute` is not called for failed statements
+    if context.connection is not None:
+        start_times = context.connection.info.get("query_start_time")
+        if start_times:
+            start_times.pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Time every statement executed by `engine` and how long its pool connections are
+    checked out.
+
+    :param engine:
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+    event.listen(engine.sync_engine, "checkout", _on_checkout)
+    event.listen(engine.sync_engine, "checkin", _on_checkin)
@@ -1,17 +1,53 @@
 import datetime
+import json
+from collections.abc import AsyncIterator, Sequence
 from enum import IntEnum
+from typing import NamedTuple, Self
 
-from sqlalchemy import DateTime, Index, SmallInteger, desc
+from hexbytes import HexBytes
+from safe_eth.eth.utils import fast_to_checksum_address
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    Index,
+    SmallInteger,
+    any_,
+    bindparam,
+    delete,
+    desc,
+    func,
+    literal_column,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.sql import Select
 from sqlmodel import (
     JSON,
     Column,
     Field,
     SQLModel,
+    col,
     select,
 )
 
+from ...config import settings
+from ..cache.page_cache import multisig_transactions_cache
 from .database import db_session
-from .fields import EthereumAddressType, EthereumHashType, Uint256Type
+from .fields import (
+    EthereumAddressType,
+    EthereumHashType,
+    Uint256Type,
+    UintBigIntegerType,
+)
+
+# Max number of bind parameters supported by the PostgreSQL protocol in one statement
+MAX_BIND_PARAMETERS = 32767
+
+
+class BulkUpsertResult(NamedTuple):
+    inserted: int
+    updated: int
 
 
 class SqlQueryBase:
@@ -20,9 +56,135 @@ class SqlQueryBase:
         result = await db_session.execute(select(cls))
         return result.scalars().all()
 
+    @classmethod
+    def iter_all(cls, yield_per: int | None = None) -> AsyncIterator[Self]:
+        """
+        Iterate every instance without loading the whole table in memory, see `stream`.
+
+        :param yield_per:
+        :return:
+        """
+        return cls.stream(select(cls), yield_per=yield_per)
+
+    @classmethod
+    async def stream(
+        cls, query: Select, yield_per: int | None = None
+    ) -> AsyncIterator[Self]:
+        """
+        Execute `query` using a server side cursor, only `yield_per` rows are fetched
+        and kept in memory at once. The database connection is in use until the iteration finishes.
+
+        :param query: Query selecting instances of the model
+        :param yield_per: Rows fetched per round trip, `DATABASE_STREAM_YIELD_PER` by default.
+        :return: Instances as they are fetched
+        """
+        result = await db_session.stream_scalars(
+            query.execution_options(
+                yield_per=yield_per or settings.DATABASE_STREAM_YIELD_PER
+            )
+        )
+        async for instance in result:
+            yield instance
+
+    @classmethod
+    async def bulk_upsert(
+        cls,
+        instances: Sequence[Self],
+        update_columns: Sequence[str] | None = None,
+        chunk_size: int | None = None,
+    ) -> BulkUpsertResult:
+        """
+        Insert or update many instances using one multi-row
+        `INSERT ... ON CONFLICT (<primary key>) DO UPDATE` per chunk, all of them in the same transaction.
+
+        - Instances are written directly to the database, they are not added to the session.
+        - If the same primary key is provided more than once the last instance wins.
+        - Columns with an `onupdate` (like `modified`) are always refreshed on conflict.
+
+        :param instances: Instances to store.
+        :param update_columns: Columns to update on conflict, every non primary key column but `created` by default.
+        :param chunk_size: Max number of rows per statement, `DATABASE_BULK_UPSERT_CHUNK_SIZE` by default.
+        :return: Number of inserted and updated rows.
+        """
+        table = cls.__table__  # type: ignore[attr-defined]
+        primary_keys = [column.name for column in table.primary_key.columns]
+        columns = [column.name for column in table.columns]
+        if update_columns is None:
+            update_columns = [
+                column
+                for column in columns
+                if column not in primary_keys and column != "created"
+            ]
+        update_columns = list(update_columns) + [
+            column.name
+            for column in table.columns
+            if column.onupdate is not None and column.name not in update_columns
+        ]
+        chunk_size = min(
+            chunk_size or settings.DATABASE_BULK_UPSERT_CHUNK_SIZE,
+            MAX_BIND_PARAMETERS // len(columns),
+        )
+
+        # A row cannot be affected twice by the same `ON CONFLICT DO UPDATE` statement
+        instances = list(
+            {
+                tuple(getattr(instance, key) for key in primary_keys): instance
+                for instance in instances
+            }.values()
+        )
+        rows = [
+            {column: getattr(instance, column) for column in columns}
+            for instance in instances
+        ]
+
+        inserted = updated = 0
+        for start in range(0, len(rows), chunk_size):
+            statement = insert(table).values(rows[start : start + chunk_size])
+            upsert_statement = statement.on_conflict_do_update(
+                index_elements=primary_keys,
+                set_={column: statement.excluded[column] for column in update_columns},
+            ).returning(
+                # `xmax` is only zero for freshly inserted tuples
+                literal_column("xmax = 0", Boolean)
+            )
+            result = await db_session.execute(upsert_statement)
+            for was_inserted in result.scalars():
+                if was_inserted:
+                    inserted += 1
+                else:
+                    updated += 1
+        db_session.add_all(cls._get_outbox_events(instances))
+        await db_session.commit()
+        await cls._on_saved(instances)
+        return BulkUpsertResult(inserted=inserted, updated=updated)
+
+    @classmethod
+    async def _on_saved(cls, instances: Sequence[Self]) -> None:
+        """
+        Called after `instances` are committed to the database.
+        Override it to keep derived data, like caches, in sync with the database.
+
+        :param instances:
+        """
+        pass
+
+    @classmethod
+    def _get_outbox_events(cls, instances: Sequence[Self]) -> list["OutboxEvent"]:
+        """
+        Called before `instances` are committed to the database. Returned events are stored
+        in the same transaction and published later by `OutboxRelay`.
+        Override it to notify other services about the changes.
+
+        :param instances:
+        :return: Events to publish
+        """
+        return []
+
     async def _save(self):
         db_session.add(self)
+        db_session.add_all(self._get_outbox_events([self]))
         await db_session.commit()
+        await self._on_saved([self])
         return self
 
     async def update(self):
@@ -56,6 +218,57 @@ class TimeStampedSQLModel(SQLModel):
     )
 
 
+class OutboxEvent(SqlQueryBase, SQLModel, table=True):
+    """
+    Event pending to be published to RabbitMQ, stored in the same transaction as the
+    change it describes. `OutboxRelay` publishes them by `id` order and deletes them
+    once the broker confirms them.
+    """
+
+    id: int | None = Field(default=None, primary_key=True, sa_type=BigInteger)
+    payload: bytes = Field(nullable=False)
+    created: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(datetime.UTC),
+        nullable=False,
+        sa_type=DateTime(timezone=True),  # type: ignore
+    )
+
+    @classmethod
+    async def get_pending(cls, limit: int) -> Sequence[Self]:
+        """
+        Get the oldest events and lock them until the transaction ends. Rows locked by
+        other transactions are skipped (`FOR UPDATE SKIP LOCKED`), so concurrent relays
+        never get the same events.
+
+        :param limit: Max number of events to return
+        :return: Events sorted by `id`
+        """
+        query = (
+            select(cls)
+            .order_by(col(cls.id))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db_session.execute(query)
+        return result.scalars().all()
+
+    @classmethod
+    async def delete_by_ids(cls, ids: Sequence[int]) -> int:
+        """
+        Delete many events with one statement, ids are sent as one array parameter.
+
+        :param ids:
+        :return: Number of deleted events
+        """
+        result = await db_session.execute(
+            delete(cls).where(
+                col(cls.id)
+                == any_(bindparam("ids", list(ids), type_=ARRAY(BigInteger())))
+            )
+        )
+        return result.rowcount  # type: ignore[attr-defined]
+
+
 class SafeOperationEnum(IntEnum):
     CALL = 0
     DELEGATE_CALL = 1
@@ -70,17 +283,33 @@ class MultisigTransaction(SqlQueryBase, TimeStampedSQLModel, table=True):
             "safe",
             desc("nonce"),
             desc("created"),
+            desc("safe_tx_hash"),
+        ),
+        # Validators for conditional requests, see `get_version`
+        Index(
+            "ix__multisigtransaction_safe_chain_modified",
+            "safe",
+            "chain_id",
+            "modified",
+        ),
+        # Changes feed, see `get_changes`
+        Index(
+            "ix__multisigtransaction_modified",
+            "modified",
+            "safe_tx_hash",
         ),
     )
 
     safe_tx_hash: bytes = Field(
         sa_column=Column(EthereumHashType(), nullable=False, primary_key=True)
     )
-    chain_id: int = Field(sa_column=Column(Uint256Type(), nullable=False))
+    chain_id: int = Field(sa_column=Column(UintBigIntegerType(), nullable=False))
     safe: bytes = Field(
         sa_column=Column(EthereumAddressType(), nullable=False, index=True)
     )
-    nonce: int = Field(sa_column=Column(Uint256Type(), nullable=False, index=True))
+    nonce: int = Field(
+        sa_column=Column(UintBigIntegerType(), nullable=False, index=True)
+    )
     proposer: bytes | None = Field(
         default=None,
         sa_column=Column(EthereumAddressType(), nullable=True),
@@ -112,3 +341,185 @@ class MultisigTransaction(SqlQueryBase, TimeStampedSQLModel, table=True):
     origin: dict = Field(default_factory=dict, sa_column=Column(JSON))
     # Optional executed tx hash
     tx_hash: bytes | None = Field(sa_column=Column(EthereumHashType(), nullable=True))
+
+    @classmethod
+    async def _on_saved(cls, instances: Sequence[Self]) -> None:
+        await multisig_transactions_cache.invalidate(
+            *{HexBytes(instance.safe).hex() for instance in instances}
+        )
+
+    @classmethod
+    def _get_outbox_events(cls, instances: Sequence[Self]) -> list[OutboxEvent]:
+        return [
+            OutboxEvent(
+                payload=json.dumps(
+                    {
+                        "type": "MULTISIG_TRANSACTION_SAVED",
+                        "address": fast_to_checksum_address(instance.safe),
+                        "safeTxHash": "0x" + instance.safe_tx_hash.hex(),
+                        "chainId": str(instance.chain_id),
+                        "nonce": str(instance.nonce),
+                    }
+                ).encode()
+            )
+            for instance in instances
+        ]
+
+    @classmethod
+    async def get_by_safe(
+        cls,
+        safe: bytes,
+        limit: int,
+        chain_id: int | None = None,
+        executed: bool | None = None,
+        nonce_gte: int | None = None,
+        nonce_lte: int | None = None,
+        cursor: tuple[int, datetime.datetime, bytes] | None = None,
+    ) -> Sequence[Self]:
+        """
+        Get the transactions for a Safe sorted by `nonce`, `created` and `safe_tx_hash` descending, using
+        keyset pagination so every page is a range scan over `ix__multisigtransaction_safe_sorted`.
+        `safe_tx_hash` makes the sorting unique, as a nonce can have many proposals created at the same time.
+
+        :param safe: Safe address
+        :param limit: Max number of transactions to return
+        :param chain_id: Only return transactions for this chain
+        :param executed: Only return executed (`True`) or pending (`False`) transactions
+        :param nonce_gte: Only return transactions with a nonce greater or equal than this one
+        :param nonce_lte: Only return transactions with a nonce lower or equal than this one
+        :param cursor: `(nonce, created, safe_tx_hash)` of the last transaction of the previous page
+        :return: Transactions after the `cursor`
+        """
+        query = select(cls).where(cls.safe == safe)
+        if chain_id is not None:
+            query = query.where(cls.chain_id == chain_id)
+        if executed is not None:
+            query = query.where(
+                col(cls.tx_hash).is_not(None)
+                if executed
+                else col(cls.tx_hash).is_(None)
+            )
+        if nonce_gte is not None:
+            query = query.where(cls.nonce >= nonce_gte)
+        if nonce_lte is not None:
+            query = query.where(cls.nonce <= nonce_lte)
+        if cursor is not None:
+            query = query.where(
+                tuple_(col(cls.nonce), col(cls.created), col(cls.safe_tx_hash)) < cursor
+            )
+        query = query.order_by(
+            desc(col(cls.nonce)), desc(col(cls.created)), desc(col(cls.safe_tx_hash))
+        ).limit(limit)
+        result = await db_session.execute(query)
+        return result.scalars().all()
+
+    @classmethod
+    async def get_version(
+        cls, safe: bytes, chain_id: int | None = None
+    ) -> tuple[datetime.datetime | None, int]:
+        """
+        Get a cheap version of the transactions of a Safe, it changes if any of them is
+        created, updated or deleted. Resolved with an index only scan over
+        `ix__multisigtransaction_safe_chain_modified`.
+
+        :param safe: Safe address
+        :param chain_id: Only consider transactions for this chain
+        :return: Last `modified` and number of transactions
+        """
+        query = select(func.max(cls.modified), func.count()).where(cls.safe == safe)
+        if chain_id is not None:
+            query = query.where(cls.chain_id == chain_id)
+        result = await db_session.execute(query)
+        last_modified, count = result.one()
+        return last_modified, count
+
+    @classmethod
+    async def get_changes(
+        cls,
+        limit: int,
+        chain_id: int | None = None,
+        safe: bytes | None = None,
+        cursor: tuple[datetime.datetime, bytes] | None = None,
+        modified_before: datetime.datetime | None = None,
+    ) -> Sequence[Self]:
+        """
+        Get the transactions created or updated after `cursor` sorted by `modified` and `safe_tx_hash`,
+        using keyset pagination over `ix__multisigtransaction_modified`.
+
+        `modified` is set by the application before the commit, so a transaction can become
+        visible after others with a later `modified` were returned. Use `modified_before`
+        to only return transactions older than the time a transaction can take to commit.
+
+        :param limit: Max number of transactions to return
+        :param chain_id: Only return transactions for this chain
+        :param safe: Only return transactions for this Safe
+        :param cursor: `(modified, safe_tx_hash)` of the last transaction already received
+        :param modified_before: Only return transactions modified before this
+        :return: Transactions changed after the `cursor`
+        """
+        query = select(cls)
+        if modified_before is not None:
+            query = query.where(col(cls.modified) < modified_before)
+        if chain_id is not None:
+            query = query.where(cls.chain_id == chain_id)
+        if safe is not None:
+            query = query.where(cls.safe == safe)
+        if cursor is not None:
+            query = query.where(
+                tuple_(col(cls.modified), col(cls.safe_tx_hash)) > cursor
+            )
+        query = query.order_by(col(cls.modified), col(cls.safe_tx_hash)).limit(limit)
+        result = await db_session.execute(query)
+        return result.scalars().all()
+
+    @classmethod
+    def iter_for_export(
+        cls,
+        chain_id: int | None = None,
+        safe: bytes | None = None,
+        yield_per: int | None = None,
+    ) -> AsyncIterator[Self]:
+        """
+        Iterate the transactions of a chain and/or a Safe without loading them in memory.
+        Transactions of a Safe are sorted by `nonce` and `created` descending, the other ones by `created`.
+
+        :param chain_id: Only return transactions for this chain
+        :param safe: Only return transactions for this Safe
+        :param yield_per:
+        :return:
+        """
+        query = select(cls)
+        if chain_id is not None:
+            query = query.where(cls.chain_id == chain_id)
+        if safe is not None:
+            query = query.where(cls.safe == safe).order_by(
+                desc(col(cls.nonce)), desc(col(cls.created))
+            )
+        else:
+            query = query.order_by(col(cls.created))
+        return cls.stream(query, yield_per=yield_per)
+
+    @classmethod
+    def iter_by_safe_tx_hashes(
+        cls, safe_tx_hashes: Sequence[bytes], yield_per: int | None = None
+    ) -> AsyncIterator[Self]:
+        """
+        Iterate the transactions with the provided `safe_tx_hash`, in no particular order.
+        Hashes are sent as one array parameter (`safe_tx_hash = ANY($1)`), so the statement is the
+        same for any number of hashes.
+
+        :param safe_tx_hashes:
+        :param yield_per:
+        :return:
+        """
+        query = select(cls).where(
+            col(cls.safe_tx_hash)
+            == any_(
+                bindparam(
+                    "safe_tx_hashes",
+                    list(safe_tx_hashes),
+                    type_=ARRAY(EthereumHashType()),
+                )
+            )
+        )
+        return cls.stream(query, yield_per=yield_per)
@@ -1,19 +1,34 @@
+import asyncio
 import logging
+import time
 from asyncio import AbstractEventLoop
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
 from typing import Any
 
 import aio_pika
 from aio_pika.abc import (
+    AbstractChannel,
     AbstractExchange,
     AbstractIncomingMessage,
     AbstractQueue,
     AbstractRobustConnection,
+    Arguments,
     ConsumerTag,
     ExchangeType,
 )
 
 from app.config import settings
+from app.metrics import (
+    queue_handler_duration_seconds,
+    queue_messages_acked_total,
+    queue_messages_consumed_total,
+    queue_messages_dead_lettered_total,
+    queue_messages_failed_total,
+    queue_messages_publish_failed_total,
+    queue_messages_published_total,
+    queue_messages_retried_total,
+)
 
 from .exceptions import (
     QueueProviderNotConnectedException,
@@ -22,11 +37,91 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Raised while `connect_robust` is restoring the connection
+_RECONNECTABLE_EXCEPTIONS = (
+    ConnectionError,
+    aio_pika.exceptions.ChannelClosed,
+    aio_pika.exceptions.ChannelInvalidStateError,
+)
+
+# Number of times a message failed, set when it's sent to a retry or the dead letter queue
+RETRY_ATTEMPT_HEADER = "x-retry-attempt"
+RETRY_ERROR_HEADER = "x-retry-error"
+
+# Receives the bodies of a batch and the AMQP `message_id` of every message
+BatchCallback = Callable[[list[bytes], list[str | None]], Awaitable[Any]]
+
+
+def get_input_queue_name() -> str:
+    """
+    :return: Name of the queue bound to the exchange. In partitioned mode it's only consumed
+        by the worker routing the events to the partition queues.
+    """
+    if settings.RABBITMQ_PARTITIONS:
+        return f"{settings.RABBITMQ_QUEUE_EVENTS_QUEUE_NAME}.router"
+    return settings.RABBITMQ_QUEUE_EVENTS_QUEUE_NAME
+
+
+def get_partition_queue_name(partition: int) -> str:
+    """
+    :param partition:
+    :return: Name of the queue for the events of the Safes in `partition`
+    """
+    return f"{settings.RABBITMQ_QUEUE_EVENTS_QUEUE_NAME}.partition.{partition}"
+
+
+def get_retry_queue_name(delay_ms: int) -> str:
+    """
+    :param delay_ms:
+    :return: Name of the queue holding failed messages for `delay_ms` before sending
+        them back to the input queue. Queue arguments cannot change, so the delay is part of the name.
+    """
+    return f"{get_input_queue_name()}.retry.{delay_ms}"
+
+
+def get_retry_attempt(message: AbstractIncomingMessage) -> int:
+    """
+    :param message:
+    :return: Number of times the message failed before
+    """
+    attempt = (message.headers or {}).get(RETRY_ATTEMPT_HEADER)
+    return attempt if isinstance(attempt, int) else 0
+
+
+def get_dead_letter_queue_name() -> str:
+    """
+    :return: Name of the queue keeping the messages that failed every retry
+    """
+    return f"{settings.RABBITMQ_QUEUE_EVENTS_QUEUE_NAME}.dead-letter"
+
+
+@dataclass
+class _BatchConsumer:
+    """
+    State of a consumer started with `consume_batch`, partition consumers are kept
+    to stop them with `cancel_partition`.
+    """
+
+    channel: AbstractChannel
+    queue: AbstractQueue
+    consumer_tag: ConsumerTag | None = None
+    # Held while a batch is processed
+    flush_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    flush_timer: asyncio.TimerHandle | None = None
+    stopped: asyncio.Event = field(default_factory=asyncio.Event)
+
 
 class QueueProvider:
     _connection: AbstractRobustConnection | None
     _exchange: AbstractExchange | None
     _events_queue: AbstractQueue | None
+    _batch_channel: AbstractChannel | None
+    _partition_consumers: dict[int, _BatchConsumer]
+    _broadcast_channel: AbstractChannel | None
+    _confirm_channel: AbstractChannel | None
+    _publish_exchanges: list[AbstractExchange]
+    _publish_count: int
+    _background_tasks: set[asyncio.Task]
 
     def __init__(self) -> None:
         """
@@ -35,6 +130,15 @@ class QueueProvider:
         self._connection = None
         self._exchange = None
         self._events_queue = None
+        self._batch_channel = None
+        self._partition_consumers = {}
+        self._broadcast_channel = None
+        self._confirm_channel = None
+        self._publish_exchanges = []
+        self._publish_count = 0
+        self._publish_lock = asyncio.Lock()
+        self._unconfirmed = asyncio.Semaphore(settings.RABBITMQ_PUBLISH_MAX_UNCONFIRMED)
+        self._background_tasks = set()
 
     async def _connect(self, loop: AbstractEventLoop) -> None:
         """
@@ -53,16 +157,42 @@ class QueueProvider:
             raise QueueProviderUnableToConnectException from e
 
         channel = await self._connection.channel()
+        await channel.set_qos(prefetch_count=settings.RABBITMQ_PREFETCH_COUNT)
         self._exchange = await channel.declare_exchange(
             settings.RABBITMQ_AMQP_EXCHANGE, ExchangeType.FANOUT, durable=True
         )
         logger.info(f"Connected to {settings.RABBITMQ_AMQP_EXCHANGE} exchange")
+        # Only one consumer receives the messages of a partitioned queue at a time,
+        # the others are on standby, so their order is kept
+        partitioned_arguments: Arguments = (
+            {"x-single-active-consumer": True} if settings.RABBITMQ_PARTITIONS else None
+        )
         self._events_queue = await channel.declare_queue(
-            settings.RABBITMQ_QUEUE_EVENTS_QUEUE_NAME, durable=True
+            get_input_queue_name(), durable=True, arguments=partitioned_arguments
         )
         if self._events_queue:
             await self._events_queue.bind(self._exchange)
-        logger.info(f"Reading from {settings.RABBITMQ_QUEUE_EVENTS_QUEUE_NAME} queue")
+        logger.info(f"Reading from {get_input_queue_name()} queue")
+        for partition in range(settings.RABBITMQ_PARTITIONS):
+            await channel.declare_queue(
+                get_partition_queue_name(partition),
+                durable=True,
+                arguments=partitioned_arguments,
+            )
+
+        # Failed messages wait in a retry queue until its TTL expires, then they are
+        # dead lettered back to the input queue through the default exchange
+        for delay_ms in settings.RABBITMQ_RETRY_DELAYS_MS:
+            await channel.declare_queue(
+                get_retry_queue_name(delay_ms),
+                durable=True,
+                arguments={
+                    "x-message-ttl": delay_ms,
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": get_input_queue_name(),
+                },
+            )
+        await channel.declare_queue(get_dead_letter_queue_name(), durable=True)
 
     async def connect(self, loop: AbstractEventLoop) -> None:
         """
@@ -93,29 +223,605 @@ class QueueProvider:
             self._exchange = None
             self._connection = None
             self._events_queue = None
+            self._batch_channel = None
+            self._partition_consumers = {}
+            self._broadcast_channel = None
+            self._confirm_channel = None
+            self._publish_exchanges = []
 
-    async def consume(self, callback: Callable[[str], Any]) -> ConsumerTag:
+    async def consume(
+        self,
+        callback: Callable[[bytes], Awaitable[Any]],
+        max_concurrency: int | None = None,
+    ) -> ConsumerTag:
         """
         Starts consuming messages from the declared queue.
 
-        - Each message is processed using the provided callback function.
+        - Each message is processed using the provided async callback function.
+        - At most `max_concurrency` callbacks run at the same time, the rest of the
+          prefetched messages wait for a free slot.
+        - Messages are ACKed after the callback finishes. If it raises, the message is sent
+          to a retry queue and ACKed, see `retry_later`.
 
-        :param callback: A function to process incoming messages.
+        :param callback: An async function to process incoming messages.
+        :param max_concurrency: Max number of messages processed at once, `RABBITMQ_CONSUMER_MAX_CONCURRENCY` by default.
         :return: A tag identifying the active consumer.
         :raises QueueProviderNotConnectedException: if no connection or queue is initialized.
         """
         if not self._connection or not self._events_queue:
             raise QueueProviderNotConnectedException()
 
+        semaphore = asyncio.Semaphore(
+            max_concurrency or settings.RABBITMQ_CONSUMER_MAX_CONCURRENCY
+        )
+
         async def wrapped_callback(message: AbstractIncomingMessage) -> None:
             """
             Wrapper for processing the message and handling ACKs.
 
             :param message: The incoming RabbitMQ message.
             """
-            await message.ack()
-            body = message.body
-            if body:
-                callback(body.decode("utf-8"))
+            queue_messages_consumed_total.inc("message")
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    if message.body:
+                        await callback(message.body)
+                except Exception as e:
+                    logger.exception("Error processing message")
+                    queue_messages_failed_total.inc("message")
+                    await self._retry_later_and_ack(message, e, "message")
+                else:
+                    await message.ack()
+                    queue_messages_acked_total.inc("message")
+                finally:
+                    queue_handler_duration_seconds.observe(
+                        time.perf_counter() - start, "message"
+                    )
 
         return await self._events_queue.consume(wrapped_callback)
+
+    async def consume_batch(
+        self,
+        callback: BatchCallback,
+        batch_size: int | None = None,
+        batch_timeout_ms: int | None = None,
+        partition: int | None = None,
+        retry_in_place: bool = False,
+    ) -> ConsumerTag:
+        """
+        Starts consuming messages from the declared queue, or a partition queue, in batches.
+
+        - Messages are consumed on a dedicated channel with QoS prefetch of at least `batch_size`.
+        - A batch is flushed when `batch_size` messages are collected or `batch_timeout_ms`
+          milliseconds passed since the first message of the batch arrived.
+        - Messages are ACKed after the callback finishes. If it raises, the callback is called
+          again for every message of the batch on its own, so only the failing messages are
+          sent to a retry queue (see `retry_later`) and the rest of the batch is not delayed.
+        - Partition queues keep the order of the events of a Safe, so a failed batch is not
+          split. It's kept in place, not ACKed, and retried after `RABBITMQ_RETRY_DELAYS_MS`
+          until it succeeds or the partition is cancelled, following messages wait for it.
+          `retry_in_place` does the same for the declared queue, e.g. to route it to partitions.
+        - Processing is at least once: messages handled before the callback raised are
+          processed again, so the callback must be idempotent. The `message_id` of every
+          message is passed along its body. It's kept when messages are retried, replayed
+          or routed to partitions, so it can be used to drop redeliveries.
+
+        :param callback: An async and idempotent function to process the bodies of a batch
+            and their message ids.
+        :param batch_size: Max number of messages per batch, `RABBITMQ_CONSUMER_BATCH_SIZE` by default.
+        :param batch_timeout_ms: Max time to wait for a batch to fill, `RABBITMQ_CONSUMER_BATCH_TIMEOUT_MS` by default.
+        :param partition: Consume this partition queue on its own channel, see `cancel_partition`.
+            Failed batches of a partition are always retried in place.
+        :param retry_in_place: Retry failed batches in place instead of one by one.
+        :return: A tag identifying the active consumer.
+        :raises QueueProviderNotConnectedException: if no connection or queue is initialized.
+        """
+        if not self._connection or not self._events_queue:
+            raise QueueProviderNotConnectedException()
+
+        batch_size = batch_size or settings.RABBITMQ_CONSUMER_BATCH_SIZE
+        batch_timeout = (
+            batch_timeout_ms or settings.RABBITMQ_CONSUMER_BATCH_TIMEOUT_MS
+        ) / 1000
+
+        # QoS is applied per channel, use a dedicated one so multiple ACKs only
+        # affect messages delivered to this consumer
+        if partition is not None:
+            if partition in self._partition_consumers:
+                raise ValueError(f"Partition {partition} is already consumed")
+            channel = await self._connection.channel()
+            queue_name = get_partition_queue_name(partition)
+        else:
+            if not self._batch_channel:
+                self._batch_channel = await self._connection.channel()
+            channel = self._batch_channel
+            queue_name = self._events_queue.name
+        await channel.set_qos(
+            prefetch_count=max(batch_size, settings.RABBITMQ_PREFETCH_COUNT)
+        )
+        consumer = _BatchConsumer(channel, await channel.get_queue(queue_name))
+        if partition is not None:
+            self._partition_consumers[partition] = consumer
+            retry_in_place = True
+        consumer_name = (
+            f"partition {partition}" if partition is not None else queue_name
+        )
+
+        pending: list[AbstractIncomingMessage] = []
+
+        async def flush() -> None:
+            """
+            Send up to `batch_size` pending messages to the callback and handle ACKs
+            for the whole batch. Flushes are serialized, so batches are processed in
+            delivery order and a multiple ACK never covers an in-flight message.
+            """
+            async with consumer.flush_lock:
+                if consumer.flush_timer:
+                    consumer.flush_timer.cancel()
+                    consumer.flush_timer = None
+                if not pending or consumer.stopped.is_set():
+                    return
+                messages = pending[:batch_size]
+                del pending[:batch_size]
+                if pending:
+                    consumer.flush_timer = asyncio.get_running_loop().call_later(
+                        batch_timeout, schedule_flush
+                    )
+
+                bodies = [message.body for message in messages if message.body]
+                message_ids = [
+                    message.message_id for message in messages if message.body
+                ]
+                start = time.perf_counter()
+                try:
+                    if bodies:
+                        await callback(bodies, message_ids)
+                except Exception:
+                    if not retry_in_place:
+                        logger.exception(
+                            f"Error processing batch of {len(messages)} messages, "
+                            f"processing them one by one"
+                        )
+                        await process_one_by_one(messages)
+                    else:
+                        logger.exception(
+                            f"Error processing batch of {len(messages)} messages of "
+                            f"{consumer_name}, retrying it in place"
+                        )
+                        queue_messages_failed_total.inc("batch", amount=len(messages))
+                        if await retry_until_processed(bodies, message_ids):
+                            await messages[-1].ack(multiple=True)
+                            queue_messages_acked_total.inc(
+                                "batch", amount=len(messages)
+                            )
+                else:
+                    await messages[-1].ack(multiple=True)
+                    queue_messages_acked_total.inc("batch", amount=len(messages))
+                finally:
+                    queue_handler_duration_seconds.observe(
+                        time.perf_counter() - start, "batch"
+                    )
+
+        async def process_one_by_one(messages: list[AbstractIncomingMessage]) -> None:
+            """
+            Call the callback with a single message batch for every message. The failed
+            batch could be partially processed, so messages can be processed twice.
+
+            :param messages: Messages of a failed batch
+            """
+            for message in messages:
+                try:
+                    if message.body:
+                        await callback([message.body], [message.message_id])
+                except Exception as e:
+                    logger.exception("Error processing message of a failed batch")
+                    queue_messages_failed_total.inc("batch")
+                    await self._retry_later_and_ack(message, e, "batch")
+                else:
+                    await message.ack()
+                    queue_messages_acked_total.inc("batch")
+
+        async def retry_until_processed(
+            bodies: list[bytes], message_ids: list[str | None]
+        ) -> bool:
+            """
+            Call the callback with a failed batch until it succeeds, waiting
+            `RABBITMQ_RETRY_DELAYS_MS` between attempts (the last delay is repeated).
+
+            :param bodies: Bodies of the failed batch
+            :param message_ids: Message ids of the failed batch
+            :return: `True` if the batch was processed, `False` if the consumer was stopped
+            """
+            delays = settings.RABBITMQ_RETRY_DELAYS_MS or [1_000]
+            attempt = 0
+            while True:
+                delay = delays[min(attempt, len(delays) - 1)] / 1000
+                try:
+                    await asyncio.wait_for(consumer.stopped.wait(), delay)
+                    return False
+                except TimeoutError:
+                    pass
+                attempt += 1
+                try:
+                    await callback(bodies, message_ids)
+                    return True
+                except Exception:
+                    logger.exception(
+                        f"Error retrying batch of {consumer_name}, attempt {attempt}"
+                    )
+                    queue_messages_failed_total.inc("batch", amount=len(bodies))
+
+        def schedule_flush() -> None:
+            task = asyncio.create_task(flush())
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+        async def batch_callback(message: AbstractIncomingMessage) -> None:
+            """
+            Collect the incoming message in the current batch.
+
+            :param message: The incoming RabbitMQ message.
+            """
+            queue_messages_consumed_total.inc("batch")
+            pending.append(message)
+            if len(pending) >= batch_size:
+                await flush()
+            elif consumer.flush_timer is None:
+                consumer.flush_timer = asyncio.get_running_loop().call_later(
+                    batch_timeout, schedule_flush
+                )
+
+        consumer.consumer_tag = await consumer.queue.consume(batch_callback)
+        return consumer.consumer_tag
+
+    async def cancel_partition(self, partition: int) -> None:
+        """
+        Stop consuming a partition queue started with `consume_batch`. The consumer is
+        cancelled, the batch being processed is completed (a failed batch is not retried
+        again) and its channel is closed, so messages not ACKed yet are requeued and
+        delivered to the next active consumer.
+
+        :param partition:
+        """
+        consumer = self._partition_consumers.pop(partition, None)
+        if not consumer:
+            return
+        try:
+            if consumer.consumer_tag:
+                await consumer.queue.cancel(consumer.consumer_tag)
+        finally:
+            consumer.stopped.set()
+            async with consumer.flush_lock:
+                if consumer.flush_timer:
+                    consumer.flush_timer.cancel()
+                    consumer.flush_timer = None
+                await consumer.channel.close()
+
+    async def _get_confirm_channel(self) -> AbstractChannel:
+        """
+        :return: Channel in publisher confirms mode, to publish to the partition, retry and
+            dead letter queues through its default exchange. Publishing waits for the confirm.
+        :raises QueueProviderNotConnectedException: if no connection is initialized.
+        """
+        if not self._connection:
+            raise QueueProviderNotConnectedException()
+        async with self._publish_lock:
+            if not self._confirm_channel:
+                self._confirm_channel = await self._connection.channel(
+                    publisher_confirms=True
+                )
+        return self._confirm_channel
+
+    async def publish_to_partitions(
+        self,
+        messages: Sequence[tuple[int, bytes]],
+        message_ids: Sequence[str | None] | None = None,
+    ) -> None:
+        """
+        Publishes persistent messages to the partition queues and waits until the broker
+        confirms all of them. Messages of a partition are published one after the
+        other in the provided order, partitions are published concurrently.
+
+        :param messages: Partition and body of every message
+        :param message_ids: AMQP `message_id` of every message, kept to drop redeliveries
+        :raises QueueProviderNotConnectedException: if no connection is initialized.
+        :raises aio_pika.exceptions.DeliveryError: if the broker rejects a message.
+        """
+        exchange = (await self._get_confirm_channel()).default_exchange
+
+        bodies_by_partition: dict[int, list[tuple[bytes, str | None]]] = {}
+        for (partition, body), message_id in zip(
+            messages, message_ids or [None] * len(messages), strict=True
+        ):
+            bodies_by_partition.setdefault(partition, []).append((body, message_id))
+
+        async def publish_in_order(
+            partition: int, bodies: list[tuple[bytes, str | None]]
+        ) -> None:
+            for body, message_id in bodies:
+                await exchange.publish(
+                    aio_pika.Message(
+                        body=body,
+                        message_id=message_id,
+                        content_type="application/json",
+                        delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                    ),
+                    routing_key=get_partition_queue_name(partition),
+                )
+
+        await asyncio.gather(
+            *(
+                publish_in_order(partition, bodies)
+                for partition, bodies in bodies_by_partition.items()
+            )
+        )
+
+    async def retry_later(
+        self, message: AbstractIncomingMessage, error: Exception, consumer: str
+    ) -> None:
+        """
+        Publish a copy of a failed message to the retry queue for its attempt, it will be
+        back in the events queue after `RABBITMQ_RETRY_DELAYS_MS[attempt]`. Once every retry failed
+        it's published to the dead letter queue instead, see `replay_dead_letters`.
+        The copy is confirmed by the broker when it returns, only then the original message
+        can be ACKed.
+
+        :param message: Failed message
+        :param error: Exception raised processing it, stored in the `x-retry-error` header
+        :param consumer: Consumer name for the metrics
+        :raises QueueProviderNotConnectedException: if no connection is initialized.
+        :raises aio_pika.exceptions.DeliveryError: if the broker rejects the copy.
+        """
+        exchange = (await self._get_confirm_channel()).default_exchange
+        headers = dict(message.headers or {})
+        attempt = get_retry_attempt(message) + 1
+        headers[RETRY_ATTEMPT_HEADER] = attempt
+        headers[RETRY_ERROR_HEADER] = f"{type(error).__name__}: {error}"[:1000]
+        delays = settings.RABBITMQ_RETRY_DELAYS_MS
+        dead_lettered = attempt > len(delays)
+        routing_key = (
+            get_dead_letter_queue_name()
+            if dead_lettered
+            else get_retry_queue_name(delays[attempt - 1])
+        )
+        await exchange.publish(
+            aio_pika.Message(
+                body=message.body,
+                headers=headers,
+                message_id=message.message_id,
+                content_type=message.content_type,
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            ),
+            routing_key=routing_key,
+        )
+        if dead_lettered:
+            logger.error(f"Message failed {attempt} times, sent it to {routing_key}")
+            queue_messages_dead_lettered_total.inc(consumer)
+        else:
+            queue_messages_retried_total.inc(consumer)
+
+    async def _retry_later_and_ack(
+        self, message: AbstractIncomingMessage, error: Exception, consumer: str
+    ) -> None:
+        """
+        Send a failed message to `retry_later` and ACK it once the copy is confirmed.
+        If it cannot be published it's NACKed and requeued, so it's never lost. It's not
+        left un-ACKed, a multiple ACK of a following batch on the channel would cover it.
+
+        :param message:
+        :param error:
+        :param consumer:
+        """
+        try:
+            await self.retry_later(message, error, consumer)
+        except Exception:
+            logger.exception("Error sending message to retry")
+            await message.nack(requeue=True)
+        else:
+            await message.ack()
+
+    async def replay_dead_letters(self, limit: int | None = None) -> int:
+        """
+        Move the messages of the dead letter queue back to the input queue in batches of
+        `RABBITMQ_CONSUMER_BATCH_SIZE`, with their retry attempts reset. A batch is removed
+        from the dead letter queue after the broker confirms all of its messages.
+
+        :param limit: Max number of messages to replay, every message by default
+        :return: Number of replayed messages
+        :raises QueueProviderNotConnectedException: if no connection is initialized.
+        """
+        if not self._connection:
+            raise QueueProviderNotConnectedException()
+
+        # A dedicated channel, so multiple ACKs never cover messages of the consumers
+        channel = await self._connection.channel(publisher_confirms=True)
+        try:
+            queue = await channel.get_queue(get_dead_letter_queue_name())
+            replayed = 0
+            while limit is None or replayed < limit:
+                batch_size = settings.RABBITMQ_CONSUMER_BATCH_SIZE
+                if limit is not None:
+                    batch_size = min(batch_size, limit - replayed)
+                messages: list[AbstractIncomingMessage] = []
+                while len(messages) < batch_size and (
+                    message := await queue.get(fail=False)
+                ):
+                    messages.append(message)
+                if not messages:
+                    break
+
+                await asyncio.gather(
+                    *(
+                        channel.default_exchange.publish(
+                            aio_pika.Message(
+                                body=message.body,
+                                headers={
+                                    key: value
+                                    for key, value in (message.headers or {}).items()
+                                    if key
+                                    not in (RETRY_ATTEMPT_HEADER, RETRY_ERROR_HEADER)
+                                },
+                                message_id=message.message_id,
+                                content_type=message.content_type,
+                                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                            ),
+                            routing_key=get_input_queue_name(),
+                        )
+                        for message in messages
+                    )
+                )
+                await messages[-1].ack(multiple=True)
+                replayed += len(messages)
+        finally:
+            # Messages not ACKed are returned to the dead letter queue
+            await channel.close()
+
+        logger.info(f"Replayed {replayed} dead lettered messages")
+        return replayed
+
+    async def consume_broadcast(
+        self, callback: Callable[[bytes], Awaitable[Any]]
+    ) -> ConsumerTag:
+        """
+        Starts consuming every message published to the exchange in this process.
+
+        - Messages are received on an exclusive, auto deleted queue bound to the exchange, so
+          every process gets all of them instead of sharing the events queue with other workers.
+        - Messages are not ACKed, a message is lost if the process is down. Use it only
+          for best effort work like notifying connected clients.
+
+        :param callback: An async function to process incoming messages.
+        :return: A tag identifying the active consumer.
+        :raises QueueProviderNotConnectedException: if no connection or exchange is initialized.
+        """
+        if not self._connection or not self._exchange:
+            raise QueueProviderNotConnectedException()
+
+        if not self._broadcast_channel:
+            self._broadcast_channel = await self._connection.channel()
+        await self._broadcast_channel.set_qos(
+            prefetch_count=settings.RABBITMQ_PREFETCH_COUNT
+        )
+        queue = await self._broadcast_channel.declare_queue(
+            exclusive=True, auto_delete=True
+        )
+        await queue.bind(self._exchange.name)
+
+        async def broadcast_callback(message: AbstractIncomingMessage) -> None:
+            """
+            :param message: The incoming RabbitMQ message.
+            """
+            queue_messages_consumed_total.inc("broadcast")
+            try:
+                if message.body:
+                    await callback(message.body)
+            except Exception:
+                logger.exception("Error processing broadcast message")
+                queue_messages_failed_total.inc("broadcast")
+
+        return await queue.consume(broadcast_callback, no_ack=True)
+
+    async def _get_publish_exchanges(self) -> list[AbstractExchange]:
+        """
+        Open `RABBITMQ_PUBLISH_CHANNEL_POOL_SIZE` channels in publisher confirms mode and declare
+        `RABBITMQ_AMQP_PUBLISH_EXCHANGE` on each of them. Channels and exchanges are robust,
+        they are restored by `connect_robust` after a reconnection.
+
+        :return: Exchange for the events emitted by this service, one per pooled channel
+        :raises QueueProviderNotConnectedException: if no connection is initialized.
+        """
+        if not self._connection:
+            raise QueueProviderNotConnectedException()
+
+        async with self._publish_lock:
+            if not self._publish_exchanges:
+                for _ in range(settings.RABBITMQ_PUBLISH_CHANNEL_POOL_SIZE):
+                    channel = await self._connection.channel(publisher_confirms=True)
+                    self._publish_exchanges.append(
+                        await channel.declare_exchange(
+                            settings.RABBITMQ_AMQP_PUBLISH_EXCHANGE,
+                            ExchangeType.FANOUT,
+                            durable=True,
+                        )
+                    )
+        return self._publish_exchanges
+
+    async def _publish_confirmed(self, exchange: AbstractExchange, body: bytes) -> None:
+        """
+        Publish a message and wait for its confirm. If the connection is lost it waits
+        for `connect_robust` to restore it and publishes the message again once.
+
+        :param exchange:
+        :param body:
+        """
+        message = aio_pika.Message(
+            body=body,
+            content_type="application/json",
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+        )
+        try:
+            try:
+                await exchange.publish(message, routing_key="")
+            except _RECONNECTABLE_EXCEPTIONS:
+                if not self._connection:
+                    raise
+                logger.warning("Connection lost while publishing, waiting to reconnect")
+                await asyncio.wait_for(
+                    self._connection.ready(),
+                    settings.RABBITMQ_PUBLISH_RECONNECT_TIMEOUT_SECONDS,
+                )
+                await exchange.publish(message, routing_key="")
+        except Exception:
+            queue_messages_publish_failed_total.inc()
+            raise
+        else:
+            queue_messages_published_total.inc()
+
+    async def publish_many(self, bodies: Sequence[bytes]) -> None:
+        """
+        Publishes persistent messages to `RABBITMQ_AMQP_PUBLISH_EXCHANGE` and waits until
+        the broker confirms all of them.
+
+        - Messages are spread over the pooled channels and their confirms are awaited
+          concurrently, instead of one broker round trip per message.
+        - At most `RABBITMQ_PUBLISH_MAX_UNCONFIRMED` messages are pending to be confirmed,
+          shared by every caller. Publishing waits for confirms when the limit is reached.
+        - Messages are published again after a reconnection if they were not confirmed,
+          so they could be delivered more than once.
+        - If the caller is cancelled, messages not confirmed yet are cancelled too.
+
+        :param bodies: Message bodies
+        :return:
+        :raises QueueProviderNotConnectedException: if no connection is initialized.
+        :raises aio_pika.exceptions.DeliveryError: if the broker rejects a message.
+        """
+        exchanges = await self._get_publish_exchanges()
+        tasks: list[asyncio.Task] = []
+        try:
+            for body in bodies:
+                await self._unconfirmed.acquire()
+                exchange = exchanges[self._publish_count % len(exchanges)]
+                self._publish_count += 1
+                task = asyncio.create_task(self._publish_confirmed(exchange, body))
+                # Done callbacks also run for tasks cancelled before they started
+                task.add_done_callback(lambda _: self._unconfirmed.release())
+                tasks.append(task)
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def publish(self, body: bytes) -> None:
+        """
+        Publishes a persistent message to `RABBITMQ_AMQP_PUBLISH_EXCHANGE` and waits until
+        the broker confirms it, see `publish_many`.
+
+        :param body: Message body
+        :return:
+        :raises QueueProviderNotConnectedException: if no connection is initialized.
+        :raises aio_pika.exceptions.DeliveryError: if the broker rejects the message.
+        """
+        await self.publish_many([body])
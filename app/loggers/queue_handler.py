@@ -0,0 +1,145 @@
+"""
+Non blocking logging: records are enqueued by the logging call and formatted and
+written by handlers running in a background `QueueListener` thread.
+"""
+
+import copy
+import logging
+import queue
+from collections.abc import Iterable
+from enum import Enum
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueueOverflowPolicy(str, Enum):
+    # Discard the oldest queued record to make room for the new one
+    DROP_OLDEST = "drop_oldest"
+    # Wait until the listener makes room in the queue
+    BLOCK = "block"
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    `QueueHandler` for a bounded queue that leaves formatting to the listener handlers.
+    """
+
+    def __init__(
+        self, log_queue: queue.Queue, overflow_policy: QueueOverflowPolicy
+    ) -> None:
+        super().__init__(log_queue)
+        self.log_queue = log_queue
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Only resolve the message arguments, as they could be mutated after the logging call.
+        Unlike `QueueHandler.prepare`, the record is not formatted here.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow_policy == QueueOverflowPolicy.BLOCK:
+            self.log_queue.put(record)
+            return
+
+        while True:
+            try:
+                self.log_queue.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.log_queue.get_nowait()
+                    self.log_queue.task_done()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+
+class FlushingQueueListener(QueueListener):
+    """
+    `QueueListener` that waits for room in a full queue to enqueue the stop sentinel,
+    so every queued record is handled on `stop()`.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        *handlers: logging.Handler,
+        respect_handler_level: bool = False,
+    ) -> None:
+        super().__init__(
+            log_queue, *handlers, respect_handler_level=respect_handler_level
+        )
+        self.log_queue = log_queue
+
+    def enqueue_sentinel(self) -> None:
+        self.log_queue.put(self._sentinel)  # type: ignore[attr-defined]
+
+
+_listeners: list[FlushingQueueListener] = []
+# Logger, original handler and the queue handler replacing it
+_replaced_handlers: list[
+    tuple[logging.Logger, logging.Handler, BoundedQueueHandler]
+] = []
+
+
+def setup_queue_logging(
+    loggers: Iterable[logging.Logger],
+    max_size: int,
+    overflow_policy: QueueOverflowPolicy,
+) -> None:
+    """
+    Move the handlers of `loggers` behind bounded queues handled by background threads.
+    Loggers sharing a handler share its queue, so a record is still written once per handler.
+
+    :param loggers:
+    :param max_size: Max number of records waiting in every queue
+    :param overflow_policy: What to do when a queue is full
+    """
+    queue_handlers: dict[logging.Handler, BoundedQueueHandler] = {}
+    for logger in loggers:
+        for handler in logger.handlers.copy():
+            if isinstance(handler, QueueHandler):
+                continue
+            if handler not in queue_handlers:
+                queue_handlers[handler] = BoundedQueueHandler(
+                    queue.Queue(max_size), overflow_policy
+                )
+                listener = FlushingQueueListener(
+                    queue_handlers[handler].log_queue,
+                    handler,
+                    respect_handler_level=True,
+                )
+                listener.start()
+                _listeners.append(listener)
+            logger.removeHandler(handler)
+            logger.addHandler(queue_handlers[handler])
+            _replaced_handlers.append((logger, handler, queue_handlers[handler]))
+
+
+def stop_queue_logging() -> None:
+    """
+    Restore the original handlers, then write every queued record and stop the background threads.
+    """
+    while _replaced_handlers:
+        logger, handler, queue_handler = _replaced_handlers.pop()
+        logger.removeHandler(queue_handler)
+        logger.addHandler(handler)
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def get_dropped_records() -> int:
+    """
+    :return: Number of records discarded because a queue was full
+    """
+    return sum(
+        queue_handler.dropped
+        for queue_handler in {
+            queue_handler for _, _, queue_handler in _replaced_handlers
+        }
+    )
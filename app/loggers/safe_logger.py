@@ -6,6 +6,7 @@ from contextlib import contextmanager
 from contextvars import ContextVar
 
 from pydantic.main import BaseModel
+from pydantic_core import to_json
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,11 @@ class HttpResponseLog(BaseModel):
     totalTime: int
 
 
+class DbQueriesLog(BaseModel):
+    count: int
+    totalTime: int
+
+
 class ErrorInfo(BaseModel):
     function: str
     line: int
@@ -41,6 +47,7 @@ class ContextMessageLog(BaseModel):
     dbSession: str | None = None
     httpRequest: HttpRequestLog | None = None
     httpResponse: HttpResponseLog | None = None
+    dbQueries: DbQueriesLog | None = None
     errorInfo: ErrorInfo | None = None
     taskInfo: TaskInfo | None = None
 
@@ -53,6 +60,17 @@ class JsonLog(BaseModel):
     contextMessage: ContextMessageLog | dict | None = None
 
 
+# `contextMessage` field, `LogRecord` attribute and expected type for every `ContextMessageLog` field
+_CONTEXT_MESSAGE_ATTRIBUTES: tuple[tuple[str, str, type], ...] = (
+    ("dbSession", "db_session", str),
+    ("httpRequest", "http_request", HttpRequestLog),
+    ("httpResponse", "http_response", HttpResponseLog),
+    ("dbQueries", "db_queries", DbQueriesLog),
+    ("errorInfo", "error_detail", ErrorInfo),
+    ("taskInfo", "task_detail", TaskInfo),
+)
+
+
 class SafeJsonFormatter(logging.Formatter):
     """
     Json formatter with following schema
@@ -65,7 +83,7 @@ class SafeJsonFormatter(logging.Formatter):
     }
     """
 
-    def format(self, record):
+    def _set_error_detail(self, record: logging.LogRecord) -> None:
         if record.levelname == "ERROR":
             exception_info: str | None = None
             # Check if the error contains exception data
@@ -80,10 +98,48 @@ class SafeJsonFormatter(logging.Formatter):
                 exceptionInfo=exception_info,
             )
 
+    def format(self, record):
+        """
+        Build the log as a plain dictionary and serialize it with `pydantic_core`,
+        the output is the same as validating and serializing `JsonLog`.
+        Records with context attributes that would need validation (e.g. a `dict` instead
+        of `HttpRequestLog`) fall back to `format_with_models`.
+        """
+        self._set_error_detail(record)
+
+        context_message = {}
+        for field, attribute, expected_type in _CONTEXT_MESSAGE_ATTRIBUTES:
+            value = getattr(record, attribute, None)
+            if value is None:
+                continue
+            if type(value) is not expected_type:
+                return self.format_with_models(record)
+            context_message[field] = value
+
+        json_log = {
+            "level": record.levelname,
+            "timestamp": datetime.datetime.fromtimestamp(record.created, datetime.UTC),
+            "context": f"{record.module}.{record.funcName}",
+            "message": record.getMessage(),
+        }
+        if context_message:
+            json_log["contextMessage"] = context_message
+
+        return to_json(json_log, exclude_none=True).decode()
+
+    def format_with_models(self, record: logging.LogRecord) -> str:
+        """
+        Validate and serialize the record through `JsonLog`.
+
+        :param record:
+        :return: Json log
+        """
+        self._set_error_detail(record)
         context_message = ContextMessageLog(
             dbSession=getattr(record, "db_session", None),
             httpRequest=getattr(record, "http_request", None),
             httpResponse=getattr(record, "http_response", None),
+            dbQueries=getattr(record, "db_queries", None),
             errorInfo=getattr(record, "error_detail", None),
             taskInfo=getattr(record, "task_detail", None),
         )
@@ -1,7 +1,67 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import APIRouter, FastAPI
 
 from . import VERSION
-from .routers import about, default
+from .config import settings
+from .datasources.queue.exceptions import QueueProviderUnableToConnectException
+from .datasources.queue.queue_provider import QueueProvider
+from .loggers.queue_handler import stop_queue_logging
+from .middlewares import DatabaseSessionMiddleware, LoggingMiddleware
+from .routers import about, default, events, multisig_transactions, safes
+from .services.events import EventsService
+from .services.outbox_relay import OutboxRelay
+from .services.partitions import PartitionCoordinator, PartitionRouter
+
+logger = logging.getLogger(__name__)
+
+
+async def _connect_and_consume(queue_provider: QueueProvider) -> None:
+    """
+    Connect to RabbitMQ and consume safe-transaction-service events, shared between
+    workers to process them and broadcast to every worker to notify its subscribers.
+    Then relay the outbox events of this service until cancelled.
+
+    If `RABBITMQ_PARTITIONS` is set, events are routed to partition queues by Safe address
+    and every worker processes the partitions assigned to it, in order.
+
+    :param queue_provider:
+    :return:
+    """
+    try:
+        await queue_provider.connect(asyncio.get_running_loop())
+        events_service = EventsService()
+        await queue_provider.consume_broadcast(events_service.publish_event)
+        if settings.RABBITMQ_PARTITIONS:
+            # Routing must not reorder the events of a Safe, failed batches are kept in place
+            await queue_provider.consume_batch(
+                PartitionRouter(queue_provider).route, retry_in_place=True
+            )
+            await asyncio.gather(
+                PartitionCoordinator(
+                    queue_provider, events_service.process_events
+                ).run(),
+                OutboxRelay(queue_provider).run(),
+            )
+        else:
+            await queue_provider.consume_batch(events_service.process_events)
+            await OutboxRelay(queue_provider).run()
+    except QueueProviderUnableToConnectException:
+        logger.error("Unable to connect to RabbitMQ, events will not be consumed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    queue_provider = QueueProvider()
+    consume_task = asyncio.create_task(_connect_and_consume(queue_provider))
+    yield
+    consume_task.cancel()
+    await queue_provider.disconnect()
+    stop_queue_logging()
+
 
 app = FastAPI(
     title="Safe Queue Service",
@@ -9,12 +69,18 @@ app = FastAPI(
     version=VERSION,
     docs_url=None,
     redoc_url=None,
+    lifespan=lifespan,
 )
+app.add_middleware(DatabaseSessionMiddleware)
+app.add_middleware(LoggingMiddleware)
 
 # Router configuration
 api_v1_router = APIRouter(
     prefix="/api/v1",
 )
 api_v1_router.include_router(about.router)
+api_v1_router.include_router(safes.router)
+api_v1_router.include_router(multisig_transactions.router)
+api_v1_router.include_router(events.router)
 app.include_router(api_v1_router)
 app.include_router(default.router)
@@ -0,0 +1,339 @@
+"""
+In memory metrics for the service, rendered in the Prometheus text format.
+Rates (e.g. messages consumed per second) are computed by Prometheus from the counters.
+"""
+
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+# Seconds
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    labels = ",".join(
+        f'{name}="{_escape_label_value(value)}"'
+        for name, value in zip(names, values, strict=True)
+    )
+    return "{" + labels + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    """
+    Base class for thread safe metrics with labels.
+    """
+
+    @property
+    @abstractmethod
+    def type(self) -> str:
+        """
+        :return: Prometheus metric type
+        """
+
+    def __init__(
+        self, name: str, documentation: str, label_names: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _render_samples(self) -> list[str]:
+        """
+        :return: Sample lines for the Prometheus text format
+        """
+
+    def render(self) -> list[str]:
+        """
+        :return: Lines for the Prometheus text format
+        """
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *self._render_samples(),
+        ]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, label_names: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """
+        :param labels: Values for `label_names`, in the same order
+        :param amount: Value to add
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            values = self._values.copy()
+        return [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+            for labels, value in values.items()
+        ]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        """
+        :param value: Current value
+        :param labels: Values for `label_names`, in the same order
+        """
+        with self._lock:
+            self._values[labels] = value
+
+
+@dataclass
+class HistogramValue:
+    # Observations per bucket, last one is `+Inf`
+    bucket_counts: list[int]
+    sum: float = 0.0
+    count: int = 0
+
+
+@dataclass
+class HistogramSnapshot:
+    buckets: tuple[float, ...]
+    values: dict[tuple[str, ...], HistogramValue] = field(default_factory=dict)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(float(bucket) for bucket in buckets))
+        self._values: dict[tuple[str, ...], HistogramValue] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        :param value: Observed value
+        :param labels: Values for `label_names`, in the same order
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            histogram_value = self._values.get(labels)
+            if histogram_value is None:
+                histogram_value = self._values[labels] = HistogramValue(
+                    [0] * (len(self.buckets) + 1)
+                )
+            histogram_value.bucket_counts[index] += 1
+            histogram_value.sum += value
+            histogram_value.count += 1
+
+    def snapshot(self) -> HistogramSnapshot:
+        """
+        :return: Copy of the current values, safe to read while new values are observed
+        """
+        with self._lock:
+            return HistogramSnapshot(
+                self.buckets,
+                {
+                    labels: HistogramValue(
+                        value.bucket_counts.copy(), value.sum, value.count
+                    )
+                    for labels, value in self._values.items()
+                },
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _render_samples(self) -> list[str]:
+        snapshot = self.snapshot()
+        bucket_label_names = (*self.label_names, "le")
+        lines = []
+        for labels, value in snapshot.values.items():
+            cumulative_count = 0
+            for bucket, bucket_count in zip(
+                (*snapshot.buckets, float("inf")), value.bucket_counts, strict=True
+            ):
+                cumulative_count += bucket_count
+                bucket_labels = _format_labels(
+                    bucket_label_names, (*labels, _format_value(bucket))
+                )
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative_count}")
+            formatted_labels = _format_labels(self.label_names, labels)
+            lines.append(
+                f"{self.name}_sum{formatted_labels} {_format_value(value.sum)}"
+            )
+            lines.append(f"{self.name}_count{formatted_labels} {value.count}")
+        return lines
+
+
+MetricType = TypeVar("MetricType", bound=Metric)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: list[Metric] = []
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: MetricType) -> MetricType:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """
+        :param collector: Called before rendering, to update metrics read from other components (e.g. gauges)
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        :return: Every registered metric in the Prometheus text format
+        """
+        for collector in self._collectors:
+            collector()
+        lines = [line for metric in self._metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration_seconds = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route",
+        ("method", "route"),
+    )
+)
+db_pool_connections = registry.register(
+    Gauge(
+        "db_pool_connections",
+        "Database pool connections by state",
+        ("engine", "state"),
+    )
+)
+queue_messages_consumed_total = registry.register(
+    Counter(
+        "queue_messages_consumed_total",
+        "Messages received from RabbitMQ",
+        ("consumer",),
+    )
+)
+queue_messages_acked_total = registry.register(
+    Counter(
+        "queue_messages_acked_total",
+        "Messages ACKed after being processed",
+        ("consumer",),
+    )
+)
+queue_messages_failed_total = registry.register(
+    Counter(
+        "queue_messages_failed_total",
+        "Messages NACKed because the handler failed",
+        ("consumer",),
+    )
+)
+queue_messages_retried_total = registry.register(
+    Counter(
+        "queue_messages_retried_total",
+        "Failed messages sent to a retry queue",
+        ("consumer",),
+    )
+)
+queue_messages_dead_lettered_total = registry.register(
+    Counter(
+        "queue_messages_dead_lettered_total",
+        "Messages sent to the dead letter queue after the last retry failed",
+        ("consumer",),
+    )
+)
+queue_handler_duration_seconds = registry.register(
+    Histogram(
+        "queue_handler_duration_seconds",
+        "Time spent in the message handler, per message or per batch",
+        ("consumer",),
+    )
+)
+queue_messages_published_total = registry.register(
+    Counter(
+        "queue_messages_published_total",
+        "Messages published to RabbitMQ and confirmed by the broker",
+    )
+)
+queue_messages_publish_failed_total = registry.register(
+    Counter(
+        "queue_messages_publish_failed_total",
+        "Messages rejected by the broker or not published because of a connection error",
+    )
+)
+event_hub_subscribers = registry.register(
+    Gauge(
+        "event_hub_subscribers",
+        "Clients subscribed to Safe events",
+    )
+)
+event_hub_evicted_subscribers_total = registry.register(
+    Counter(
+        "event_hub_evicted_subscribers_total",
+        "Subscribers disconnected because they didn't read events fast enough",
+    )
+)
+outbox_events_relayed_total = registry.register(
+    Counter(
+        "outbox_events_relayed_total",
+        "Outbox events published to RabbitMQ and deleted",
+    )
+)
+events_duplicates_dropped_total = registry.register(
+    Counter(
+        "events_duplicates_dropped_total",
+        "Consumed events dropped because they were already processed, by the tier detecting them",
+        ("tier",),
+    )
+)
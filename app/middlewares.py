@@ -0,0 +1,124 @@
+import datetime
+import logging
+import random
+import time
+
+from starlette.requests import Request
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .datasources.db.database import db_session, set_database_session_context
+from .datasources.db.instrumentation import track_queries
+from .loggers.safe_logger import DbQueriesLog, HttpRequestLog, HttpResponseLog
+from .metrics import http_request_duration_seconds
+
+logger = logging.getLogger(__name__)
+
+# Label for requests not matching any route, so unknown paths don't create new histograms
+UNMATCHED_ROUTE = "unmatched"
+
+
+class LoggingMiddleware:
+    """
+    Measure every HTTP request and keep the latency per route template in
+    `http_request_duration_seconds`.
+
+    Requests are logged with `http_request`, `http_response` and, if the database was
+    queried, `db_queries` context. Only a
+    `HTTP_LOG_SAMPLE_RATE` fraction of them is logged, errors and requests slower than
+    `HTTP_LOG_SLOW_REQUEST_MS` are always logged.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = datetime.datetime.now(datetime.UTC)
+        start = time.perf_counter()
+        # If the response is not started the request failed
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            with track_queries() as query_stats:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            # Routers set the matched route in the scope
+            route: BaseRoute | None = scope.get("route")
+            route_path = getattr(route, "path", UNMATCHED_ROUTE)
+            http_request_duration_seconds.observe(elapsed, scope["method"], route_path)
+
+            total_time = int(elapsed * 1000)
+            if (
+                status >= 500
+                or total_time >= settings.HTTP_LOG_SLOW_REQUEST_MS
+                or random.random() < settings.HTTP_LOG_SAMPLE_RATE
+            ):
+                logger.info(
+                    "Http request",
+                    extra={
+                        "http_request": HttpRequestLog(
+                            url=str(Request(scope).url),
+                            method=scope["method"],
+                            route=route_path,
+                            startTime=start_time,
+                        ),
+                        "http_response": HttpResponseLog(
+                            status=status,
+                            endTime=datetime.datetime.now(datetime.UTC),
+                            totalTime=total_time,
+                        ),
+                        "db_queries": (
+                            DbQueriesLog(
+                                count=query_stats.count,
+                                totalTime=int(query_stats.total_time * 1000),
+                            )
+                            if query_stats.count
+                            else None
+                        ),
+                    },
+                )
+
+
+class DatabaseSessionMiddleware:
+    """
+    Run every HTTP request in its own database session, see `set_database_session_context`.
+
+    The session checks out a connection on its first statement and returns it on commit
+    or rollback. The session is removed when the last chunk of the body is produced, so
+    streaming responses can keep querying and pending read transactions don't hold a
+    connection while the last chunk is sent. Routes depending on
+    `read_only_database_session` are routed to the read replica.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                await db_session.remove()
+            await send(message)
+
+        with set_database_session_context():
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                await db_session.remove()
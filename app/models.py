@@ -1,5 +1,77 @@
-from pydantic import BaseModel
+import datetime
+from typing import Annotated
+
+from fastapi_camelcase import CamelModel
+from pydantic import BaseModel, BeforeValidator, Field, StringConstraints
+from safe_eth.eth.utils import fast_to_checksum_address
+
+from .datasources.db.models import SafeOperationEnum
+
+
+def _to_checksum_address(value: bytes | str | None) -> str | None:
+    if isinstance(value, bytes):
+        return fast_to_checksum_address(value)
+    return value
+
+
+def _to_hex(value: bytes | str | None) -> str | None:
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    return value
+
+
+def _to_str(value: int | str) -> str:
+    return str(value)
+
+
+ChecksumAddressStr = Annotated[str, BeforeValidator(_to_checksum_address)]
+HexStr = Annotated[str, BeforeValidator(_to_hex)]
+# uint256 values are returned as strings, as they don't fit in a JSON number for most clients
+Uint256Str = Annotated[str, BeforeValidator(_to_str)]
+Hash32Str = Annotated[str, StringConstraints(pattern=r"^0x[0-9a-fA-F]{64}$")]
+
+MAX_LOOKUP_SAFE_TX_HASHES = 1000
 
 
 class About(BaseModel):
     version: str
+
+
+class MultisigTransactionPublic(CamelModel):
+    safe_tx_hash: HexStr
+    chain_id: Uint256Str
+    safe: ChecksumAddressStr
+    nonce: int
+    proposer: ChecksumAddressStr | None
+    proposed_by_delegate: ChecksumAddressStr | None
+    to: ChecksumAddressStr | None
+    value: Uint256Str
+    data: HexStr | None
+    operation: SafeOperationEnum
+    safe_tx_gas: Uint256Str
+    base_gas: Uint256Str
+    gas_price: Uint256Str
+    gas_token: ChecksumAddressStr | None
+    refund_receiver: ChecksumAddressStr | None
+    signatures: HexStr | None
+    failed: bool | None
+    origin: dict
+    tx_hash: HexStr | None
+    created: datetime.datetime
+    modified: datetime.datetime
+
+
+class MultisigTransactionPage(BaseModel):
+    next: str | None
+    results: list[MultisigTransactionPublic]
+
+
+class MultisigTransactionsLookup(CamelModel):
+    safe_tx_hashes: Annotated[
+        list[Hash32Str], Field(min_length=1, max_length=MAX_LOOKUP_SAFE_TX_HASHES)
+    ]
+
+
+class MultisigTransactionsLookupResult(BaseModel):
+    found: list[MultisigTransactionPublic]
+    missing: list[str]
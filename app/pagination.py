@@ -0,0 +1,71 @@
+"""
+Opaque cursors for keyset pagination.
+"""
+
+import base64
+import datetime
+import json
+from typing import Any
+
+CursorValue = int | datetime.datetime | bytes
+
+
+class InvalidCursorException(ValueError):
+    """
+    Raised when a cursor cannot be decoded.
+    """
+
+    pass
+
+
+def _serialize_value(value: CursorValue) -> Any:
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+def encode_cursor(*values: CursorValue) -> str:
+    """
+    Encode the keyset values of the last returned row in an url safe string.
+
+    :param values: Values of the sorting columns, in the same order used for sorting.
+    :return: Opaque cursor
+    """
+    payload = json.dumps(
+        [_serialize_value(value) for value in values], separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type[CursorValue]) -> tuple[CursorValue, ...]:
+    """
+    Decode a cursor created by `encode_cursor`.
+
+    :param cursor: Opaque cursor
+    :param types: Expected type for every value of the cursor.
+    :return: Keyset values
+    :raises InvalidCursorException: if the cursor is malformed or does not match `types`.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise InvalidCursorException(f"Invalid cursor {cursor}")
+
+        decoded: list[CursorValue] = []
+        for value, value_type in zip(values, types, strict=True):
+            if value_type is datetime.datetime:
+                decoded.append(datetime.datetime.fromisoformat(value))
+            elif value_type is bytes:
+                decoded.append(bytes.fromhex(value))
+            elif isinstance(value, int) and not isinstance(value, bool):
+                decoded.append(value)
+            else:
+                raise InvalidCursorException(f"Invalid cursor {cursor}")
+        return tuple(decoded)
+    except InvalidCursorException:
+        raise
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorException(f"Invalid cursor {cursor}") from e
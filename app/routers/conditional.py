@@ -0,0 +1,41 @@
+"""
+Helpers for HTTP conditional requests (`ETag`/`If-None-Match`).
+
+`Last-Modified`/`If-Modified-Since` are not supported, HTTP dates have second precision
+and a modification date doesn't change when a row is deleted.
+"""
+
+from fastapi import Request
+
+
+def build_etag(*values: object) -> str:
+    """
+    :param values: Values identifying the version of the resource
+    :return: Weak `ETag`
+    """
+    return 'W/"' + "-".join(str(value) for value in values) + '"'
+
+
+def get_validator_headers(etag: str) -> dict[str, str]:
+    """
+    :param etag:
+    :return: Headers to return with the response, clients must revalidate before using their copy
+    """
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Check the `If-None-Match` request precondition.
+
+    :param request:
+    :param etag: Current `ETag` of the resource
+    :return: `True` if the client copy is still valid and `304 Not Modified` can be returned
+    """
+    if if_none_match := request.headers.get("if-none-match"):
+        # Weak comparison
+        client_etags = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        return "*" in client_etags or etag.removeprefix("W/") in client_etags
+    return False
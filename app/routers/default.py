@@ -2,7 +2,9 @@ from typing import Literal
 
 from fastapi import APIRouter
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse
+
+from ..metrics import registry
 
 router = APIRouter()
 
@@ -34,3 +36,14 @@ async def redoc_html():
 @router.get("/health", include_in_schema=False)
 async def health() -> Literal["OK"]:
     return "OK"
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    """
+    Metrics in the Prometheus text format.
+    Defined as a sync endpoint, so rendering runs in the threadpool and not in the event loop.
+    """
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,89 @@
+import asyncio
+import re
+from collections.abc import AsyncGenerator, Sequence
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from ..config import settings
+from ..services.event_hub import event_hub
+from .params import parse_checksum_address
+
+router = APIRouter(
+    prefix="/events",
+    tags=["Events"],
+)
+
+MAX_SUBSCRIBED_SAFES = 100
+# Line terminators of the `text/event-stream` format
+_LINE_BREAK_PATTERN = re.compile(r"\r\n|\r|\n")
+
+
+def _format_server_sent_event(data: str) -> bytes:
+    """
+    :param data:
+    :return: Event with a `data` field per line, clients join them back with `\\n`
+    """
+    lines = _LINE_BREAK_PATTERN.split(data)
+    return ("".join(f"data: {line}\n" for line in lines) + "\n").encode()
+
+
+async def _to_server_sent_events(
+    safes: Sequence[str], heartbeat_seconds: float
+) -> AsyncGenerator[bytes]:
+    """
+    Subscribe to `event_hub` while the response is streamed.
+
+    :param safes: Checksummed Safe addresses
+    :param heartbeat_seconds: Send a comment if there are no events for this time, so
+        proxies keep the connection open and dead clients are detected
+    :return: Events in `text/event-stream` format, until the subscription is evicted
+    """
+    subscription = event_hub.subscribe(safes)
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), heartbeat_seconds
+                )
+            except TimeoutError:
+                yield b": heartbeat\n\n"
+                continue
+            if event is None:
+                # Evicted, client can reconnect
+                yield b"event: evicted\ndata: {}\n\n"
+                return
+            yield _format_server_sent_event(event)
+    finally:
+        event_hub.unsubscribe(subscription)
+
+
+@router.get(
+    "",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def subscribe_to_events(
+    safes: Annotated[
+        list[str],
+        Query(
+            alias="safe",
+            min_length=1,
+            max_length=MAX_SUBSCRIBED_SAFES,
+            description="Checksummed Safe address, can be repeated",
+        ),
+    ],
+) -> StreamingResponse:
+    """
+    Stream the safe-transaction-service events of the multisig transactions of the `safe`s
+    as Server-Sent Events, `data` is the event json. Clients reading too slow are
+    disconnected after an `evicted` event.
+    """
+    for safe in safes:
+        parse_checksum_address(safe)
+    return StreamingResponse(
+        _to_server_sent_events(safes, settings.EVENTS_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
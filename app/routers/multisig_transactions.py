@@ -0,0 +1,183 @@
+import datetime
+from collections.abc import AsyncIterator, Sequence
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+
+from ..config import settings
+from ..datasources.db.database import read_only_database_session
+from ..datasources.db.fields import BIGINT_MAX
+from ..datasources.db.models import MultisigTransaction
+from ..models import (
+    MultisigTransactionPage,
+    MultisigTransactionPublic,
+    MultisigTransactionsLookup,
+    MultisigTransactionsLookupResult,
+)
+from ..pagination import InvalidCursorException, decode_cursor, encode_cursor
+from .params import parse_checksum_address
+
+router = APIRouter(
+    prefix="/multisig-transactions",
+    tags=["Multisig transactions"],
+)
+
+# Transactions serialized per chunk of the streamed response
+EXPORT_CHUNK_SIZE = 100
+# Lookups with more hashes than this are streamed
+LOOKUP_STREAM_THRESHOLD = 100
+MAX_CHANGES_LIMIT = 500
+
+
+async def _to_ndjson(
+    transactions: AsyncIterator[MultisigTransaction],
+) -> AsyncIterator[bytes]:
+    """
+    :param transactions:
+    :return: Chunks of `EXPORT_CHUNK_SIZE` transactions, one json per line
+    """
+    lines: list[bytes] = []
+    async for transaction in transactions:
+        lines.append(
+            to_json(
+                MultisigTransactionPublic.model_validate(
+                    transaction, from_attributes=True
+                ),
+                by_alias=True,
+            )
+        )
+        if len(lines) == EXPORT_CHUNK_SIZE:
+            yield b"\n".join(lines) + b"\n"
+            lines.clear()
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+async def _to_lookup_json(safe_tx_hashes: Sequence[bytes]) -> AsyncIterator[bytes]:
+    """
+    :param safe_tx_hashes:
+    :return: `MultisigTransactionsLookupResult` json in chunks, found transactions are
+        serialized as they are fetched
+    """
+    missing = set(safe_tx_hashes)
+    separator = b""
+    yield b'{"found":['
+    async for transaction in MultisigTransaction.iter_by_safe_tx_hashes(safe_tx_hashes):
+        missing.discard(transaction.safe_tx_hash)
+        yield separator + to_json(
+            MultisigTransactionPublic.model_validate(transaction, from_attributes=True),
+            by_alias=True,
+        )
+        separator = b","
+    yield (
+        b'],"missing":'
+        + to_json(
+            [
+                "0x" + safe_tx_hash.hex()
+                for safe_tx_hash in safe_tx_hashes
+                if safe_tx_hash in missing
+            ]
+        )
+        + b"}"
+    )
+
+
+@router.get(
+    "/changes",
+    response_model=MultisigTransactionPage,
+    dependencies=[Depends(read_only_database_session)],
+)
+async def get_multisig_transaction_changes(
+    chain_id: Annotated[int | None, Query(ge=0, le=BIGINT_MAX)] = None,
+    safe: Annotated[str | None, Query(description="Checksummed Safe address")] = None,
+    cursor: Annotated[
+        str | None,
+        Query(description="`next` value of the previous response, empty to start"),
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_CHANGES_LIMIT)] = 100,
+) -> MultisigTransactionPage:
+    """
+    Get the multisig transactions created or updated since the `cursor`, sorted by modification.
+    Changes are returned after a few seconds, so transactions still being committed are not skipped.
+    `next` is always returned, even if there are no changes, keep using it to receive new changes.
+    """
+    try:
+        keyset = decode_cursor(cursor, datetime.datetime, bytes) if cursor else None
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    high_water_mark = datetime.datetime.now(datetime.UTC) - datetime.timedelta(
+        seconds=settings.CHANGES_SAFETY_LAG_SECONDS
+    )
+    transactions = await MultisigTransaction.get_changes(
+        limit,
+        chain_id=chain_id,
+        safe=parse_checksum_address(safe) if safe is not None else None,
+        cursor=keyset,  # type: ignore[arg-type]
+        modified_before=high_water_mark,
+    )
+    if transactions:
+        last = transactions[-1]
+        cursor = encode_cursor(last.modified, last.safe_tx_hash)
+    elif cursor is None:
+        # Nothing changed before the high water mark, start from it
+        cursor = encode_cursor(high_water_mark, bytes(32))
+    return MultisigTransactionPage(
+        next=cursor,
+        results=[
+            MultisigTransactionPublic.model_validate(transaction, from_attributes=True)
+            for transaction in transactions
+        ],
+    )
+
+
+@router.post(
+    "/lookup",
+    response_model=MultisigTransactionsLookupResult,
+    dependencies=[Depends(read_only_database_session)],
+)
+async def lookup_multisig_transactions(lookup: MultisigTransactionsLookup) -> Response:
+    """
+    Get the multisig transactions for many `safeTxHashes` at once. Hashes not stored
+    are returned in `missing`.
+    """
+    # Remove duplicates keeping the order
+    safe_tx_hashes = list(
+        dict.fromkeys(
+            bytes.fromhex(safe_tx_hash[2:]) for safe_tx_hash in lookup.safe_tx_hashes
+        )
+    )
+    content = _to_lookup_json(safe_tx_hashes)
+    if len(safe_tx_hashes) > LOOKUP_STREAM_THRESHOLD:
+        return StreamingResponse(content, media_type="application/json")
+    return Response(
+        content=b"".join([chunk async for chunk in content]),
+        media_type="application/json",
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(read_only_database_session)],
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def export_multisig_transactions(
+    chain_id: Annotated[int | None, Query(ge=0, le=BIGINT_MAX)] = None,
+    safe: Annotated[str | None, Query(description="Checksummed Safe address")] = None,
+) -> StreamingResponse:
+    """
+    Export the multisig transactions of a chain and/or a Safe as newline delimited json,
+    one transaction per line. Rows are streamed from the database, so there is no limit.
+    """
+    if chain_id is None and safe is None:
+        raise HTTPException(status_code=422, detail="chain_id or safe is required")
+    transactions = MultisigTransaction.iter_for_export(
+        chain_id=chain_id,
+        safe=parse_checksum_address(safe) if safe is not None else None,
+    )
+    return StreamingResponse(
+        _to_ndjson(transactions), media_type="application/x-ndjson"
+    )
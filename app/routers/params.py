@@ -0,0 +1,15 @@
+from fastapi import HTTPException
+from safe_eth.eth.utils import fast_is_checksum_address
+
+
+def parse_checksum_address(address: str) -> bytes:
+    """
+    :param address: Address received in a request
+    :return: Address bytes
+    :raises HTTPException: 422 if the address is not checksummed
+    """
+    if not fast_is_checksum_address(address):
+        raise HTTPException(
+            status_code=422, detail=f"Address {address} is not checksummed"
+        )
+    return bytes.fromhex(address[2:])
@@ -0,0 +1,113 @@
+import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+
+from ..datasources.cache.page_cache import multisig_transactions_cache
+from ..datasources.db.database import read_only_database_session
+from ..datasources.db.fields import BIGINT_MAX
+from ..datasources.db.models import MultisigTransaction
+from ..models import MultisigTransactionPage, MultisigTransactionPublic
+from ..pagination import InvalidCursorException, decode_cursor, encode_cursor
+from .conditional import build_etag, get_validator_headers, is_not_modified
+from .params import parse_checksum_address
+
+router = APIRouter(
+    prefix="/safes",
+    tags=["Safes"],
+)
+
+MAX_PAGE_LIMIT = 200
+# Cached pages are stored as `<ETag><separator><json>`, the `ETag` never contains it
+_CACHED_ETAG_SEPARATOR = b"\n"
+
+
+@router.get(
+    "/{address}/multisig-transactions",
+    response_model=MultisigTransactionPage,
+    dependencies=[Depends(read_only_database_session)],
+)
+async def get_safe_multisig_transactions(
+    request: Request,
+    address: Annotated[str, Path(description="Checksummed Safe address")],
+    chain_id: Annotated[int | None, Query(ge=0, le=BIGINT_MAX)] = None,
+    executed: Annotated[
+        bool | None,
+        Query(description="`true` for executed transactions, `false` for pending"),
+    ] = None,
+    nonce_gte: Annotated[int | None, Query(ge=0, le=BIGINT_MAX)] = None,
+    nonce_lte: Annotated[int | None, Query(ge=0, le=BIGINT_MAX)] = None,
+    cursor: Annotated[
+        str | None, Query(description="`next` value of the previous page")
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_LIMIT)] = 20,
+) -> Response:
+    """
+    Get the multisig transactions for a Safe sorted by `nonce` and `created` descending.
+    Pagination is cursor based, use `next` from the response as `cursor` to get the following page.
+
+    Supports conditional requests, `304 Not Modified` is returned if no transaction of the
+    Safe was created, updated or deleted since the provided `ETag` (`If-None-Match`).
+    """
+    safe = parse_checksum_address(address)
+    try:
+        keyset = (
+            decode_cursor(cursor, int, datetime.datetime, bytes) if cursor else None
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    cache_key = safe.hex()
+    cache_field = f"{chain_id}:{executed}:{nonce_gte}:{nonce_lte}:{limit}:{cursor}"
+    cached_page = await multisig_transactions_cache.get(cache_key, cache_field)
+    # Pages cached without `ETag` by previous versions are ignored
+    if cached_page and _CACHED_ETAG_SEPARATOR in cached_page:
+        # Pages are invalidated on every change, so their `ETag` is still valid
+        cached_etag, _, payload = cached_page.partition(_CACHED_ETAG_SEPARATOR)
+        etag = cached_etag.decode()
+        headers = get_validator_headers(etag)
+        if is_not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=payload, media_type="application/json", headers=headers)
+
+    # Read before the database, so the page is not cached if it's invalidated meanwhile
+    cache_generation = await multisig_transactions_cache.get_generation(cache_key)
+    last_modified, count = await MultisigTransaction.get_version(safe, chain_id)
+    etag = build_etag(
+        count, int(last_modified.timestamp() * 1_000_000) if last_modified else 0
+    )
+    headers = get_validator_headers(etag)
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    transactions = await MultisigTransaction.get_by_safe(
+        safe,
+        # Fetch an extra row to know if there is a next page
+        limit=limit + 1,
+        chain_id=chain_id,
+        executed=executed,
+        nonce_gte=nonce_gte,
+        nonce_lte=nonce_lte,
+        cursor=keyset,  # type: ignore[arg-type]
+    )
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        last = transactions[-1]
+        next_cursor = encode_cursor(last.nonce, last.created, last.safe_tx_hash)
+
+    page = MultisigTransactionPage(
+        next=next_cursor,
+        results=[
+            MultisigTransactionPublic.model_validate(transaction, from_attributes=True)
+            for transaction in transactions
+        ],
+    )
+    payload = page.model_dump_json(by_alias=True).encode()
+    await multisig_transactions_cache.set(
+        cache_key,
+        cache_field,
+        etag.encode() + _CACHED_ETAG_SEPARATOR + payload,
+        cache_generation,
+    )
+    return Response(content=payload, media_type="application/json", headers=headers)
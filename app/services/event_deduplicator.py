@@ -0,0 +1,143 @@
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from redis.exceptions import RedisError
+
+from ..config import settings
+from ..datasources.cache.redis import get_redis
+from ..metrics import events_duplicates_dropped_total
+
+logger = logging.getLogger(__name__)
+
+
+class EventDeduplicator:
+    """
+    Drop messages already processed, like redeliveries or publisher retries, before they
+    reach the handlers. Opt-in, for handlers too expensive to run again for a redelivery.
+
+    - Messages are identified by their delivery identity, the AMQP `message_id` set by the
+      publisher. Events don't have an id and the same event can be legitimately sent again,
+      so the content is not used. Messages without `message_id` are never dropped.
+    - Ids are remembered for `ttl` seconds in a bounded in-process LRU, and optionally
+      in Redis so every worker shares them. Redis errors are logged and handled as unseen
+      messages.
+    - Ids are only stored with `mark_as_seen` after processing succeeds, so a failed
+      message is not dropped when it's retried.
+    """
+
+    def __init__(
+        self,
+        max_size: int | None = None,
+        redis_enabled: bool | None = None,
+        ttl: int | None = None,
+        prefix: str = "events-dedup",
+    ) -> None:
+        """
+        :param max_size: Max ids kept in memory, `EVENTS_DEDUP_CACHE_SIZE` by default
+        :param redis_enabled: Share the ids in Redis, `EVENTS_DEDUP_REDIS_ENABLED` by default
+        :param ttl: Seconds the ids are remembered, `EVENTS_DEDUP_TTL_SECONDS` by default
+        :param prefix: Prefix for the Redis keys
+        """
+        self.max_size = max_size or settings.EVENTS_DEDUP_CACHE_SIZE
+        self.redis_enabled = (
+            settings.EVENTS_DEDUP_REDIS_ENABLED
+            if redis_enabled is None
+            else redis_enabled
+        )
+        self.ttl = ttl or settings.EVENTS_DEDUP_TTL_SECONDS
+        self.prefix = prefix
+        # Message id and its expiration, in `time.monotonic` seconds
+        self._seen: OrderedDict[str, float] = OrderedDict()
+
+    def _get_redis_key(self, message_id: str) -> str:
+        return f"{self.prefix}:{message_id}"
+
+    def _remember(self, message_id: str) -> None:
+        self._seen[message_id] = time.monotonic() + self.ttl
+        self._seen.move_to_end(message_id)
+        if len(self._seen) > self.max_size:
+            self._seen.popitem(last=False)
+
+    def _is_seen_in_memory(self, message_id: str) -> bool:
+        expiration = self._seen.get(message_id)
+        if expiration is None:
+            return False
+        if expiration <= time.monotonic():
+            del self._seen[message_id]
+            return False
+        self._seen.move_to_end(message_id)
+        return True
+
+    async def _get_seen_in_redis(self, message_ids: Sequence[str]) -> set[str]:
+        """
+        :param message_ids:
+        :return: Message ids stored in Redis, checked in one round trip
+        """
+        try:
+            async with get_redis().pipeline(transaction=False) as pipeline:
+                for message_id in message_ids:
+                    pipeline.exists(self._get_redis_key(message_id))
+                results = await pipeline.execute()
+        except RedisError:
+            logger.warning("Cannot get processed events from Redis", exc_info=True)
+            return set()
+        return {
+            message_id
+            for message_id, exists in zip(message_ids, results, strict=True)
+            if exists
+        }
+
+    async def filter_unseen(
+        self, messages: Sequence[tuple[str | None, bytes]]
+    ) -> list[tuple[str | None, bytes]]:
+        """
+        Drop the messages already processed and the redeliveries inside the batch.
+
+        :param messages: `message_id` and body of every message
+        :return: Messages not processed yet, in the same order
+        """
+        unseen: list[tuple[str | None, bytes]] = []
+        unseen_ids: set[str] = set()
+        for message_id, body in messages:
+            if message_id is None:
+                unseen.append((message_id, body))
+            elif message_id in unseen_ids:
+                events_duplicates_dropped_total.inc("batch")
+            elif self._is_seen_in_memory(message_id):
+                events_duplicates_dropped_total.inc("memory")
+            else:
+                unseen_ids.add(message_id)
+                unseen.append((message_id, body))
+
+        if self.redis_enabled and unseen_ids:
+            seen_in_redis = await self._get_seen_in_redis(list(unseen_ids))
+            for message_id in seen_in_redis:
+                # Remaining Redis TTL is not known, it's remembered for `ttl` at most
+                self._remember(message_id)
+                events_duplicates_dropped_total.inc("redis")
+            unseen = [
+                (message_id, body)
+                for message_id, body in unseen
+                if message_id not in seen_in_redis
+            ]
+        return unseen
+
+    async def mark_as_seen(self, message_ids: Sequence[str]) -> None:
+        """
+        Store the ids of processed messages, so their redeliveries are dropped.
+
+        :param message_ids: Ids returned by `filter_unseen`
+        """
+        for message_id in message_ids:
+            self._remember(message_id)
+
+        if self.redis_enabled and message_ids:
+            try:
+                async with get_redis().pipeline(transaction=False) as pipeline:
+                    for message_id in message_ids:
+                        pipeline.set(self._get_redis_key(message_id), 1, ex=self.ttl)
+                    await pipeline.execute()
+            except RedisError:
+                logger.warning("Cannot store processed events in Redis", exc_info=True)
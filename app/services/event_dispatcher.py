@@ -0,0 +1,81 @@
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+from .event_deduplicator import EventDeduplicator
+from .event_models import (
+    MultisigTransactionEvent,
+    peek_event_type,
+    validate_multisig_transaction_event,
+)
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[list[MultisigTransactionEvent]], Awaitable[Any]]
+
+
+class EventDispatcher:
+    """
+    Decode raw events and send them to the handler registered for their type.
+    """
+
+    def __init__(self, deduplicator: EventDeduplicator | None = None) -> None:
+        """
+        :param deduplicator: Drop redelivered messages already dispatched, before parsing
+            them. Opt-in, for handlers too expensive to run again for a redelivery
+        """
+        self._handlers: dict[str, EventHandler] = {}
+        self.deduplicator = deduplicator
+
+    def register(self, event_types: Sequence[str], handler: EventHandler) -> None:
+        """
+        :param event_types: Event types handled by `handler`
+        :param handler: Async function receiving a list of decoded events. Must be idempotent,
+            events of a failed batch are dispatched again (see `QueueProvider.consume_batch`)
+        """
+        for event_type in event_types:
+            self._handlers[event_type] = handler
+
+    async def dispatch(
+        self,
+        bodies: Sequence[bytes],
+        message_ids: Sequence[str | None] | None = None,
+    ) -> int:
+        """
+        Decode a batch of raw events, events without a registered handler and, if there is
+        a `deduplicator`, messages already processed are skipped before parsing them.
+        Every handler is called once with its events, in delivery order. Messages are
+        marked as processed once every handler succeeded.
+
+        :param bodies: Raw events
+        :param message_ids: AMQP `message_id` of every event, used by the `deduplicator`
+        :return: Number of dispatched events
+        """
+        messages: list[tuple[str | None, bytes]] = [
+            (message_id, body)
+            for message_id, body in zip(
+                message_ids or [None] * len(bodies), bodies, strict=True
+            )
+            if peek_event_type(body) in self._handlers
+        ]
+        if self.deduplicator:
+            messages = await self.deduplicator.filter_unseen(messages)
+        handled_bodies = [body for _, body in messages]
+
+        events_by_handler: dict[EventHandler, list[MultisigTransactionEvent]] = {}
+        for body in handled_bodies:
+            if not (event := validate_multisig_transaction_event(body)):
+                continue
+            # `peek_event_type` can match a nested `type` key, trust the validated one
+            if not (handler := self._handlers.get(event.type)):
+                logger.warning(f"No handler registered for {event.type} event {body!r}")
+                continue
+            events_by_handler.setdefault(handler, []).append(event)
+
+        for handler, events in events_by_handler.items():
+            await handler(events)
+        if self.deduplicator:
+            await self.deduplicator.mark_as_seen(
+                [message_id for message_id, _ in messages if message_id is not None]
+            )
+        return sum(len(events) for events in events_by_handler.values())
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+
+from ..config import settings
+from ..metrics import event_hub_evicted_subscribers_total, event_hub_subscribers
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    Events for a set of Safes, buffered until the subscriber reads them.
+    `None` is received when the subscription is evicted.
+    """
+
+    def __init__(self, safes: frozenset[str], max_size: int) -> None:
+        self.safes = safes
+        self.queue: asyncio.Queue[str | None] = asyncio.Queue(max_size)
+        self.evicted = False
+
+
+class EventHub:
+    """
+    In process pub/sub routing events to the subscribers of a Safe.
+
+    Every subscriber has a bounded buffer. If it is full, the subscriber is too slow
+    and it's evicted instead of blocking the publisher or buffering without limit.
+    """
+
+    def __init__(self) -> None:
+        self._subscriptions: defaultdict[str, set[Subscription]] = defaultdict(set)
+
+    def subscribe(
+        self, safes: Iterable[str], max_size: int | None = None
+    ) -> Subscription:
+        """
+        :param safes: Checksummed Safe addresses
+        :param max_size: Max number of buffered events, `EVENTS_SUBSCRIBER_QUEUE_SIZE` by default.
+        :return: Subscription receiving the events of `safes`
+        """
+        subscription = Subscription(
+            frozenset(safes), max_size or settings.EVENTS_SUBSCRIBER_QUEUE_SIZE
+        )
+        for safe in subscription.safes:
+            self._subscriptions[safe].add(subscription)
+        event_hub_subscribers.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Stop routing events to the subscription, it's safe to call it more than once.
+
+        :param subscription:
+        """
+        removed = False
+        for safe in subscription.safes:
+            subscribers = self._subscriptions.get(safe)
+            if subscribers and subscription in subscribers:
+                subscribers.discard(subscription)
+                removed = True
+                if not subscribers:
+                    del self._subscriptions[safe]
+        if removed:
+            event_hub_subscribers.inc(amount=-1)
+
+    def _evict(self, subscription: Subscription) -> None:
+        logger.warning(
+            f"Evicting slow subscriber of {len(subscription.safes)} Safes, "
+            f"{subscription.queue.qsize()} events not read"
+        )
+        self.unsubscribe(subscription)
+        subscription.evicted = True
+        # Pending events are discarded, so the subscriber is notified right away
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+        event_hub_evicted_subscribers_total.inc()
+
+    def publish(self, safe: str, event: str) -> int:
+        """
+        Send an event to the subscribers of a Safe without waiting for them.
+
+        :param safe: Checksummed Safe address
+        :param event: Raw event
+        :return: Number of subscribers the event was delivered to
+        """
+        delivered = 0
+        for subscription in list(self._subscriptions.get(safe, ())):
+            try:
+                subscription.queue.put_nowait(event)
+                delivered += 1
+            except asyncio.QueueFull:
+                self._evict(subscription)
+        return delivered
+
+
+event_hub = EventHub()
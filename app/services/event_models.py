@@ -0,0 +1,125 @@
+"""
+Typed safe-transaction-service events and their decoding from RabbitMQ message bodies.
+"""
+
+import logging
+import re
+from typing import Annotated, Literal
+
+from fastapi_camelcase import CamelModel
+from pydantic import Field, StringConstraints, TypeAdapter, ValidationError
+
+logger = logging.getLogger(__name__)
+
+
+# safe-transaction-service sends checksummed addresses, only the format is validated
+# as computing the checksum is more expensive than parsing the whole event
+ChecksumAddress = Annotated[str, StringConstraints(pattern=r"^0x[0-9a-fA-F]{40}$")]
+
+
+class MultisigTransactionEventBase(CamelModel):
+    address: ChecksumAddress
+    safe_tx_hash: str
+    chain_id: int | None = None
+
+
+class PendingMultisigTransactionEvent(MultisigTransactionEventBase):
+    type: Literal["PENDING_MULTISIG_TRANSACTION"]
+    to: str | None = None
+    data: str | None = None
+
+
+class NewConfirmationEvent(MultisigTransactionEventBase):
+    type: Literal["NEW_CONFIRMATION"]
+    owner: str | None = None
+
+
+class ExecutedMultisigTransactionEvent(MultisigTransactionEventBase):
+    type: Literal["EXECUTED_MULTISIG_TRANSACTION"]
+    tx_hash: str | None = None
+    failed: bool | None = None
+    to: str | None = None
+    data: str | None = None
+
+
+class DeletedMultisigTransactionEvent(MultisigTransactionEventBase):
+    type: Literal["DELETED_MULTISIG_TRANSACTION"]
+
+
+MultisigTransactionEvent = Annotated[
+    PendingMultisigTransactionEvent
+    | NewConfirmationEvent
+    | ExecutedMultisigTransactionEvent
+    | DeletedMultisigTransactionEvent,
+    Field(discriminator="type"),
+]
+
+_multisig_transaction_event_adapter: TypeAdapter[MultisigTransactionEvent] = (
+    TypeAdapter(MultisigTransactionEvent)
+)
+
+# safe-transaction-service events that modify the multisig transactions of a Safe
+MULTISIG_TRANSACTION_EVENT_TYPES = frozenset(
+    {
+        "PENDING_MULTISIG_TRANSACTION",
+        "NEW_CONFIRMATION",
+        "EXECUTED_MULTISIG_TRANSACTION",
+        "DELETED_MULTISIG_TRANSACTION",
+    }
+)
+
+# Events are flat json objects, first `type` key is the event type
+_EVENT_TYPE_PATTERN = re.compile(rb'"type"\s*:\s*"([A-Za-z_]+)"')
+_EVENT_ADDRESS_PATTERN = re.compile(rb'"address"\s*:\s*"0x([0-9a-fA-F]{40})"')
+
+
+def peek_event_type(body: bytes) -> str | None:
+    """
+    Get the type of an event without parsing it, to discard unsupported events cheaply.
+
+    :param body: Raw event
+    :return: Event type, `None` if not found
+    """
+    if match := _EVENT_TYPE_PATTERN.search(body):
+        return match.group(1).decode()
+    return None
+
+
+def peek_event_address(body: bytes) -> bytes | None:
+    """
+    Get the Safe address of an event without parsing it.
+
+    :param body: Raw event
+    :return: Address, `None` if not found
+    """
+    if match := _EVENT_ADDRESS_PATTERN.search(body):
+        return bytes.fromhex(match.group(1).decode())
+    return None
+
+
+def validate_multisig_transaction_event(
+    body: bytes,
+) -> MultisigTransactionEvent | None:
+    """
+    Parse and validate an event straight from the message bytes, without decoding them to `str`.
+
+    :param body: Raw event
+    :return: Event, `None` if it's not a valid multisig transaction event
+    """
+    try:
+        return _multisig_transaction_event_adapter.validate_json(body)
+    except ValidationError as e:
+        logger.error(f"Unsupported message {body!r}: {e}")
+        return None
+
+
+def decode_multisig_transaction_event(body: bytes) -> MultisigTransactionEvent | None:
+    """
+    Same as `validate_multisig_transaction_event`, other event types are skipped without parsing them.
+
+    :param body: Raw event
+    :return: Event, `None` if it's not a valid multisig transaction event
+    """
+    if peek_event_type(body) not in MULTISIG_TRANSACTION_EVENT_TYPES:
+        return None
+    return validate_multisig_transaction_event(body)
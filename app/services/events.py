@@ -0,0 +1,61 @@
+import logging
+from collections.abc import Sequence
+
+from hexbytes import HexBytes
+
+from ..config import settings
+from ..datasources.cache.page_cache import multisig_transactions_cache
+from .event_deduplicator import EventDeduplicator
+from .event_dispatcher import EventDispatcher
+from .event_hub import event_hub
+from .event_models import (
+    MULTISIG_TRANSACTION_EVENT_TYPES,
+    MultisigTransactionEvent,
+    decode_multisig_transaction_event,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class EventsService:
+    def __init__(self) -> None:
+        # Redeliveries are dropped by message id if `EVENTS_DEDUP_ENABLED`, worth it for
+        # handlers that write. Events re-sent with a new message id are still dispatched
+        self.dispatcher = EventDispatcher(
+            EventDeduplicator() if settings.EVENTS_DEDUP_ENABLED else None
+        )
+        self.dispatcher.register(
+            sorted(MULTISIG_TRANSACTION_EVENT_TYPES), self._invalidate_cache
+        )
+
+    async def _invalidate_cache(self, events: list[MultisigTransactionEvent]) -> None:
+        """
+        Cached multisig transactions of the affected Safes are invalidated with one request.
+
+        :param events:
+        """
+        safes = {HexBytes(event.address).hex() for event in events}
+        logger.debug(f"Invalidating multisig transactions cache for {safes}")
+        await multisig_transactions_cache.invalidate(*safes)
+
+    async def process_events(
+        self,
+        messages: list[bytes],
+        message_ids: Sequence[str | None] | None = None,
+    ) -> None:
+        """
+        Process a batch of safe-transaction-service events.
+
+        :param messages: Raw events
+        :param message_ids: AMQP `message_id` of every event, to drop redeliveries
+        """
+        await self.dispatcher.dispatch(messages, message_ids)
+
+    async def publish_event(self, message: bytes) -> None:
+        """
+        Send a safe-transaction-service event to the `event_hub` subscribers of its Safe.
+
+        :param message: Raw event
+        """
+        if event := decode_multisig_transaction_event(message):
+            event_hub.publish(event.address, message.decode())
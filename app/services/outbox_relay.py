@@ -0,0 +1,88 @@
+import asyncio
+import logging
+
+from ..config import settings
+from ..datasources.db.database import db_session, set_database_session_context
+from ..datasources.db.models import OutboxEvent
+from ..datasources.queue.queue_provider import QueueProvider
+from ..metrics import outbox_events_relayed_total
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """
+    Publish the events stored in the `OutboxEvent` table to RabbitMQ.
+
+    - A batch is locked with `FOR UPDATE SKIP LOCKED`, so every worker can run a relay
+      and a batch is only published by one of them.
+    - Events are published with `QueueProvider.publish_many` and deleted in the same
+      transaction after the broker confirms all of them.
+      If publishing fails or takes longer than `publish_timeout` the transaction is rolled
+      back, releasing the locks and the connection, and the batch is retried.
+    - Delivery is at least once: a batch confirmed by the broker is published again if
+      the process dies before deleting it.
+    """
+
+    def __init__(
+        self,
+        queue_provider: QueueProvider,
+        batch_size: int | None = None,
+        poll_interval_ms: int | None = None,
+        publish_timeout_seconds: float | None = None,
+    ) -> None:
+        """
+        :param queue_provider: Connected queue provider
+        :param batch_size: Max events published per transaction, `OUTBOX_RELAY_BATCH_SIZE` by default.
+        :param poll_interval_ms: Time to wait when there are no more pending events, `OUTBOX_RELAY_POLL_INTERVAL_MS` by default.
+        :param publish_timeout_seconds: Max time to wait for a batch to be published, `OUTBOX_RELAY_PUBLISH_TIMEOUT_SECONDS` by default.
+        """
+        self.queue_provider = queue_provider
+        self.batch_size = batch_size or settings.OUTBOX_RELAY_BATCH_SIZE
+        self.poll_interval = (
+            poll_interval_ms or settings.OUTBOX_RELAY_POLL_INTERVAL_MS
+        ) / 1000
+        self.publish_timeout = (
+            publish_timeout_seconds or settings.OUTBOX_RELAY_PUBLISH_TIMEOUT_SECONDS
+        )
+
+    async def relay_batch(self) -> int:
+        """
+        Publish and delete one batch of pending events.
+
+        :return: Number of published events
+        """
+        with set_database_session_context():
+            try:
+                events = await OutboxEvent.get_pending(self.batch_size)
+                if not events:
+                    return 0
+                await asyncio.wait_for(
+                    self.queue_provider.publish_many(
+                        [event.payload for event in events]
+                    ),
+                    self.publish_timeout,
+                )
+                await OutboxEvent.delete_by_ids(
+                    [event.id for event in events if event.id is not None]
+                )
+                await db_session.commit()
+            finally:
+                await db_session.remove()
+
+        outbox_events_relayed_total.inc(amount=len(events))
+        return len(events)
+
+    async def run(self) -> None:
+        """
+        Relay events until cancelled. Batches are relayed back to back while the outbox is
+        full, the table is polled every `poll_interval` otherwise.
+        """
+        while True:
+            try:
+                relayed = await self.relay_batch()
+            except Exception:
+                logger.exception("Error relaying outbox events")
+                relayed = 0
+            if relayed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
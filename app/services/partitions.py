@@ -0,0 +1,178 @@
+"""
+Partitioned consumption: events are routed to `RABBITMQ_PARTITIONS` queues by Safe address,
+and every partition is consumed by only one worker, so events of a Safe are processed in order.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from collections.abc import Sequence
+
+from ..config import settings
+from ..datasources.cache.redis import get_redis
+from ..datasources.queue.queue_provider import BatchCallback, QueueProvider
+from .event_models import peek_event_address
+
+logger = logging.getLogger(__name__)
+
+WORKERS_REDIS_KEY = "partitions:workers"
+
+
+def get_partition(address: bytes | None, partitions: int) -> int:
+    """
+    :param address: Safe address, events without one go to the first partition
+    :param partitions: Number of partitions
+    :return: Partition for the events of the Safe
+    """
+    if not address:
+        return 0
+    # Addresses are derived from a hash, so their last bytes are evenly distributed
+    return int.from_bytes(address[-8:]) % partitions
+
+
+def _get_weight(worker_id: str, partition: int) -> bytes:
+    return hashlib.blake2b(f"{worker_id}:{partition}".encode(), digest_size=8).digest()
+
+
+def assign_partitions(
+    worker_ids: Sequence[str], partitions: int
+) -> dict[str, list[int]]:
+    """
+    Split the partitions between the workers using rendezvous hashing: every worker computes
+    the same assignment from the list of workers, and when a worker joins or leaves only
+    the partitions it gets or had are moved.
+
+    :param worker_ids: Alive workers
+    :param partitions: Number of partitions
+    :return: Partitions of every worker
+    """
+    assignment: dict[str, list[int]] = {worker_id: [] for worker_id in worker_ids}
+    if not assignment:
+        return assignment
+    for partition in range(partitions):
+        owner = max(assignment, key=lambda worker_id: _get_weight(worker_id, partition))
+        assignment[owner].append(partition)
+    return assignment
+
+
+class PartitionRouter:
+    """
+    Route the events of the input queue to the partition queues. The input queue has a single
+    active consumer and batches are routed one after the other, so the order is kept.
+    """
+
+    def __init__(self, queue_provider: QueueProvider) -> None:
+        self.queue_provider = queue_provider
+
+    async def route(
+        self,
+        messages: list[bytes],
+        message_ids: Sequence[str | None] | None = None,
+    ) -> None:
+        """
+        :param messages: Raw events, in delivery order
+        :param message_ids: AMQP `message_id` of every event, kept in the partition queues
+        """
+        await self.queue_provider.publish_to_partitions(
+            [
+                (
+                    get_partition(
+                        peek_event_address(message), settings.RABBITMQ_PARTITIONS
+                    ),
+                    message,
+                )
+                for message in messages
+            ],
+            message_ids,
+        )
+
+
+class PartitionCoordinator:
+    """
+    Keep the partitions consumed by this worker in sync with the alive workers.
+
+    Workers register a heartbeat in a Redis sorted set, the ones without a heartbeat for
+    `PARTITIONS_WORKER_TTL_SECONDS` are removed. After a rebalance two workers could consume
+    the same partition for a moment, partition queues have a single active consumer so the
+    new owner only receives messages once the previous one cancels its consumer.
+    """
+
+    def __init__(
+        self,
+        queue_provider: QueueProvider,
+        callback: BatchCallback,
+        worker_id: str | None = None,
+    ) -> None:
+        """
+        :param queue_provider: Connected queue provider
+        :param callback: An async function to process the events of a partition, in order
+        :param worker_id: Unique id of the worker, random by default
+        """
+        self.queue_provider = queue_provider
+        self.callback = callback
+        self.worker_id = worker_id or str(uuid.uuid4())
+        self.partitions: set[int] = set()
+
+    async def get_worker_ids(self) -> list[str]:
+        """
+        Register the heartbeat of this worker and remove the expired ones.
+
+        :return: Alive workers
+        """
+        now = time.time()
+        async with get_redis().pipeline(transaction=True) as pipeline:
+            pipeline.zadd(WORKERS_REDIS_KEY, {self.worker_id: now})
+            pipeline.zremrangebyscore(
+                WORKERS_REDIS_KEY, "-inf", now - settings.PARTITIONS_WORKER_TTL_SECONDS
+            )
+            pipeline.zrange(WORKERS_REDIS_KEY, 0, -1)
+            *_, worker_ids = await pipeline.execute()
+        return [worker_id.decode() for worker_id in worker_ids]
+
+    async def rebalance(self) -> None:
+        """
+        Cancel the partitions assigned to other workers and consume the new ones.
+        """
+        worker_ids = await self.get_worker_ids()
+        assigned = set(
+            assign_partitions(worker_ids, settings.RABBITMQ_PARTITIONS)[self.worker_id]
+        )
+        if assigned == self.partitions:
+            return
+
+        for partition in self.partitions - assigned:
+            await self.queue_provider.cancel_partition(partition)
+            self.partitions.discard(partition)
+        for partition in sorted(assigned - self.partitions):
+            await self.queue_provider.consume_batch(self.callback, partition=partition)
+            self.partitions.add(partition)
+        logger.info(
+            f"Worker {self.worker_id} consuming partitions {sorted(assigned)} "
+            f"of {len(worker_ids)} workers"
+        )
+
+    async def leave(self) -> None:
+        """
+        Stop consuming and remove this worker, so other workers rebalance without waiting
+        for its heartbeat to expire.
+        """
+        for partition in self.partitions:
+            await self.queue_provider.cancel_partition(partition)
+        self.partitions = set()
+        await get_redis().zrem(WORKERS_REDIS_KEY, self.worker_id)
+
+    async def run(self) -> None:
+        """
+        Rebalance every `PARTITIONS_HEARTBEAT_SECONDS` until cancelled.
+        """
+        try:
+            while True:
+                try:
+                    await self.rebalance()
+                except Exception:
+                    logger.exception("Error rebalancing partitions")
+                await asyncio.sleep(settings.PARTITIONS_HEARTBEAT_SECONDS)
+        finally:
+            await self.leave()
@@ -0,0 +1,61 @@
+import unittest
+
+from app.datasources.cache.page_cache import PageCache
+from app.datasources.cache.redis import get_redis
+
+
+class TestPageCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        get_redis.cache_clear()
+        await get_redis().flushdb()
+        self.page_cache = PageCache("test", 60)
+
+    async def asyncTearDown(self):
+        await get_redis().aclose()
+
+    async def test_get_set(self):
+        self.assertIsNone(await self.page_cache.get("safe", "page-1"))
+        self.assertEqual(self.page_cache.misses, 1)
+
+        await self.page_cache.set("safe", "page-1", b"payload-1", 0)
+        await self.page_cache.set("safe", "page-2", b"payload-2", 0)
+        self.assertEqual(await self.page_cache.get("safe", "page-1"), b"payload-1")
+        self.assertEqual(await self.page_cache.get("safe", "page-2"), b"payload-2")
+        self.assertIsNone(await self.page_cache.get("other-safe", "page-1"))
+        self.assertEqual(self.page_cache.hits, 2)
+        self.assertEqual(self.page_cache.misses, 2)
+
+    async def test_ttl(self):
+        await self.page_cache.set("safe", "page-1", b"payload", 0)
+        await get_redis().expire("test:safe", 10)
+        # Storing new pages does not extend the expiration
+        await self.page_cache.set("safe", "page-2", b"payload", 0)
+        self.assertLessEqual(await get_redis().ttl("test:safe"), 10)
+
+    async def test_invalidate(self):
+        await self.page_cache.set("safe", "page-1", b"payload", 0)
+        await self.page_cache.set("safe", "page-2", b"payload", 0)
+        await self.page_cache.set("other-safe", "page-1", b"payload", 0)
+
+        await self.page_cache.invalidate("safe")
+        self.assertIsNone(await self.page_cache.get("safe", "page-1"))
+        self.assertIsNone(await self.page_cache.get("safe", "page-2"))
+        self.assertEqual(await self.page_cache.get("other-safe", "page-1"), b"payload")
+
+    async def test_set_after_invalidate(self):
+        generation = await self.page_cache.get_generation("safe")
+        self.assertEqual(generation, 0)
+        # Page data was read before the invalidation, it must not be stored
+        await self.page_cache.invalidate("safe")
+        self.assertFalse(
+            await self.page_cache.set("safe", "page-1", b"stale", generation)
+        )
+        self.assertIsNone(await self.page_cache.get("safe", "page-1"))
+
+        generation = await self.page_cache.get_generation("safe")
+        self.assertEqual(generation, 1)
+        self.assertTrue(
+            await self.page_cache.set("safe", "page-1", b"fresh", generation)
+        )
+        self.assertEqual(await self.page_cache.get("safe", "page-1"), b"fresh")
+        self.assertFalse(await self.page_cache.set("safe", "page-1", b"payload", None))
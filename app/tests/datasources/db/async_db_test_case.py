@@ -2,6 +2,7 @@ import unittest
 
 from sqlmodel import SQLModel
 
+from app.datasources.cache.redis import get_redis
 from app.datasources.db.database import get_engine
 
 
@@ -12,3 +13,9 @@ class AsyncDbTestCase(unittest.IsolatedAsyncioTestCase):
         async with self.engine.begin() as conn:
             await conn.run_sync(SQLModel.metadata.drop_all)
             await conn.run_sync(SQLModel.metadata.create_all)
+        # Redis client is bound to the event loop, every test runs in a new one
+        get_redis.cache_clear()
+        await get_redis().flushdb()
+
+    async def asyncTearDown(self):
+        await get_redis().aclose()
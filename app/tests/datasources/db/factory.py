@@ -3,7 +3,7 @@ import random
 from faker import Faker
 from hexbytes import HexBytes
 
-from app.datasources.db.fields import UINT256_MAX
+from app.datasources.db.fields import BIGINT_MAX, UINT256_MAX
 from app.datasources.db.models import MultisigTransaction, SafeOperationEnum
 
 fake = Faker()
@@ -11,7 +11,7 @@ fake = Faker()
 COMMON_CHAIN_IDS = [1, 5, 10, 56, 137, 42161, 11155111]
 
 
-async def multisig_transaction_factory(
+def build_multisig_transaction(
     safe_tx_hash: bytes | None = None,
     chain_id: int | None = None,
     safe: bytes | str | None = None,
@@ -32,11 +32,11 @@ async def multisig_transaction_factory(
     failed: bool | None = None,
     origin: dict | None = None,
 ) -> MultisigTransaction:
-    transaction = MultisigTransaction(
+    return MultisigTransaction(
         safe_tx_hash=safe_tx_hash or random.randbytes(32),
         chain_id=chain_id or random.choice(COMMON_CHAIN_IDS),
         safe=HexBytes(safe if safe else "") or random.randbytes(20),
-        nonce=nonce if nonce is not None else random.randint(0, UINT256_MAX),
+        nonce=nonce if nonce is not None else random.randint(0, BIGINT_MAX),
         proposer=HexBytes(proposer) if proposer else None,
         proposed_by_delegate=HexBytes(proposed_by_delegate)
         if proposed_by_delegate
@@ -59,4 +59,7 @@ async def multisig_transaction_factory(
         failed=failed,
         origin=origin or {},
     )
-    return await transaction.create()
+
+
+async def multisig_transaction_factory(**kwargs) -> MultisigTransaction:
+    return await build_multisig_transaction(**kwargs).create()
@@ -0,0 +1,57 @@
+from unittest.mock import patch
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.datasources.db.database import (
+    db_session,
+    db_session_context,
+    get_engine,
+    get_read_engine,
+)
+from app.datasources.db.models import MultisigTransaction
+from app.tests.datasources.db.async_db_test_case import AsyncDbTestCase
+from app.tests.datasources.db.factory import multisig_transaction_factory
+
+
+class TestDatabase(AsyncDbTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        # Use the primary database as replica, only the engine is different
+        patcher = patch("app.config.settings.DATABASE_READ_URL", settings.DATABASE_URL)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        get_read_engine.cache_clear()
+
+    async def asyncTearDown(self):
+        await get_read_engine().dispose()
+        get_read_engine.cache_clear()
+        await super().asyncTearDown()
+
+    def test_get_read_engine_without_replica(self):
+        get_read_engine.cache_clear()
+        with patch("app.config.settings.DATABASE_READ_URL", None):
+            self.assertIs(get_read_engine(), get_engine())
+
+    @db_session_context
+    async def test_read_write_session_uses_primary(self):
+        self.assertIsNot(get_read_engine(), get_engine())
+        query = select(MultisigTransaction)
+        self.assertIs(db_session.get_bind(clause=query), get_engine().sync_engine)
+
+    @db_session_context(read_only=True)
+    async def test_read_only_session_reads_its_writes(self):
+        query = select(MultisigTransaction)
+        self.assertIs(
+            db_session.get_bind(clause=query),
+            get_read_engine().sync_engine,
+        )
+        self.assertEqual(await MultisigTransaction.get_all(), [])
+
+        # Writes are sent to the primary, and every query after them too
+        transaction = await multisig_transaction_factory()
+        self.assertIs(db_session.get_bind(clause=query), get_engine().sync_engine)
+        self.assertEqual(
+            [stored.safe_tx_hash for stored in await MultisigTransaction.get_all()],
+            [transaction.safe_tx_hash],
+        )
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from hexbytes import HexBytes
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from app.datasources.db.fields import EthereumAddressType, EthereumHashType
+
+
+class TestEthereumAddressType(TestCase):
+    def setUp(self):
+        self.dialect = asyncpg_dialect()
+        self.address_type = EthereumAddressType()
+
+    def test_bind_param(self):
+        address = b"\x01" * 20
+        self.assertIs(
+            self.address_type.process_bind_param(address, self.dialect), address
+        )
+        for value in (
+            memoryview(address),
+            HexBytes(address),
+            "0x" + "01" * 20,
+            " 0X" + "01" * 20 + " ",
+        ):
+            with self.subTest(value=value):
+                coerced = self.address_type.process_bind_param(value, self.dialect)
+                self.assertIs(type(coerced), bytes)
+                self.assertEqual(coerced, address)
+        self.assertIsNone(self.address_type.process_bind_param(None, self.dialect))
+
+        with self.assertRaisesRegex(ValueError, "expects 20-byte values"):
+            self.address_type.process_bind_param(b"\x01" * 32, self.dialect)
+        with self.assertRaisesRegex(ValueError, "expects a valid hex string"):
+            self.address_type.process_bind_param("0xzz", self.dialect)
+        with self.assertRaisesRegex(TypeError, "expects bytes or hex string"):
+            self.address_type.process_bind_param(1, self.dialect)  # type: ignore[arg-type]
+
+    def test_result_processor(self):
+        process = self.address_type.result_processor(self.dialect, None)
+        address = b"\x01" * 20
+        self.assertIs(process(address), address)
+        self.assertIsNone(process(None))
+        self.assertEqual(process(memoryview(address)), address)
+        with self.assertRaisesRegex(ValueError, "expects 20-byte values"):
+            process(b"\x01" * 32)
+        with self.assertRaisesRegex(TypeError, "expects memoryview/bytes"):
+            process("0x" + "01" * 20)
+
+        hash_process = EthereumHashType().result_processor(self.dialect, None)
+        safe_tx_hash = b"\x01" * 32
+        self.assertIs(hash_process(safe_tx_hash), safe_tx_hash)
+        with self.assertRaisesRegex(ValueError, "expects 32-byte values"):
+            hash_process(address)
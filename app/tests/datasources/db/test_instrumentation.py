@@ -0,0 +1,88 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from sqlalchemy import select
+
+from app.datasources.db.database import db_session, db_session_context
+from app.datasources.db.instrumentation import _redact_parameters, track_queries
+from app.datasources.db.models import MultisigTransaction
+from app.tests.datasources.db.async_db_test_case import AsyncDbTestCase
+from app.tests.datasources.db.factory import multisig_transaction_factory
+
+
+class TestRedactParameters(TestCase):
+    def test_redact_parameters(self):
+        self.assertEqual(
+            _redact_parameters({"nonce": 1, "safe": b"\x01"}),
+            {"nonce": "?", "safe": "?"},
+        )
+        self.assertEqual(_redact_parameters((1, b"\x01")), ["?", "?"])
+        self.assertEqual(
+            _redact_parameters([(1, b"\x01"), (2, b"\x02")], executemany=True),
+            "<2 parameter sets>",
+        )
+        self.assertIsNone(_redact_parameters(None))
+
+
+class TestInstrumentation(AsyncDbTestCase):
+    async def test_track_queries(self):
+        with track_queries() as request_stats:
+
+            @db_session_context
+            async def query(times: int) -> None:
+                for _ in range(times):
+                    await MultisigTransaction.get_all()
+
+            await query(2)
+            await query(1)
+
+        self.assertEqual(request_stats.count, 3)
+        self.assertGreater(request_stats.total_time, 0)
+        self.assertIsNone(request_stats.session_id)
+        self.assertEqual(request_stats.get_repeated_statements(4), {})
+        ((statement, count),) = request_stats.get_repeated_statements(3).items()
+        self.assertIn("FROM multisigtransaction", statement)
+        self.assertEqual(count, 3)
+
+        # Queries outside the context are not tracked
+        await query(1)
+        self.assertEqual(request_stats.count, 3)
+
+    @db_session_context
+    async def test_slow_query_is_logged_redacted(self):
+        safe_tx_hash = b"\x07" * 32
+        await multisig_transaction_factory(safe_tx_hash=safe_tx_hash)
+
+        with (
+            patch("app.config.settings.DATABASE_SLOW_QUERY_MS", 0),
+            self.assertLogs(
+                "app.datasources.db.instrumentation", level="WARNING"
+            ) as logs,
+        ):
+            await db_session.execute(
+                select(MultisigTransaction).where(
+                    MultisigTransaction.safe_tx_hash == safe_tx_hash  # type: ignore
+                )
+            )
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("Slow query took", logs.output[0])
+        self.assertIn("'?'", logs.output[0])
+        self.assertNotIn(safe_tx_hash.hex(), logs.output[0])
+        self.assertNotIn(str(safe_tx_hash), logs.output[0])
+        self.assertIsNotNone(logs.records[0].db_session)  # type: ignore[attr-defined]
+
+    @patch("app.config.settings.DATABASE_REPEATED_QUERY_THRESHOLD", 3)
+    async def test_repeated_queries_are_logged(self):
+        @db_session_context
+        async def query(times: int) -> None:
+            for _ in range(times):
+                await MultisigTransaction.get_all()
+
+        with self.assertNoLogs("app.datasources.db.database", level="WARNING"):
+            await query(2)
+
+        with self.assertLogs("app.datasources.db.database", level="WARNING") as logs:
+            await query(3)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("Possible N+1 query, statement executed 3 times", logs.output[0])
@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import json
+
 from sqlalchemy import select
+from sqlalchemy.exc import StatementError
 
 from app.datasources.db.database import db_session, db_session_context
-from app.datasources.db.models import MultisigTransaction, SafeOperationEnum
+from app.datasources.db.fields import BIGINT_MAX
+from app.datasources.db.models import (
+    MultisigTransaction,
+    OutboxEvent,
+    SafeOperationEnum,
+)
 from app.tests.datasources.db.async_db_test_case import AsyncDbTestCase
-from app.tests.datasources.db.factory import multisig_transaction_factory
+from app.tests.datasources.db.factory import (
+    build_multisig_transaction,
+    multisig_transaction_factory,
+)
 
 
 class TestMultisigTransaction(AsyncDbTestCase):
@@ -37,6 +48,18 @@ class TestMultisigTransaction(AsyncDbTestCase):
         assert stored.signatures == b"signed"
         assert stored.origin == {"type": "create"}
 
+    @db_session_context
+    async def test_iter_all(self) -> None:
+        transactions = [await multisig_transaction_factory() for _ in range(5)]
+
+        streamed = [
+            transaction.safe_tx_hash
+            async for transaction in MultisigTransaction.iter_all(yield_per=2)
+        ]
+        self.assertCountEqual(
+            streamed, [transaction.safe_tx_hash for transaction in transactions]
+        )
+
     @db_session_context
     async def test_retrieve_by_safe_address(self) -> None:
         shared_safe_tx = await multisig_transaction_factory(nonce=1)
@@ -68,7 +91,7 @@ class TestMultisigTransaction(AsyncDbTestCase):
             safe_tx_hash=safe_tx_hash,
             chain_id=99,
             safe=safe_address_hex,
-            nonce=max_uint_value,
+            nonce=BIGINT_MAX,
             proposer=proposer_bytes,
             proposed_by_delegate=delegate_bytes,
             tx_hash=b"\x06" * 32,
@@ -96,10 +119,103 @@ class TestMultisigTransaction(AsyncDbTestCase):
         assert stored.to == bytes.fromhex(to_address_hex[2:])
         assert stored.gas_token == bytes(gas_token_memory)
         assert stored.refund_receiver == bytes(refund_receiver_memory)
-        assert stored.nonce == max_uint_value
+        assert stored.nonce == BIGINT_MAX
         assert stored.value == max_uint_value
         assert stored.safe_tx_gas == max_uint_value
         assert stored.base_gas == max_uint_value
         assert stored.gas_price == max_uint_value
         assert stored.operation == SafeOperationEnum.DELEGATE_CALL
         assert stored.origin == origin
+
+    @db_session_context
+    async def test_nonce_out_of_range(self) -> None:
+        for nonce in (-1, BIGINT_MAX + 1):
+            with (
+                self.subTest(nonce=nonce),
+                self.assertRaisesRegex(StatementError, "value out of range"),
+            ):
+                await multisig_transaction_factory(nonce=nonce)
+            await db_session.rollback()
+
+    @db_session_context
+    async def test_bulk_upsert(self) -> None:
+        existing = await multisig_transaction_factory(nonce=1, signatures=b"first")
+        safe_tx_hash = existing.safe_tx_hash
+        created, modified = existing.created, existing.modified
+
+        updated = build_multisig_transaction(
+            safe_tx_hash=safe_tx_hash,
+            safe=existing.safe,
+            chain_id=existing.chain_id,
+            nonce=1,
+            signatures=b"second",
+        )
+        new_transactions = [build_multisig_transaction(nonce=i) for i in range(5)]
+
+        result = await MultisigTransaction.bulk_upsert(
+            [updated, *new_transactions], chunk_size=2
+        )
+        self.assertEqual(result.inserted, 5)
+        self.assertEqual(result.updated, 1)
+
+        db_session.expire_all()
+        self.assertEqual(len(await MultisigTransaction.get_all()), 6)
+        stored = await db_session.get(MultisigTransaction, safe_tx_hash)
+        assert stored is not None
+        self.assertEqual(stored.signatures, b"second")
+        self.assertEqual(stored.created, created)
+        self.assertGreater(stored.modified, modified)
+
+    @db_session_context
+    async def test_outbox_events(self) -> None:
+        transaction = await multisig_transaction_factory(
+            safe="0x" + "aa" * 20, chain_id=1, nonce=3
+        )
+        duplicated = build_multisig_transaction()
+        await MultisigTransaction.bulk_upsert(
+            [build_multisig_transaction(), duplicated, duplicated]
+        )
+
+        # One event per stored row
+        events = await OutboxEvent.get_pending(limit=10)
+        self.assertEqual(len(events), 3)
+        self.assertEqual(
+            json.loads(events[0].payload),
+            {
+                "type": "MULTISIG_TRANSACTION_SAVED",
+                "address": "0xaAaAaAaaAaAaAaaAaAAAAAAAAaaaAaAaAaaAaaAa",
+                "safeTxHash": "0x" + transaction.safe_tx_hash.hex(),
+                "chainId": "1",
+                "nonce": "3",
+            },
+        )
+
+        self.assertEqual(await OutboxEvent.delete_by_ids([events[0].id, 0]), 1)  # type: ignore[list-item]
+        await db_session.commit()
+        self.assertEqual(len(await OutboxEvent.get_all()), 2)
+
+    @db_session_context
+    async def test_bulk_upsert_update_columns(self) -> None:
+        existing = await multisig_transaction_factory(
+            nonce=1, signatures=b"first", failed=None
+        )
+        safe_tx_hash = existing.safe_tx_hash
+        updated = build_multisig_transaction(
+            safe_tx_hash=safe_tx_hash, nonce=2, signatures=b"second"
+        )
+        duplicated = build_multisig_transaction(
+            safe_tx_hash=safe_tx_hash, nonce=3, signatures=b"third"
+        )
+
+        result = await MultisigTransaction.bulk_upsert(
+            [updated, duplicated], update_columns=["signatures"]
+        )
+        self.assertEqual(result.inserted, 0)
+        self.assertEqual(result.updated, 1)
+
+        db_session.expire_all()
+        stored = await db_session.get(MultisigTransaction, safe_tx_hash)
+        assert stored is not None
+        # Only `signatures` is updated, last instance for a primary key wins
+        self.assertEqual(stored.signatures, b"third")
+        self.assertEqual(stored.nonce, 1)
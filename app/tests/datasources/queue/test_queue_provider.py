@@ -1,13 +1,32 @@
 import asyncio
 import unittest
-from unittest.mock import patch
+from collections.abc import Awaitable, Callable
+from unittest.mock import AsyncMock, Mock, patch
 
 import aio_pika
 from aio_pika.abc import AbstractRobustConnection
 
 from app.config import settings
-from app.datasources.queue.exceptions import QueueProviderUnableToConnectException
-from app.datasources.queue.queue_provider import QueueProvider
+from app.datasources.queue.exceptions import (
+    QueueProviderNotConnectedException,
+    QueueProviderUnableToConnectException,
+)
+from app.datasources.queue.queue_provider import (
+    RETRY_ATTEMPT_HEADER,
+    QueueProvider,
+    get_dead_letter_queue_name,
+    get_partition_queue_name,
+    get_retry_queue_name,
+)
+from app.metrics import (
+    queue_messages_acked_total,
+    queue_messages_consumed_total,
+    queue_messages_dead_lettered_total,
+    queue_messages_publish_failed_total,
+    queue_messages_published_total,
+    queue_messages_retried_total,
+)
+from app.services.partitions import PartitionRouter
 
 
 class TestQueueProviderIntegration(unittest.IsolatedAsyncioTestCase):
@@ -32,26 +51,634 @@ class TestQueueProviderIntegration(unittest.IsolatedAsyncioTestCase):
     async def test_consume(self):
         await self.provider.connect(self.loop)
         assert isinstance(self.provider._connection, AbstractRobustConnection)
-        message = "Test message"
+        message = b"Test message"
         channel = await self.provider._connection.channel()
         exchange = await channel.declare_exchange(
             settings.RABBITMQ_AMQP_EXCHANGE, aio_pika.ExchangeType.FANOUT, durable=True
         )
 
         await exchange.publish(
-            aio_pika.Message(body=message.encode("utf-8")),
+            aio_pika.Message(body=message),
             routing_key="",
         )
 
         received_messages = []
 
-        def callback(message: str):
+        async def callback(message: bytes):
             received_messages.append(message)
 
+        consumed = queue_messages_consumed_total.get("message")
+        acked = queue_messages_acked_total.get("message")
         await self.provider.consume(callback)
 
         # Wait to make sure the message is consumed.
         await asyncio.sleep(1)
 
         self.assertIn(message, received_messages)
+        self.assertGreaterEqual(
+            queue_messages_consumed_total.get("message"), consumed + 1
+        )
+        self.assertGreaterEqual(queue_messages_acked_total.get("message"), acked + 1)
         await self.provider.disconnect()
+
+    async def test_consume_failed_message_is_retried(self):
+        with patch("app.config.settings.RABBITMQ_RETRY_DELAYS_MS", [100]):
+            await self.provider.connect(self.loop)
+            assert isinstance(self.provider._connection, AbstractRobustConnection)
+            message = b"Failing message"
+            channel = await self.provider._connection.channel()
+            dead_letter_queue = await channel.get_queue(get_dead_letter_queue_name())
+            await dead_letter_queue.purge()
+            exchange = await channel.declare_exchange(
+                settings.RABBITMQ_AMQP_EXCHANGE,
+                aio_pika.ExchangeType.FANOUT,
+                durable=True,
+            )
+
+            attempts = []
+            fail = True
+
+            async def callback(message: bytes):
+                attempts.append(message)
+                if fail:
+                    raise ValueError("Unable to process message")
+
+            await self.provider.consume(callback)
+            await exchange.publish(aio_pika.Message(body=message), routing_key="")
+
+            # Wait to make sure the message is consumed and retried.
+            await asyncio.sleep(1)
+
+            # Message is retried once after 100 ms, then it's dead lettered
+            self.assertEqual(attempts, [message, message])
+            dead_letter = await dead_letter_queue.get(timeout=5)
+            self.assertEqual(dead_letter.body, message)
+            self.assertEqual(dead_letter.headers[RETRY_ATTEMPT_HEADER], 2)
+            await dead_letter.nack(requeue=True)
+
+            fail = False
+            self.assertEqual(await self.provider.replay_dead_letters(), 1)
+            await asyncio.sleep(1)
+            self.assertEqual(attempts, [message, message, message])
+            await self.provider.disconnect()
+
+    async def test_consume_batch(self):
+        await self.provider.connect(self.loop)
+        assert isinstance(self.provider._connection, AbstractRobustConnection)
+        messages = [f"Batch message {i}".encode() for i in range(5)]
+        channel = await self.provider._connection.channel()
+        exchange = await channel.declare_exchange(
+            settings.RABBITMQ_AMQP_EXCHANGE, aio_pika.ExchangeType.FANOUT, durable=True
+        )
+
+        for message in messages:
+            await exchange.publish(
+                aio_pika.Message(body=message),
+                routing_key="",
+            )
+
+        received_batches = []
+
+        async def callback(bodies: list[bytes], message_ids: list[str | None]):
+            received_batches.append(bodies)
+
+        await self.provider.consume_batch(callback, batch_size=2, batch_timeout_ms=100)
+
+        # Wait to make sure the messages are consumed and the last batch is flushed.
+        await asyncio.sleep(1)
+
+        self.assertTrue(all(len(batch) <= 2 for batch in received_batches))
+        received_messages = [body for batch in received_batches for body in batch]
+        for message in messages:
+            self.assertIn(message, received_messages)
+        await self.provider.disconnect()
+
+    async def test_consume_broadcast(self):
+        await self.provider.connect(self.loop)
+        other_provider = QueueProvider()
+        await other_provider.connect(self.loop)
+        assert isinstance(self.provider._connection, AbstractRobustConnection)
+
+        received_messages: list[bytes] = []
+        other_received_messages: list[bytes] = []
+
+        async def callback(message: bytes):
+            received_messages.append(message)
+
+        async def other_callback(message: bytes):
+            other_received_messages.append(message)
+
+        # Queues are declared when consuming, messages published before are not received
+        await self.provider.consume_broadcast(callback)
+        await other_provider.consume_broadcast(other_callback)
+
+        message = b"Broadcast message"
+        channel = await self.provider._connection.channel()
+        exchange = await channel.declare_exchange(
+            settings.RABBITMQ_AMQP_EXCHANGE, aio_pika.ExchangeType.FANOUT, durable=True
+        )
+        await exchange.publish(
+            aio_pika.Message(body=message),
+            routing_key="",
+        )
+
+        # Wait to make sure the message is consumed.
+        await asyncio.sleep(1)
+
+        # Every provider receives the message
+        self.assertEqual(received_messages, [message])
+        self.assertEqual(other_received_messages, [message])
+        await self.provider.disconnect()
+        await other_provider.disconnect()
+
+    async def test_publish(self):
+        await self.provider.connect(self.loop)
+        assert isinstance(self.provider._connection, AbstractRobustConnection)
+        channel = await self.provider._connection.channel()
+        exchange = await channel.declare_exchange(
+            settings.RABBITMQ_AMQP_PUBLISH_EXCHANGE,
+            aio_pika.ExchangeType.FANOUT,
+            durable=True,
+        )
+        queue = await channel.declare_queue(exclusive=True, auto_delete=True)
+        await queue.bind(exchange)
+
+        message = b"Published message"
+        await self.provider.publish(message)
+        messages = [f"Published message {i}".encode() for i in range(10)]
+        await self.provider.publish_many(messages)
+
+        received = await queue.get(timeout=5)
+        self.assertEqual(received.body, message)
+        self.assertEqual(received.delivery_mode, aio_pika.DeliveryMode.PERSISTENT)
+        received_messages = [(await queue.get(timeout=5)).body for _ in messages]
+        self.assertCountEqual(received_messages, messages)
+        await self.provider.disconnect()
+
+
+class StandInExchange:
+    """
+    Exchange confirming messages only when `confirm` is called.
+    """
+
+    def __init__(self) -> None:
+        self.pending: list[tuple[bytes, asyncio.Future]] = []
+        self.errors: list[Exception] = []
+
+    async def publish(self, message: aio_pika.Message, routing_key: str) -> None:
+        if self.errors:
+            raise self.errors.pop()
+        confirm = asyncio.get_running_loop().create_future()
+        self.pending.append((message.body, confirm))
+        await confirm
+
+    def confirm(self) -> list[bytes]:
+        bodies = [body for body, _ in self.pending]
+        for _, confirm in self.pending:
+            confirm.set_result(None)
+        self.pending.clear()
+        return bodies
+
+
+class StandInChannel:
+    def __init__(self, exchange: StandInExchange) -> None:
+        self.exchange = exchange
+        self.default_exchange = exchange
+
+    async def declare_exchange(self, *args, **kwargs) -> StandInExchange:
+        return self.exchange
+
+
+class StandInConnection:
+    def __init__(self, exchanges: list[StandInExchange]) -> None:
+        self.exchanges = list(exchanges)
+        self.reconnected = asyncio.Event()
+
+    async def channel(self, publisher_confirms: bool = True) -> StandInChannel:
+        return StandInChannel(self.exchanges.pop(0))
+
+    async def ready(self) -> None:
+        await self.reconnected.wait()
+
+
+async def run_ready_tasks() -> None:
+    """
+    Let the tasks waiting on completed futures run.
+    """
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class TestQueueProviderPublish(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.exchanges = [StandInExchange(), StandInExchange()]
+        self.connection = StandInConnection(self.exchanges)
+        with (
+            patch("app.config.settings.RABBITMQ_PUBLISH_CHANNEL_POOL_SIZE", 2),
+            patch("app.config.settings.RABBITMQ_PUBLISH_MAX_UNCONFIRMED", 4),
+        ):
+            self.provider = QueueProvider()
+            self.provider._connection = self.connection  # type: ignore[assignment]
+            await self.provider._get_publish_exchanges()
+
+    async def test_publish_not_connected(self):
+        with self.assertRaises(QueueProviderNotConnectedException):
+            await QueueProvider().publish(b"Not connected")
+
+    async def test_publish_many(self):
+        messages = [f"message {i}".encode() for i in range(4)]
+        published = queue_messages_published_total.get()
+        task = asyncio.create_task(self.provider.publish_many(messages))
+        await run_ready_tasks()
+
+        # Every message is sent before any confirm, spread over the pooled channels
+        self.assertFalse(task.done())
+        self.assertEqual(self.exchanges[0].confirm(), messages[0::2])
+        self.assertEqual(self.exchanges[1].confirm(), messages[1::2])
+        await task
+        self.assertEqual(queue_messages_published_total.get(), published + 4)
+
+    async def test_publish_many_backpressure(self):
+        messages = [f"message {i}".encode() for i in range(6)]
+        task = asyncio.create_task(self.provider.publish_many(messages))
+        await run_ready_tasks()
+
+        # Only `RABBITMQ_PUBLISH_MAX_UNCONFIRMED` messages wait for a confirm
+        self.assertEqual(
+            len(self.exchanges[0].pending) + len(self.exchanges[1].pending), 4
+        )
+        self.exchanges[0].confirm()
+        await run_ready_tasks()
+        self.assertEqual(
+            len(self.exchanges[0].pending) + len(self.exchanges[1].pending), 4
+        )
+        while not task.done():
+            for exchange in self.exchanges:
+                exchange.confirm()
+            await run_ready_tasks()
+        await task
+
+    async def test_publish_many_cancelled(self):
+        # Cancelled while waiting for confirms, before the publishing tasks started
+        task = asyncio.create_task(self.provider.publish_many([b"first", b"second"]))
+        await asyncio.sleep(0)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        # Cancelled while waiting for a free slot
+        task = asyncio.create_task(
+            self.provider.publish_many([f"message {i}".encode() for i in range(6)])
+        )
+        await run_ready_tasks()
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        for exchange in self.exchanges:
+            exchange.pending.clear()
+
+        # Every slot was released
+        messages = [f"message {i}".encode() for i in range(4)]
+        task = asyncio.create_task(self.provider.publish_many(messages))
+        await run_ready_tasks()
+        self.assertEqual(
+            len(self.exchanges[0].pending) + len(self.exchanges[1].pending), 4
+        )
+        for exchange in self.exchanges:
+            exchange.confirm()
+        await task
+
+    async def test_publish_reconnect(self):
+        self.exchanges[0].errors.append(
+            aio_pika.exceptions.ChannelInvalidStateError("Channel closed")
+        )
+        task = asyncio.create_task(self.provider.publish(b"message"))
+        await run_ready_tasks()
+        self.assertEqual(self.exchanges[0].pending, [])
+
+        # Message is published again once the connection is restored
+        self.connection.reconnected.set()
+        await run_ready_tasks()
+        self.assertEqual(self.exchanges[0].confirm(), [b"message"])
+        await task
+
+    async def test_publish_to_partitions(self):
+        exchange = StandInExchange()
+        self.provider._confirm_channel = StandInChannel(exchange)  # type: ignore[assignment]
+        publish = exchange.publish
+        routing_keys: list[str] = []
+
+        async def recording_publish(message: aio_pika.Message, routing_key: str):
+            routing_keys.append(routing_key)
+            await publish(message, routing_key)
+
+        exchange.publish = recording_publish  # type: ignore[method-assign]
+        task = asyncio.create_task(
+            self.provider.publish_to_partitions(
+                [(0, b"first"), (1, b"other"), (0, b"second")]
+            )
+        )
+        await run_ready_tasks()
+
+        # Next message of a partition is published after the previous one is confirmed
+        self.assertEqual(exchange.confirm(), [b"first", b"other"])
+        await run_ready_tasks()
+        self.assertEqual(exchange.confirm(), [b"second"])
+        await task
+        self.assertEqual(
+            routing_keys,
+            [
+                get_partition_queue_name(0),
+                get_partition_queue_name(1),
+                get_partition_queue_name(0),
+            ],
+        )
+
+    async def test_publish_rejected(self):
+        self.exchanges[0].errors.append(
+            aio_pika.exceptions.DeliveryError(None, None)  # type: ignore[arg-type]
+        )
+        failed = queue_messages_publish_failed_total.get()
+
+        with self.assertRaises(aio_pika.exceptions.DeliveryError):
+            await self.provider.publish(b"message")
+        self.assertEqual(queue_messages_publish_failed_total.get(), failed + 1)
+        # Unconfirmed slot is released
+        self.assertFalse(self.provider._unconfirmed.locked())
+
+
+class StandInMessage:
+    def __init__(
+        self, body: bytes, headers: dict | None = None, message_id: str | None = None
+    ) -> None:
+        self.body = body
+        self.headers = headers or {}
+        self.message_id = message_id
+        self.content_type = "application/json"
+        self.redelivered = False
+        self.acked = False
+        self.nacked = False
+        self.requeued = False
+
+    async def ack(self, multiple: bool = False) -> None:
+        self.acked = True
+
+    async def nack(self, requeue: bool = True) -> None:
+        self.nacked = True
+        self.requeued = requeue
+
+
+class TestQueueProviderRetry(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.exchange = StandInExchange()
+        self.provider = QueueProvider()
+        self.provider._connection = Mock()
+        self.provider._confirm_channel = StandInChannel(self.exchange)  # type: ignore[assignment]
+        self.routing_keys: list[str] = []
+        self.published: list[aio_pika.Message] = []
+
+        async def publish(message: aio_pika.Message, routing_key: str) -> None:
+            if self.exchange.errors:
+                raise self.exchange.errors.pop()
+            self.published.append(message)
+            self.routing_keys.append(routing_key)
+
+        self.exchange.publish = publish  # type: ignore[method-assign]
+
+    @patch("app.config.settings.RABBITMQ_RETRY_DELAYS_MS", [100, 1000])
+    async def test_retry_later(self):
+        retried = queue_messages_retried_total.get("message")
+        dead_lettered = queue_messages_dead_lettered_total.get("message")
+
+        message = StandInMessage(b"message", {"x-custom": "value"}, "1")
+        for _ in range(3):
+            await self.provider.retry_later(
+                message,  # type: ignore[arg-type]
+                ValueError("Invalid event"),
+                "message",
+            )
+            message = StandInMessage(
+                b"message", self.published[-1].headers, self.published[-1].message_id
+            )
+
+        self.assertEqual(
+            self.routing_keys,
+            [
+                get_retry_queue_name(100),
+                get_retry_queue_name(1000),
+                get_dead_letter_queue_name(),
+            ],
+        )
+        self.assertEqual(
+            [published.headers[RETRY_ATTEMPT_HEADER] for published in self.published],
+            [1, 2, 3],
+        )
+        self.assertEqual(
+            self.published[-1].headers,
+            {
+                "x-custom": "value",
+                "x-retry-attempt": 3,
+                "x-retry-error": "ValueError: Invalid event",
+            },
+        )
+        self.assertEqual(self.published[-1].body, b"message")
+        # Delivery identity is kept, so a retried message can be deduplicated
+        self.assertEqual(self.published[-1].message_id, "1")
+        self.assertEqual(queue_messages_retried_total.get("message"), retried + 2)
+        self.assertEqual(
+            queue_messages_dead_lettered_total.get("message"), dead_lettered + 1
+        )
+
+    async def test_retry_later_and_ack(self):
+        message = StandInMessage(b"message")
+        await self.provider._retry_later_and_ack(
+            message,  # type: ignore[arg-type]
+            ValueError("Invalid event"),
+            "message",
+        )
+        self.assertTrue(message.acked)
+
+        # Message is requeued if it cannot be sent to retry
+        self.exchange.errors.append(ConnectionError("Connection lost"))
+        message = StandInMessage(b"message")
+        with self.assertLogs("app.datasources.queue.queue_provider", level="ERROR"):
+            await self.provider._retry_later_and_ack(
+                message,  # type: ignore[arg-type]
+                ValueError("Invalid event"),
+                "message",
+            )
+        self.assertFalse(message.acked)
+        self.assertTrue(message.nacked)
+        self.assertTrue(message.requeued)
+
+        # Even if it was already redelivered, it's never dropped
+        self.exchange.errors.append(ConnectionError("Connection lost"))
+        message = StandInMessage(b"message")
+        message.redelivered = True
+        with self.assertLogs("app.datasources.queue.queue_provider", level="ERROR"):
+            await self.provider._retry_later_and_ack(
+                message,  # type: ignore[arg-type]
+                ValueError("Invalid event"),
+                "message",
+            )
+        self.assertFalse(message.acked)
+        self.assertTrue(message.requeued)
+
+    async def test_retry_later_not_connected(self):
+        self.provider._connection = None
+        self.provider._confirm_channel = None
+        with self.assertRaises(QueueProviderNotConnectedException):
+            await self.provider.retry_later(
+                StandInMessage(b"message"),  # type: ignore[arg-type]
+                ValueError("Invalid event"),
+                "message",
+            )
+
+
+class StandInQueue:
+    def __init__(self) -> None:
+        self.name = "events"
+        self.callback: Callable[[StandInMessage], Awaitable[None]] | None = None
+        self.cancelled: list[str] = []
+
+    async def consume(self, callback) -> str:
+        self.callback = callback
+        return "consumer-tag"
+
+    async def cancel(self, consumer_tag: str) -> None:
+        self.cancelled.append(consumer_tag)
+
+    async def deliver(self, message: StandInMessage) -> None:
+        assert self.callback
+        await self.callback(message)
+
+
+class StandInConsumerChannel:
+    def __init__(self, queue: StandInQueue) -> None:
+        self.queue = queue
+        self.closed = False
+
+    async def set_qos(self, prefetch_count: int) -> None:
+        pass
+
+    async def get_queue(self, name: str) -> StandInQueue:
+        return self.queue
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class TestQueueProviderPartitions(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.queue = StandInQueue()
+        self.channel = StandInConsumerChannel(self.queue)
+        self.provider = QueueProvider()
+        self.provider._events_queue = self.queue  # type: ignore[assignment]
+        self.provider._connection = Mock()
+        self.provider._connection.channel = AsyncMock(return_value=self.channel)
+        self.batches: list[list[bytes]] = []
+        self.failures = 0
+
+    async def callback(
+        self, bodies: list[bytes], message_ids: list[str | None]
+    ) -> None:
+        self.batches.append(bodies)
+        if self.failures:
+            self.failures -= 1
+            raise ValueError("Database not available")
+
+    @patch("app.config.settings.RABBITMQ_RETRY_DELAYS_MS", [10])
+    async def test_failed_batch_is_retried_in_place(self):
+        await self.provider.consume_batch(
+            self.callback, batch_size=2, batch_timeout_ms=1000, partition=0
+        )
+        messages = [StandInMessage(f"event {i}".encode()) for i in range(2)]
+        self.failures = 2
+        with self.assertLogs("app.datasources.queue.queue_provider", level="ERROR"):
+            for message in messages:
+                await self.queue.deliver(message)
+
+        # Batch is not split or sent to a retry queue, so the order is kept
+        self.assertEqual(self.batches, [[b"event 0", b"event 1"]] * 3)
+        self.assertTrue(messages[-1].acked)
+        self.assertFalse(any(message.nacked for message in messages))
+
+    async def test_failed_batch_is_processed_one_by_one(self):
+        exchange = StandInExchange()
+        self.provider._confirm_channel = StandInChannel(exchange)  # type: ignore[assignment]
+        await self.provider.consume_batch(
+            self.callback, batch_size=2, batch_timeout_ms=1000
+        )
+        messages = [StandInMessage(f"event {i}".encode()) for i in range(2)]
+        self.failures = 2
+        with self.assertLogs("app.datasources.queue.queue_provider", level="ERROR"):
+            await self.queue.deliver(messages[0])
+            flush = asyncio.create_task(self.queue.deliver(messages[1]))
+            await run_ready_tasks()
+            # Only the failing message is sent to a retry queue
+            self.assertEqual(exchange.confirm(), [b"event 0"])
+            await flush
+
+        self.assertEqual(
+            self.batches, [[b"event 0", b"event 1"], [b"event 0"], [b"event 1"]]
+        )
+        self.assertTrue(all(message.acked for message in messages))
+
+    @patch("app.config.settings.RABBITMQ_RETRY_DELAYS_MS", [10])
+    @patch("app.config.settings.RABBITMQ_PARTITIONS", 4)
+    async def test_failed_routing_batch_is_retried_in_place(self):
+        routed: list[list[tuple[int, bytes]]] = []
+        routed_message_ids: list[list[str | None]] = []
+
+        async def publish_to_partitions(messages, message_ids=None) -> None:
+            routed.append(messages)
+            routed_message_ids.append(message_ids)
+            if len(routed) == 1:
+                raise aio_pika.exceptions.DeliveryError(None, None)  # type: ignore[arg-type]
+
+        self.provider.publish_to_partitions = publish_to_partitions  # type: ignore[method-assign]
+        await self.provider.consume_batch(
+            PartitionRouter(self.provider).route,
+            batch_size=2,
+            batch_timeout_ms=1000,
+            retry_in_place=True,
+        )
+        messages = [
+            StandInMessage(b'{"type": "UNKNOWN"}', message_id=str(i)) for i in range(2)
+        ]
+        with self.assertLogs("app.datasources.queue.queue_provider", level="ERROR"):
+            for message in messages:
+                await self.queue.deliver(message)
+
+        # Batch is routed again as a whole, nothing is sent to a retry queue
+        self.assertEqual(routed, [[(0, b'{"type": "UNKNOWN"}')] * 2] * 2)
+        self.assertEqual(routed_message_ids, [["0", "1"]] * 2)
+        self.assertTrue(messages[-1].acked)
+        self.assertFalse(any(message.nacked for message in messages))
+
+    @patch("app.config.settings.RABBITMQ_RETRY_DELAYS_MS", [60_000])
+    async def test_cancel_partition(self):
+        await self.provider.consume_batch(
+            self.callback, batch_size=2, batch_timeout_ms=1000, partition=0
+        )
+        consumer = self.provider._partition_consumers[0]
+        messages = [StandInMessage(f"event {i}".encode()) for i in range(3)]
+        self.failures = 1
+        await self.queue.deliver(messages[0])
+        with self.assertLogs("app.datasources.queue.queue_provider", level="ERROR"):
+            # Failed batch waits to be retried
+            flush = asyncio.create_task(self.queue.deliver(messages[1]))
+            await run_ready_tasks()
+        await self.queue.deliver(messages[2])
+        self.assertFalse(flush.done())
+        self.assertIsNotNone(consumer.flush_timer)
+
+        await self.provider.cancel_partition(0)
+        self.assertEqual(self.queue.cancelled, ["consumer-tag"])
+        self.assertTrue(flush.done())
+        self.assertIsNone(consumer.flush_timer)
+        self.assertTrue(self.channel.closed)
+        self.assertEqual(self.provider._partition_consumers, {})
+        # Not ACKed messages are requeued by the broker when the channel is closed
+        self.assertEqual(len(self.batches), 1)
+        self.assertFalse(any(message.acked for message in messages))
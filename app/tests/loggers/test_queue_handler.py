@@ -0,0 +1,115 @@
+import logging
+import queue
+import threading
+import unittest
+
+from app.loggers.queue_handler import (
+    BoundedQueueHandler,
+    QueueOverflowPolicy,
+    get_dropped_records,
+    setup_queue_logging,
+    stop_queue_logging,
+)
+from app.loggers.safe_logger import SafeJsonFormatter
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: list[str] = []
+        self.threads: set[str] = set()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(self.format(record))
+        self.threads.add(threading.current_thread().name)
+
+
+class TestQueueHandler(unittest.TestCase):
+    def setUp(self):
+        # Not registered in the logging manager, no other handlers are attached
+        self.logger = logging.Logger("app.tests.queue_handler", logging.INFO)
+        self.logger.propagate = False
+        self.handler = CollectingHandler()
+        self.handler.setFormatter(SafeJsonFormatter())
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        stop_queue_logging()
+        self.logger.removeHandler(self.handler)
+
+    def test_setup_queue_logging(self):
+        setup_queue_logging([self.logger], 1000, QueueOverflowPolicy.BLOCK)
+        self.assertEqual(len(self.logger.handlers), 1)
+        self.assertIsInstance(self.logger.handlers[0], BoundedQueueHandler)
+
+        for i in range(100):
+            self.logger.info("Message %d", i)
+        stop_queue_logging()
+
+        # Every queued record is written by the listener thread on stop
+        self.assertEqual(self.logger.handlers, [self.handler])
+        self.assertEqual(len(self.handler.messages), 100)
+        self.assertIn('"message":"Message 0"', self.handler.messages[0])
+        self.assertIn('"message":"Message 99"', self.handler.messages[-1])
+        self.assertNotIn(threading.current_thread().name, self.handler.threads)
+
+    def test_prepare(self):
+        queue_handler = BoundedQueueHandler(queue.Queue(), QueueOverflowPolicy.BLOCK)
+        arguments = ["first"]
+        record = self.logger.makeRecord(
+            self.logger.name, logging.INFO, __file__, 1, "Value %s", (arguments,), None
+        )
+        queue_handler.handle(record)
+        arguments.append("second")
+
+        queued_record = queue_handler.log_queue.get_nowait()
+        # Arguments are resolved, but the record is not formatted
+        self.assertEqual(queued_record.msg, "Value ['first']")
+        self.assertIsNone(queued_record.args)
+
+    def test_drop_oldest(self):
+        log_queue: queue.Queue = queue.Queue(2)
+        dropping_handler = BoundedQueueHandler(
+            log_queue, QueueOverflowPolicy.DROP_OLDEST
+        )
+        for i in range(5):
+            dropping_handler.handle(
+                self.logger.makeRecord(
+                    self.logger.name, logging.INFO, __file__, 1, f"{i}", (), None
+                )
+            )
+        self.assertEqual(dropping_handler.dropped, 3)
+        self.assertEqual([log_queue.get_nowait().msg for _ in range(2)], ["3", "4"])
+
+    def test_get_dropped_records(self):
+        setup_queue_logging([self.logger], 1, QueueOverflowPolicy.DROP_OLDEST)
+        queue_handler = self.logger.handlers[0]
+        assert isinstance(queue_handler, BoundedQueueHandler)
+        queue_handler.dropped = 2
+        self.assertEqual(get_dropped_records(), 2)
+        stop_queue_logging()
+        self.assertEqual(get_dropped_records(), 0)
+
+    def test_block(self):
+        log_queue: queue.Queue = queue.Queue(1)
+        blocking_handler = BoundedQueueHandler(log_queue, QueueOverflowPolicy.BLOCK)
+
+        def log(message: str) -> None:
+            blocking_handler.handle(
+                self.logger.makeRecord(
+                    self.logger.name, logging.INFO, __file__, 1, message, (), None
+                )
+            )
+
+        log("first")
+        thread = threading.Thread(target=log, args=("second",))
+        thread.start()
+        thread.join(0.1)
+        # Queue is full, logging call waits for room
+        self.assertTrue(thread.is_alive())
+
+        self.assertEqual(log_queue.get_nowait().msg, "first")
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(log_queue.get_nowait().msg, "second")
+        self.assertEqual(blocking_handler.dropped, 0)
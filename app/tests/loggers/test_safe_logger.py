@@ -0,0 +1,136 @@
+import datetime
+import logging
+import sys
+import unittest
+
+from app.loggers.safe_logger import (
+    ErrorInfo,
+    HttpRequestLog,
+    HttpResponseLog,
+    SafeJsonFormatter,
+    TaskInfo,
+)
+
+CREATED = 1700000000.123456
+START_TIME = datetime.datetime(2023, 11, 14, 22, 13, 20, tzinfo=datetime.UTC)
+
+
+def make_record(
+    message: str = "Processing %s",
+    args: tuple = ("event",),
+    level: int = logging.INFO,
+    exc_info=None,
+    **attributes,
+) -> logging.LogRecord:
+    record = logging.LogRecord(
+        "app.test",
+        level,
+        "/app/services/events.py",
+        42,
+        message,
+        args,
+        exc_info,
+        func="process_event",
+    )
+    record.created = CREATED
+    for key, value in attributes.items():
+        setattr(record, key, value)
+    return record
+
+
+class TestSafeJsonFormatter(unittest.TestCase):
+    def setUp(self):
+        self.formatter = SafeJsonFormatter()
+
+    def test_format(self):
+        self.assertEqual(
+            self.formatter.format(make_record()),
+            '{"level":"INFO","timestamp":"2023-11-14T22:13:20.123456Z",'
+            '"context":"events.process_event","message":"Processing event"}',
+        )
+
+    def test_format_context_message(self):
+        record = make_record(
+            message='Unicode "ñ" \x01 /',
+            args=(),
+            db_session="session-id",
+            http_request=HttpRequestLog(
+                url="http://test/api/v1/about",
+                method="GET",
+                route="/api/v1/about",
+                startTime=START_TIME,
+            ),
+            http_response=HttpResponseLog(status=200, endTime=START_TIME, totalTime=5),
+            task_detail=TaskInfo(
+                name="task", id="1", kwargs={"a": None, "b": 1}, args=(1, None)
+            ),
+        )
+        self.assertEqual(
+            self.formatter.format(record),
+            '{"level":"INFO","timestamp":"2023-11-14T22:13:20.123456Z",'
+            '"context":"events.process_event","message":"Unicode \\"ñ\\" \\u0001 /",'
+            '"contextMessage":{"dbSession":"session-id",'
+            '"httpRequest":{"url":"http://test/api/v1/about","method":"GET",'
+            '"route":"/api/v1/about","startTime":"2023-11-14T22:13:20Z"},'
+            '"httpResponse":{"status":200,"endTime":"2023-11-14T22:13:20Z","totalTime":5},'
+            '"taskInfo":{"name":"task","id":"1","kwargs":{"a":null,"b":1},"args":[1,null]}}}',
+        )
+
+    def test_format_error(self):
+        try:
+            raise ValueError("Invalid")
+        except ValueError:
+            exc_info = sys.exc_info()
+
+        record = make_record(level=logging.ERROR, exc_info=exc_info)
+        formatted = self.formatter.format(record)
+        self.assertTrue(
+            formatted.startswith(
+                '{"level":"ERROR","timestamp":"2023-11-14T22:13:20.123456Z",'
+                '"context":"events.process_event","message":"Processing event",'
+                '"contextMessage":{"errorInfo":{"function":"process_event","line":42,'
+                '"exceptionInfo":"Traceback (most recent call last):\\n'
+            )
+        )
+        self.assertTrue(formatted.endswith('ValueError: Invalid\\n"}}}'))
+        self.assertEqual(formatted, self.formatter.format_with_models(record))
+
+        record = make_record(level=logging.ERROR)
+        self.assertEqual(
+            self.formatter.format(record),
+            '{"level":"ERROR","timestamp":"2023-11-14T22:13:20.123456Z",'
+            '"context":"events.process_event","message":"Processing event",'
+            '"contextMessage":{"errorInfo":{"function":"process_event","line":42}}}',
+        )
+
+    def test_format_same_output_as_models(self):
+        records = [
+            make_record(),
+            make_record(level=logging.WARNING, db_session=""),
+            make_record(error_detail=ErrorInfo(function="f", line=1)),
+            make_record(
+                http_request=HttpRequestLog(
+                    url="/", method="POST", startTime=START_TIME
+                )
+            ),
+            make_record(
+                task_detail=TaskInfo(name="task", id="1", args=(), kwargs=None)
+            ),
+            # Values that need validation use the models
+            make_record(
+                http_request={"url": "/", "method": "GET", "startTime": "2023-11-14"}
+            ),
+            make_record(
+                http_response={
+                    "status": "200",
+                    "endTime": START_TIME,
+                    "totalTime": 1,
+                }
+            ),
+        ]
+        for record in records:
+            with self.subTest(record=record.__dict__):
+                self.assertEqual(
+                    self.formatter.format(record),
+                    self.formatter.format_with_models(record),
+                )
@@ -30,3 +30,14 @@ class TestRouterDefault(unittest.TestCase):
         response = self.client.get("/health")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), "OK")
+
+    def test_view_metrics(self):
+        self.client.get("/health")
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn(
+            'http_request_duration_seconds_count{method="GET",route="/health"}',
+            response.text,
+        )
+        self.assertIn("# TYPE queue_messages_consumed_total counter", response.text)
@@ -0,0 +1,61 @@
+import asyncio
+import json
+import unittest
+
+from httpx import ASGITransport, AsyncClient
+from safe_eth.eth.utils import fast_to_checksum_address
+
+from ...main import app
+from ...routers.events import _format_server_sent_event, _to_server_sent_events
+from ...services.event_hub import event_hub
+
+
+class TestRouterEvents(unittest.IsolatedAsyncioTestCase):
+    async def test_subscribe_invalid_safes(self):
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.get("/api/v1/events")
+            self.assertEqual(response.status_code, 422)
+            response = await client.get(
+                "/api/v1/events", params={"safe": "0x" + "aa" * 20}
+            )
+            self.assertEqual(response.status_code, 422)
+
+    async def test_server_sent_events(self):
+        safe = fast_to_checksum_address(b"\xaa" * 20)
+        event = json.dumps({"type": "NEW_CONFIRMATION", "address": safe})
+        stream = _to_server_sent_events([safe], heartbeat_seconds=0.05)
+
+        # Subscribed when the stream starts
+        next_chunk = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        self.assertEqual(event_hub.publish(safe, event), 1)
+        self.assertEqual(await next_chunk, f"data: {event}\n\n".encode())
+
+        self.assertEqual(await anext(stream), b": heartbeat\n\n")
+
+        await stream.aclose()
+        self.assertEqual(event_hub.publish(safe, event), 0)
+
+    def test_format_server_sent_event(self):
+        self.assertEqual(_format_server_sent_event('{"a": 1}'), b'data: {"a": 1}\n\n')
+        self.assertEqual(
+            _format_server_sent_event('{\n  "a": 1\r\n}\r'),
+            b'data: {\ndata:   "a": 1\ndata: }\ndata: \n\n',
+        )
+        self.assertEqual(_format_server_sent_event(""), b"data: \n\n")
+
+    async def test_server_sent_events_evicted(self):
+        safe = fast_to_checksum_address(b"\xaa" * 20)
+        stream = _to_server_sent_events([safe], heartbeat_seconds=1)
+        next_chunk = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+
+        # Queue is full before the client reads it
+        with self.assertLogs("app.services.event_hub", level="WARNING"):
+            for i in range(101):
+                event_hub.publish(safe, f"{i}")
+        self.assertEqual(await next_chunk, b"event: evicted\ndata: {}\n\n")
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
@@ -0,0 +1,228 @@
+import json
+from unittest.mock import patch
+
+from httpx import ASGITransport, AsyncClient
+from safe_eth.eth.utils import fast_to_checksum_address
+
+from ...datasources.db.database import db_session_context
+from ...datasources.db.instrumentation import track_queries
+from ...main import app
+from ..datasources.db.async_db_test_case import AsyncDbTestCase
+from ..datasources.db.factory import multisig_transaction_factory
+
+
+class TestRouterMultisigTransactions(AsyncDbTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.client = AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        )
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        await super().asyncTearDown()
+
+    @db_session_context
+    @patch("app.config.settings.CHANGES_SAFETY_LAG_SECONDS", 0)
+    async def test_multisig_transaction_changes(self):
+        url = "/api/v1/multisig-transactions/changes"
+        response = await self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        # High water mark is returned, so changes from now on are received
+        first_page = response.json()
+        self.assertEqual(first_page["results"], [])
+        self.assertIsNotNone(first_page["next"])
+
+        safe = b"\xaa" * 20
+        transactions = [
+            await multisig_transaction_factory(safe=safe, chain_id=1) for _ in range(3)
+        ]
+        other_chain_transaction = await multisig_transaction_factory(
+            safe=safe, chain_id=5
+        )
+        response = await self.client.get(url, params={"cursor": first_page["next"]})
+        self.assertEqual(len(response.json()["results"]), 4)
+
+        response = await self.client.get(url, params={"chain_id": 1, "limit": 2})
+        self.assertEqual(response.status_code, 200)
+        page = response.json()
+        self.assertEqual(
+            [transaction["safeTxHash"] for transaction in page["results"]],
+            ["0x" + transaction.safe_tx_hash.hex() for transaction in transactions[:2]],
+        )
+
+        response = await self.client.get(
+            url, params={"chain_id": 1, "limit": 2, "cursor": page["next"]}
+        )
+        page = response.json()
+        self.assertEqual(
+            [transaction["safeTxHash"] for transaction in page["results"]],
+            ["0x" + transactions[2].safe_tx_hash.hex()],
+        )
+
+        # No changes, same cursor is returned
+        cursor = page["next"]
+        response = await self.client.get(url, params={"chain_id": 1, "cursor": cursor})
+        self.assertEqual(response.json(), {"next": cursor, "results": []})
+
+        # Updated transactions are returned again
+        transactions[0].signatures = b"updated"
+        await transactions[0].update()
+        response = await self.client.get(url, params={"chain_id": 1, "cursor": cursor})
+        page = response.json()
+        self.assertEqual(
+            [transaction["safeTxHash"] for transaction in page["results"]],
+            ["0x" + transactions[0].safe_tx_hash.hex()],
+        )
+        self.assertNotEqual(page["next"], cursor)
+
+        response = await self.client.get(
+            url, params={"safe": fast_to_checksum_address(safe)}
+        )
+        self.assertEqual(
+            [transaction["safeTxHash"] for transaction in response.json()["results"]],
+            [
+                "0x" + transaction.safe_tx_hash.hex()
+                for transaction in [
+                    transactions[1],
+                    transactions[2],
+                    other_chain_transaction,
+                    transactions[0],
+                ]
+            ],
+        )
+
+        response = await self.client.get(url, params={"cursor": "invalid"})
+        self.assertEqual(response.status_code, 400)
+
+    @db_session_context
+    async def test_multisig_transaction_changes_safety_lag(self):
+        url = "/api/v1/multisig-transactions/changes"
+        transaction = await multisig_transaction_factory()
+        with patch("app.config.settings.CHANGES_SAFETY_LAG_SECONDS", 60):
+            response = await self.client.get(url)
+        # Recently modified transactions could be followed by transactions still committing
+        self.assertEqual(response.json()["results"], [])
+        cursor = response.json()["next"]
+
+        with patch("app.config.settings.CHANGES_SAFETY_LAG_SECONDS", 0):
+            response = await self.client.get(url, params={"cursor": cursor})
+        self.assertEqual(
+            [result["safeTxHash"] for result in response.json()["results"]],
+            ["0x" + transaction.safe_tx_hash.hex()],
+        )
+
+    @db_session_context
+    async def test_lookup_multisig_transactions(self):
+        url = "/api/v1/multisig-transactions/lookup"
+        transactions = [await multisig_transaction_factory() for _ in range(3)]
+        found_hashes = [
+            "0x" + transaction.safe_tx_hash.hex() for transaction in transactions
+        ]
+        missing_hashes = ["0x" + "00" * 32, "0x" + "ff" * 32]
+
+        for stream_threshold in (100, 1):
+            with (
+                self.subTest(stream_threshold=stream_threshold),
+                patch(
+                    "app.routers.multisig_transactions.LOOKUP_STREAM_THRESHOLD",
+                    stream_threshold,
+                ),
+                track_queries() as query_stats,
+            ):
+                response = await self.client.post(
+                    url,
+                    json={
+                        "safeTxHashes": [
+                            missing_hashes[0],
+                            *found_hashes,
+                            missing_hashes[1],
+                            found_hashes[0],
+                        ]
+                    },
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(query_stats.count, 1)
+                result = response.json()
+                self.assertCountEqual(
+                    [transaction["safeTxHash"] for transaction in result["found"]],
+                    found_hashes,
+                )
+                self.assertEqual(result["missing"], missing_hashes)
+
+        response = await self.client.post(url, json={"safeTxHashes": missing_hashes})
+        self.assertEqual(response.json(), {"found": [], "missing": missing_hashes})
+
+        for invalid_hashes in ([], ["0x1234"], ["0x" + "00" * 32] * 1001):
+            with self.subTest(invalid_hashes=invalid_hashes[:2]):
+                response = await self.client.post(
+                    url, json={"safeTxHashes": invalid_hashes}
+                )
+                self.assertEqual(response.status_code, 422)
+
+    @db_session_context
+    async def test_export_multisig_transactions(self):
+        url = "/api/v1/multisig-transactions/export"
+        response = await self.client.get(url)
+        self.assertEqual(response.status_code, 422)
+
+        safe = b"\xaa" * 20
+        safe_address = fast_to_checksum_address(safe)
+        response = await self.client.get(url, params={"safe": safe_address.lower()})
+        self.assertEqual(response.status_code, 422)
+
+        response = await self.client.get(url, params={"chain_id": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        self.assertEqual(response.content, b"")
+
+        safe_transactions = [
+            await multisig_transaction_factory(safe=safe, chain_id=1, nonce=nonce)
+            for nonce in range(5)
+        ]
+        other_chain_transaction = await multisig_transaction_factory(
+            safe=safe, chain_id=5, nonce=0
+        )
+        other_safe_transaction = await multisig_transaction_factory(chain_id=1)
+
+        # Chunks are joined by the client
+        with patch("app.routers.multisig_transactions.EXPORT_CHUNK_SIZE", 2):
+            response = await self.client.get(url, params={"chain_id": 1})
+        self.assertEqual(response.status_code, 200)
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        # Sorted by `created`
+        self.assertEqual(
+            [line["safeTxHash"] for line in lines],
+            [
+                "0x" + transaction.safe_tx_hash.hex()
+                for transaction in [*safe_transactions, other_safe_transaction]
+            ],
+        )
+        self.assertEqual(lines[0]["safe"], safe_address)
+        self.assertEqual(lines[0]["chainId"], "1")
+
+        response = await self.client.get(url, params={"safe": safe_address})
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        # Sorted by `nonce` descending
+        self.assertEqual(
+            [line["safeTxHash"] for line in lines],
+            [
+                "0x" + transaction.safe_tx_hash.hex()
+                for transaction in [
+                    safe_transactions[4],
+                    safe_transactions[3],
+                    safe_transactions[2],
+                    safe_transactions[1],
+                    other_chain_transaction,
+                    safe_transactions[0],
+                ]
+            ],
+        )
+
+        response = await self.client.get(
+            url, params={"safe": safe_address, "chain_id": 5}
+        )
+        self.assertEqual(
+            [json.loads(line)["safeTxHash"] for line in response.text.splitlines()],
+            ["0x" + other_chain_transaction.safe_tx_hash.hex()],
+        )
@@ -0,0 +1,236 @@
+import datetime
+
+from httpx import ASGITransport, AsyncClient
+from safe_eth.eth.utils import fast_to_checksum_address
+from sqlalchemy import delete
+from sqlmodel import col
+
+from ...datasources.cache.page_cache import multisig_transactions_cache
+from ...datasources.db.database import db_session, db_session_context
+from ...datasources.db.instrumentation import track_queries
+from ...datasources.db.models import MultisigTransaction
+from ...main import app
+from ..datasources.db.async_db_test_case import AsyncDbTestCase
+from ..datasources.db.factory import multisig_transaction_factory
+
+
+class TestRouterSafes(AsyncDbTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.client = AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        )
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        await super().asyncTearDown()
+
+    @db_session_context
+    async def test_view_safe_multisig_transactions(self):
+        safe = b"\x01" * 20
+        safe_address = fast_to_checksum_address(safe)
+        url = f"/api/v1/safes/{safe_address}/multisig-transactions"
+
+        response = await self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"next": None, "results": []})
+
+        transaction = await multisig_transaction_factory(
+            safe=safe, chain_id=1, nonce=3, value=10, to=b"\x02" * 20
+        )
+        await multisig_transaction_factory(nonce=3)  # Other Safe
+
+        response = await self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(len(results), 1)
+        self.assertEqual(
+            results[0]["safeTxHash"], "0x" + transaction.safe_tx_hash.hex()
+        )
+        self.assertEqual(results[0]["safe"], safe_address)
+        self.assertEqual(results[0]["to"], fast_to_checksum_address(b"\x02" * 20))
+        self.assertEqual(results[0]["chainId"], "1")
+        self.assertEqual(results[0]["nonce"], 3)
+        self.assertEqual(results[0]["value"], "10")
+        self.assertIsNone(results[0]["proposer"])
+        self.assertIsNone(results[0]["txHash"])
+
+    @db_session_context
+    async def test_view_safe_multisig_transactions_cache(self):
+        safe = b"\x01" * 20
+        url = f"/api/v1/safes/{fast_to_checksum_address(safe)}/multisig-transactions"
+        await multisig_transaction_factory(safe=safe, nonce=1)
+        hits, misses = (
+            multisig_transactions_cache.hits,
+            multisig_transactions_cache.misses,
+        )
+
+        response = await self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 1)
+        self.assertEqual(multisig_transactions_cache.misses, misses + 1)
+
+        cached_response = await self.client.get(url)
+        self.assertEqual(cached_response.status_code, 200)
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(multisig_transactions_cache.hits, hits + 1)
+
+        # Other pages are cached independently
+        response = await self.client.get(url, params={"executed": True})
+        self.assertEqual(response.json()["results"], [])
+        self.assertEqual(multisig_transactions_cache.misses, misses + 2)
+
+        # Writes invalidate every cached page for the Safe
+        await multisig_transaction_factory(safe=safe, nonce=2)
+        response = await self.client.get(url)
+        self.assertEqual(len(response.json()["results"]), 2)
+        self.assertEqual(multisig_transactions_cache.misses, misses + 3)
+
+    @db_session_context
+    async def test_view_safe_multisig_transactions_pagination(self):
+        safe = b"\x01" * 20
+        url = f"/api/v1/safes/{fast_to_checksum_address(safe)}/multisig-transactions"
+        now = datetime.datetime.now(datetime.UTC)
+        transactions = []
+        for nonce in range(3):
+            # Two transactions per nonce, plus one created at the same time
+            for seconds in (0, 1, 1):
+                transaction = await multisig_transaction_factory(safe=safe, nonce=nonce)
+                transaction.created = now - datetime.timedelta(seconds=seconds)
+                transactions.append(await transaction.update())
+        expected = [
+            "0x" + transaction.safe_tx_hash.hex()
+            for transaction in sorted(
+                transactions,
+                key=lambda transaction: (
+                    transaction.nonce,
+                    transaction.created,
+                    transaction.safe_tx_hash,
+                ),
+                reverse=True,
+            )
+        ]
+
+        received: list[str] = []
+        cursor = None
+        while True:
+            params = {"limit": 4} | ({"cursor": cursor} if cursor else {})
+            response = await self.client.get(url, params=params)
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+            self.assertLessEqual(len(page["results"]), 4)
+            received.extend(result["safeTxHash"] for result in page["results"])
+            cursor = page["next"]
+            if not cursor:
+                break
+        self.assertEqual(received, expected)
+
+        response = await self.client.get(url, params={"cursor": "invalid"})
+        self.assertEqual(response.status_code, 400)
+
+    @db_session_context
+    async def test_view_safe_multisig_transactions_filters(self):
+        safe = b"\x01" * 20
+        url = f"/api/v1/safes/{fast_to_checksum_address(safe)}/multisig-transactions"
+        executed = await multisig_transaction_factory(
+            safe=safe, chain_id=1, nonce=1, tx_hash=b"\x03" * 32
+        )
+        pending = await multisig_transaction_factory(safe=safe, chain_id=1, nonce=2)
+        other_chain = await multisig_transaction_factory(
+            safe=safe, chain_id=10, nonce=3
+        )
+
+        async def get_safe_tx_hashes(**params) -> list[str]:
+            response = await self.client.get(url, params=params)
+            self.assertEqual(response.status_code, 200)
+            return [result["safeTxHash"] for result in response.json()["results"]]
+
+        def to_hex(transaction) -> str:
+            return "0x" + transaction.safe_tx_hash.hex()
+
+        self.assertEqual(
+            await get_safe_tx_hashes(chain_id=1), [to_hex(pending), to_hex(executed)]
+        )
+        self.assertEqual(await get_safe_tx_hashes(executed=True), [to_hex(executed)])
+        self.assertEqual(
+            await get_safe_tx_hashes(executed=False),
+            [to_hex(other_chain), to_hex(pending)],
+        )
+        self.assertEqual(
+            await get_safe_tx_hashes(nonce_gte=2, nonce_lte=2), [to_hex(pending)]
+        )
+
+    @db_session_context
+    async def test_view_safe_multisig_transactions_conditional(self):
+        safe = b"\x01" * 20
+        url = f"/api/v1/safes/{fast_to_checksum_address(safe)}/multisig-transactions"
+        response = await self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["etag"], 'W/"0-0"')
+
+        transaction = await multisig_transaction_factory(safe=safe, chain_id=1)
+        response = await self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["etag"]
+        self.assertNotIn("last-modified", response.headers)
+        self.assertEqual(response.headers["cache-control"], "no-cache")
+
+        # `ETag` of the cached page is used, the database is not queried
+        with track_queries() as query_stats:
+            response = await self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response.headers["etag"], etag)
+        self.assertEqual(query_stats.count, 0)
+
+        # Without a cached page only the version is queried, rows are not loaded
+        await multisig_transactions_cache.invalidate(safe.hex())
+        with track_queries() as query_stats:
+            response = await self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["etag"], etag)
+        self.assertEqual(query_stats.count, 1)
+
+        # Dates have second precision, only `ETag` is compared
+        response = await self.client.get(
+            url, headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+        )
+        self.assertEqual(response.status_code, 200)
+        response = await self.client.get(url, headers={"If-None-Match": 'W/"other"'})
+        self.assertEqual(response.status_code, 200)
+        # Other chains have their own version
+        response = await self.client.get(
+            url, params={"chain_id": 5}, headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        # Updates change the version
+        transaction.signatures = b"updated"
+        await transaction.update()
+        response = await self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["etag"], etag)
+        self.assertEqual(len(response.json()["results"]), 1)
+
+        # Deletions change the version, even if the last modification is the same
+        etag = response.headers["etag"]
+        await multisig_transaction_factory(safe=safe, chain_id=1)
+        response = await self.client.get(url)
+        created_etag = response.headers["etag"]
+        await db_session.execute(
+            delete(MultisigTransaction).where(
+                col(MultisigTransaction.safe_tx_hash) == transaction.safe_tx_hash
+            )
+        )
+        await db_session.commit()
+        # Invalidated by the `DELETED_MULTISIG_TRANSACTION` event
+        await multisig_transactions_cache.invalidate(safe.hex())
+        response = await self.client.get(url, headers={"If-None-Match": created_etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(response.headers["etag"], (etag, created_etag))
+
+    async def test_view_safe_multisig_transactions_invalid_address(self):
+        response = await self.client.get(
+            f"/api/v1/safes/{'0x' + 'aa' * 20}/multisig-transactions"
+        )
+        self.assertEqual(response.status_code, 422)
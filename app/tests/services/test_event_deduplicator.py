@@ -0,0 +1,109 @@
+import unittest
+from unittest.mock import patch
+
+from redis.exceptions import RedisError
+
+from app.datasources.cache.redis import get_redis
+from app.metrics import events_duplicates_dropped_total
+from app.services.event_deduplicator import EventDeduplicator
+
+
+class TestEventDeduplicator(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        get_redis.cache_clear()
+        await get_redis().flushdb()
+
+    async def asyncTearDown(self):
+        await get_redis().aclose()
+
+    async def test_filter_unseen(self):
+        deduplicator = EventDeduplicator(max_size=10, redis_enabled=False)
+        dropped_in_batch = events_duplicates_dropped_total.get("batch")
+        dropped_in_memory = events_duplicates_dropped_total.get("memory")
+
+        unseen = await deduplicator.filter_unseen(
+            [("1", b"event"), ("2", b"event"), ("1", b"event"), (None, b"event")]
+        )
+        # Same content with another delivery identity is not a duplicate
+        self.assertEqual(unseen, [("1", b"event"), ("2", b"event"), (None, b"event")])
+        self.assertEqual(
+            events_duplicates_dropped_total.get("batch"), dropped_in_batch + 1
+        )
+
+        # Messages are only dropped once they are marked as seen
+        self.assertEqual(len(await deduplicator.filter_unseen([("1", b"event")])), 1)
+        await deduplicator.mark_as_seen(["1", "2"])
+        self.assertEqual(
+            await deduplicator.filter_unseen(
+                [("1", b"event"), ("2", b"event"), ("3", b"event"), (None, b"event")]
+            ),
+            [("3", b"event"), (None, b"event")],
+        )
+        self.assertEqual(
+            events_duplicates_dropped_total.get("memory"), dropped_in_memory + 2
+        )
+
+    async def test_max_size(self):
+        deduplicator = EventDeduplicator(max_size=2, redis_enabled=False)
+        await deduplicator.mark_as_seen(["1"])
+        await deduplicator.mark_as_seen(["2"])
+        # Recently seen messages are kept
+        self.assertEqual(await deduplicator.filter_unseen([("1", b"event")]), [])
+        await deduplicator.mark_as_seen(["3"])
+
+        self.assertEqual(
+            [
+                message_id
+                for message_id, _ in await deduplicator.filter_unseen(
+                    [("1", b"event"), ("2", b"event"), ("3", b"event")]
+                )
+            ],
+            ["2"],
+        )
+
+    async def test_ttl(self):
+        deduplicator = EventDeduplicator(redis_enabled=False, ttl=60)
+        with patch("time.monotonic", return_value=1000):
+            await deduplicator.mark_as_seen(["1"])
+        with patch("time.monotonic", return_value=1059):
+            self.assertEqual(await deduplicator.filter_unseen([("1", b"event")]), [])
+        with patch("time.monotonic", return_value=1060):
+            self.assertEqual(
+                await deduplicator.filter_unseen([("1", b"event")]), [("1", b"event")]
+            )
+
+    async def test_redis(self):
+        deduplicator = EventDeduplicator(redis_enabled=True, ttl=60)
+        other_deduplicator = EventDeduplicator(redis_enabled=True, ttl=60)
+        dropped_in_redis = events_duplicates_dropped_total.get("redis")
+
+        await deduplicator.mark_as_seen(["1"])
+        self.assertEqual(await get_redis().ttl("events-dedup:1"), 60)
+
+        # Messages processed by other workers are dropped
+        self.assertEqual(
+            await other_deduplicator.filter_unseen([("1", b"event"), ("2", b"event")]),
+            [("2", b"event")],
+        )
+        self.assertEqual(
+            events_duplicates_dropped_total.get("redis"), dropped_in_redis + 1
+        )
+        # And remembered in memory
+        self.assertEqual(await other_deduplicator.filter_unseen([("1", b"event")]), [])
+        self.assertEqual(
+            events_duplicates_dropped_total.get("redis"), dropped_in_redis + 1
+        )
+
+    async def test_redis_error(self):
+        deduplicator = EventDeduplicator(redis_enabled=True)
+        with patch(
+            "redis.asyncio.client.Pipeline.execute", side_effect=RedisError("Down")
+        ):
+            with self.assertLogs("app.services.event_deduplicator", level="WARNING"):
+                await deduplicator.mark_as_seen(["1"])
+            with self.assertLogs("app.services.event_deduplicator", level="WARNING"):
+                self.assertEqual(
+                    len(await deduplicator.filter_unseen([("2", b"event")])), 1
+                )
+        # Still remembered in memory
+        self.assertEqual(await deduplicator.filter_unseen([("1", b"event")]), [])
@@ -0,0 +1,133 @@
+import json
+import unittest
+
+from safe_eth.eth.utils import fast_to_checksum_address
+
+from app.services.event_deduplicator import EventDeduplicator
+from app.services.event_dispatcher import EventDispatcher
+from app.services.event_models import MultisigTransactionEvent
+
+SAFE = fast_to_checksum_address(b"\x01" * 20)
+
+
+def build_event(event_type: str, safe_tx_hash: str) -> bytes:
+    return json.dumps(
+        {"type": event_type, "address": SAFE, "safeTxHash": safe_tx_hash}
+    ).encode()
+
+
+class TestEventDispatcher(unittest.IsolatedAsyncioTestCase):
+    async def test_dispatch(self):
+        confirmations: list[list[MultisigTransactionEvent]] = []
+        executions: list[list[MultisigTransactionEvent]] = []
+
+        async def confirmation_handler(events: list[MultisigTransactionEvent]):
+            confirmations.append(events)
+
+        async def execution_handler(events: list[MultisigTransactionEvent]):
+            executions.append(events)
+
+        dispatcher = EventDispatcher()
+        dispatcher.register(["NEW_CONFIRMATION"], confirmation_handler)
+        dispatcher.register(["EXECUTED_MULTISIG_TRANSACTION"], execution_handler)
+
+        dispatched = await dispatcher.dispatch(
+            [
+                build_event("NEW_CONFIRMATION", "0x01"),
+                json.dumps({"type": "INCOMING_ETHER", "address": SAFE}).encode(),
+                # Supported type without a registered handler
+                build_event("PENDING_MULTISIG_TRANSACTION", "0x02"),
+                build_event("EXECUTED_MULTISIG_TRANSACTION", "0x03"),
+                build_event("NEW_CONFIRMATION", "0x04"),
+                b"not-json",
+            ]
+        )
+
+        self.assertEqual(dispatched, 3)
+        self.assertEqual(len(confirmations), 1)
+        self.assertEqual(
+            [event.safe_tx_hash for event in confirmations[0]], ["0x01", "0x04"]
+        )
+        self.assertEqual(len(executions), 1)
+        self.assertEqual([event.safe_tx_hash for event in executions[0]], ["0x03"])
+
+    async def test_dispatch_without_events(self):
+        called = False
+
+        async def handler(events: list[MultisigTransactionEvent]):
+            nonlocal called
+            called = True
+
+        dispatcher = EventDispatcher()
+        dispatcher.register(["NEW_CONFIRMATION"], handler)
+
+        self.assertEqual(await dispatcher.dispatch([b"not-json"]), 0)
+        self.assertFalse(called)
+
+    async def test_dispatch_nested_type(self):
+        dispatched: list[MultisigTransactionEvent] = []
+
+        async def handler(events: list[MultisigTransactionEvent]):
+            dispatched.extend(events)
+
+        dispatcher = EventDispatcher()
+        dispatcher.register(["NEW_CONFIRMATION"], handler)
+        # Peeked type is the nested one, the event is not a confirmation
+        nested = json.dumps(
+            {
+                "extra": {"type": "NEW_CONFIRMATION"},
+                "type": "DELETED_MULTISIG_TRANSACTION",
+                "address": SAFE,
+                "safeTxHash": "0x01",
+            }
+        ).encode()
+
+        with self.assertLogs("app.services.event_dispatcher", level="WARNING"):
+            self.assertEqual(
+                await dispatcher.dispatch(
+                    [nested, build_event("NEW_CONFIRMATION", "0x02")]
+                ),
+                1,
+            )
+        self.assertEqual([event.safe_tx_hash for event in dispatched], ["0x02"])
+
+    async def test_dispatch_duplicated_events(self):
+        dispatched: list[str] = []
+        fail = True
+
+        async def handler(events: list[MultisigTransactionEvent]):
+            if fail:
+                raise ValueError("Unable to process events")
+            dispatched.extend(event.safe_tx_hash for event in events)
+
+        dispatcher = EventDispatcher(
+            deduplicator=EventDeduplicator(redis_enabled=False)
+        )
+        dispatcher.register(["NEW_CONFIRMATION"], handler)
+        # Redelivered first message
+        events = [
+            build_event("NEW_CONFIRMATION", "0x01"),
+            build_event("NEW_CONFIRMATION", "0x01"),
+            build_event("NEW_CONFIRMATION", "0x02"),
+        ]
+
+        message_ids = ["1", "1", "2"]
+
+        # Failed messages are not marked as seen
+        with self.assertRaises(ValueError):
+            await dispatcher.dispatch(events, message_ids)
+        fail = False
+        self.assertEqual(await dispatcher.dispatch(events, message_ids), 2)
+        self.assertEqual(dispatched, ["0x01", "0x02"])
+
+        self.assertEqual(
+            await dispatcher.dispatch(
+                [*events, build_event("NEW_CONFIRMATION", "0x03")],
+                [*message_ids, "3"],
+            ),
+            1,
+        )
+        self.assertEqual(dispatched, ["0x01", "0x02", "0x03"])
+
+        # Without delivery identity nothing is dropped
+        self.assertEqual(await dispatcher.dispatch(events), 3)
@@ -0,0 +1,54 @@
+import unittest
+
+from app.metrics import event_hub_evicted_subscribers_total, event_hub_subscribers
+from app.services.event_hub import EventHub
+
+
+class TestEventHub(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.event_hub = EventHub()
+        self.safe = "0x" + "1" * 40
+        self.other_safe = "0x" + "2" * 40
+
+    async def test_publish(self):
+        subscribers = event_hub_subscribers.get()
+        subscription = self.event_hub.subscribe([self.safe, self.other_safe])
+        other_subscription = self.event_hub.subscribe([self.other_safe])
+        self.assertEqual(event_hub_subscribers.get(), subscribers + 2)
+
+        self.assertEqual(self.event_hub.publish(self.safe, "event-1"), 1)
+        self.assertEqual(self.event_hub.publish(self.other_safe, "event-2"), 2)
+        self.assertEqual(self.event_hub.publish("0x" + "3" * 40, "event-3"), 0)
+
+        self.assertEqual(subscription.queue.get_nowait(), "event-1")
+        self.assertEqual(subscription.queue.get_nowait(), "event-2")
+        self.assertTrue(subscription.queue.empty())
+        self.assertEqual(other_subscription.queue.get_nowait(), "event-2")
+        self.assertTrue(other_subscription.queue.empty())
+
+        self.event_hub.unsubscribe(subscription)
+        self.event_hub.unsubscribe(subscription)
+        self.assertEqual(event_hub_subscribers.get(), subscribers + 1)
+        self.assertEqual(self.event_hub.publish(self.safe, "event-4"), 0)
+        self.assertEqual(self.event_hub.publish(self.other_safe, "event-5"), 1)
+        self.assertTrue(subscription.queue.empty())
+
+    async def test_slow_subscriber_is_evicted(self):
+        evicted = event_hub_evicted_subscribers_total.get()
+        subscription = self.event_hub.subscribe([self.safe], max_size=2)
+        fast_subscription = self.event_hub.subscribe([self.safe], max_size=2)
+
+        for i in range(2):
+            self.assertEqual(self.event_hub.publish(self.safe, f"event-{i}"), 2)
+            fast_subscription.queue.get_nowait()
+
+        with self.assertLogs("app.services.event_hub", level="WARNING"):
+            self.assertEqual(self.event_hub.publish(self.safe, "event-2"), 1)
+
+        self.assertTrue(subscription.evicted)
+        self.assertFalse(fast_subscription.evicted)
+        self.assertEqual(event_hub_evicted_subscribers_total.get(), evicted + 1)
+        # Pending events are discarded
+        self.assertIsNone(subscription.queue.get_nowait())
+        self.assertTrue(subscription.queue.empty())
+        self.assertEqual(self.event_hub.publish(self.safe, "event-3"), 1)
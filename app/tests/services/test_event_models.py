@@ -0,0 +1,110 @@
+import json
+import unittest
+
+from safe_eth.eth.utils import fast_to_checksum_address
+
+from app.services.event_models import (
+    DeletedMultisigTransactionEvent,
+    ExecutedMultisigTransactionEvent,
+    NewConfirmationEvent,
+    decode_multisig_transaction_event,
+    peek_event_address,
+    peek_event_type,
+)
+
+SAFE = fast_to_checksum_address(b"\xaa" * 20)
+SAFE_TX_HASH = "0x" + "ab" * 32
+
+
+class TestEventModels(unittest.TestCase):
+    def test_peek_event_type(self):
+        self.assertEqual(
+            peek_event_type(b'{"address": "0x1", "type" : "NEW_CONFIRMATION"}'),
+            "NEW_CONFIRMATION",
+        )
+        self.assertEqual(
+            peek_event_type(b'{"type":"INCOMING_ETHER"}'),
+            "INCOMING_ETHER",
+        )
+        self.assertIsNone(peek_event_type(b'{"address": "0x1"}'))
+        self.assertIsNone(peek_event_type(b"not-json"))
+
+    def test_peek_event_address(self):
+        self.assertEqual(
+            peek_event_address(
+                f'{{"type": "NEW_CONFIRMATION", "address" : "{SAFE}"}}'.encode()
+            ),
+            b"\xaa" * 20,
+        )
+        self.assertIsNone(peek_event_address(b'{"address": "0x1"}'))
+        self.assertIsNone(peek_event_address(b"not-json"))
+
+    def test_decode_multisig_transaction_event(self):
+        event = decode_multisig_transaction_event(
+            json.dumps(
+                {
+                    "type": "EXECUTED_MULTISIG_TRANSACTION",
+                    "address": SAFE,
+                    "safeTxHash": SAFE_TX_HASH,
+                    "txHash": "0x" + "cd" * 32,
+                    "failed": False,
+                    "chainId": 1,
+                }
+            ).encode()
+        )
+        self.assertIsInstance(event, ExecutedMultisigTransactionEvent)
+        assert isinstance(event, ExecutedMultisigTransactionEvent)
+        self.assertEqual(event.address, SAFE)
+        self.assertEqual(event.safe_tx_hash, SAFE_TX_HASH)
+        self.assertEqual(event.tx_hash, "0x" + "cd" * 32)
+        self.assertFalse(event.failed)
+        self.assertEqual(event.chain_id, 1)
+
+        event = decode_multisig_transaction_event(
+            json.dumps(
+                {
+                    "type": "DELETED_MULTISIG_TRANSACTION",
+                    "address": SAFE,
+                    "safeTxHash": SAFE_TX_HASH,
+                }
+            ).encode()
+        )
+        self.assertIsInstance(event, DeletedMultisigTransactionEvent)
+
+        event = decode_multisig_transaction_event(
+            json.dumps(
+                {
+                    "type": "NEW_CONFIRMATION",
+                    "address": SAFE,
+                    "safeTxHash": SAFE_TX_HASH,
+                    "owner": SAFE,
+                    "unknownField": "ignored",
+                }
+            ).encode()
+        )
+        self.assertIsInstance(event, NewConfirmationEvent)
+
+    def test_decode_unsupported_event(self):
+        self.assertIsNone(
+            decode_multisig_transaction_event(
+                json.dumps({"type": "INCOMING_ETHER", "address": SAFE}).encode()
+            )
+        )
+        self.assertIsNone(decode_multisig_transaction_event(b"not-json"))
+
+    def test_decode_invalid_event(self):
+        for body in (
+            # Not an address
+            {
+                "type": "NEW_CONFIRMATION",
+                "address": "0x1",
+                "safeTxHash": SAFE_TX_HASH,
+            },
+            # Missing `safeTxHash`
+            {"type": "NEW_CONFIRMATION", "address": SAFE},
+        ):
+            with self.subTest(body=body):
+                with self.assertLogs("app.services.event_models", level="ERROR"):
+                    self.assertIsNone(
+                        decode_multisig_transaction_event(json.dumps(body).encode())
+                    )
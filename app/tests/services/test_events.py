@@ -0,0 +1,141 @@
+import json
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+
+from safe_eth.eth.utils import fast_to_checksum_address
+
+from app.datasources.cache.page_cache import multisig_transactions_cache
+from app.datasources.cache.redis import get_redis
+from app.datasources.queue.queue_provider import QueueProvider
+from app.services.event_hub import event_hub
+from app.services.events import EventsService
+from app.tests.datasources.queue.test_queue_provider import (
+    StandInConsumerChannel,
+    StandInMessage,
+    StandInQueue,
+)
+
+SAFE_TX_HASH = "0x" + "ab" * 32
+
+
+class TestEventsService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        get_redis.cache_clear()
+        await get_redis().flushdb()
+
+    async def asyncTearDown(self):
+        await get_redis().aclose()
+
+    async def test_process_events(self):
+        safe = b"\x01" * 20
+        other_safe = b"\x02" * 20
+        for address in (safe, other_safe):
+            await multisig_transactions_cache.set(address.hex(), "page", b"payload", 0)
+
+        with self.assertLogs("app.services.event_models", level="ERROR"):
+            await EventsService().process_events(
+                [
+                    b"not-json",
+                    json.dumps(
+                        {
+                            "type": "NEW_CONFIRMATION",
+                            "address": "0x1",
+                            "safeTxHash": SAFE_TX_HASH,
+                        }
+                    ).encode(),
+                    json.dumps(
+                        {
+                            "type": "INCOMING_ETHER",
+                            "address": fast_to_checksum_address(other_safe),
+                        }
+                    ).encode(),
+                    json.dumps(
+                        {
+                            "type": "NEW_CONFIRMATION",
+                            "address": fast_to_checksum_address(safe),
+                            "safeTxHash": SAFE_TX_HASH,
+                        }
+                    ).encode(),
+                ]
+            )
+
+        self.assertIsNone(await multisig_transactions_cache.get(safe.hex(), "page"))
+        self.assertEqual(
+            await multisig_transactions_cache.get(other_safe.hex(), "page"), b"payload"
+        )
+
+    async def test_process_events_resent(self):
+        safe = b"\x01" * 20
+        event = json.dumps(
+            {
+                "type": "PENDING_MULTISIG_TRANSACTION",
+                "address": fast_to_checksum_address(safe),
+                "safeTxHash": SAFE_TX_HASH,
+            }
+        ).encode()
+        events_service = EventsService()
+        for _ in range(2):
+            generation = await multisig_transactions_cache.get_generation(safe.hex())
+            await multisig_transactions_cache.set(
+                safe.hex(), "page", b"payload", generation
+            )
+            # Identical events are not dropped, every one invalidates the cache
+            await events_service.process_events([event])
+            self.assertIsNone(await multisig_transactions_cache.get(safe.hex(), "page"))
+
+    @patch("app.config.settings.EVENTS_DEDUP_ENABLED", True)
+    @patch("app.config.settings.EVENTS_DEDUP_REDIS_ENABLED", False)
+    async def test_process_events_redelivered(self):
+        safe = b"\x01" * 20
+        event = json.dumps(
+            {
+                "type": "PENDING_MULTISIG_TRANSACTION",
+                "address": fast_to_checksum_address(safe),
+                "safeTxHash": SAFE_TX_HASH,
+            }
+        ).encode()
+        queue = StandInQueue()
+        queue_provider = QueueProvider()
+        queue_provider._events_queue = queue  # type: ignore[assignment]
+        queue_provider._connection = Mock()
+        queue_provider._connection.channel = AsyncMock(
+            return_value=StandInConsumerChannel(queue)
+        )
+        await queue_provider.consume_batch(
+            EventsService().process_events, batch_size=1, batch_timeout_ms=1000
+        )
+
+        for message_id, invalidated in (("1", True), ("1", False), ("2", True)):
+            generation = await multisig_transactions_cache.get_generation(safe.hex())
+            await multisig_transactions_cache.set(
+                safe.hex(), "page", b"payload", generation
+            )
+            message = StandInMessage(event, message_id=message_id)
+            await queue.deliver(message)
+            self.assertTrue(message.acked)
+            # A redelivery is dropped, a re-sent event has a new message id
+            self.assertEqual(
+                await multisig_transactions_cache.get(safe.hex(), "page"),
+                None if invalidated else b"payload",
+            )
+
+    async def test_publish_event(self):
+        safe = fast_to_checksum_address(b"\x01" * 20)
+        subscription = event_hub.subscribe([safe])
+        try:
+            ignored_event = json.dumps({"type": "INCOMING_ETHER", "address": safe})
+            event = json.dumps(
+                {
+                    "type": "NEW_CONFIRMATION",
+                    "address": safe,
+                    "safeTxHash": SAFE_TX_HASH,
+                }
+            )
+            await EventsService().publish_event(b"not-json")
+            await EventsService().publish_event(ignored_event.encode())
+            await EventsService().publish_event(event.encode())
+
+            self.assertEqual(subscription.queue.get_nowait(), event)
+            self.assertTrue(subscription.queue.empty())
+        finally:
+            event_hub.unsubscribe(subscription)
@@ -0,0 +1,91 @@
+import asyncio
+from collections.abc import Sequence
+
+from app.datasources.db.database import (
+    db_session,
+    db_session_context,
+    set_database_session_context,
+)
+from app.datasources.db.models import OutboxEvent
+from app.datasources.queue.queue_provider import QueueProvider
+from app.metrics import outbox_events_relayed_total
+from app.services.outbox_relay import OutboxRelay
+from app.tests.datasources.db.async_db_test_case import AsyncDbTestCase
+
+
+class RecordingQueueProvider(QueueProvider):
+    def __init__(self, fail: bool = False, delay: float = 0) -> None:
+        super().__init__()
+        self.fail = fail
+        self.delay = delay
+        self.published: list[bytes] = []
+
+    async def publish_many(self, bodies: Sequence[bytes]) -> None:
+        if self.fail:
+            raise ConnectionError("Unable to publish")
+        await asyncio.sleep(self.delay)
+        self.published.extend(bodies)
+
+
+class TestOutboxRelay(AsyncDbTestCase):
+    async def create_events(self, count: int) -> list[bytes]:
+        payloads = [f'{{"event": {i}}}'.encode() for i in range(count)]
+        with set_database_session_context():
+            for payload in payloads:
+                await OutboxEvent(payload=payload).create()
+            await db_session.remove()
+        return payloads
+
+    @db_session_context
+    async def get_pending_payloads(self) -> list[bytes]:
+        return [event.payload for event in await OutboxEvent.get_all()]
+
+    async def test_relay_batch(self):
+        payloads = await self.create_events(5)
+        queue_provider = RecordingQueueProvider()
+        relay = OutboxRelay(queue_provider, batch_size=3)
+        relayed = outbox_events_relayed_total.get()
+
+        self.assertEqual(await relay.relay_batch(), 3)
+        self.assertEqual(queue_provider.published, payloads[:3])
+        self.assertEqual(await self.get_pending_payloads(), payloads[3:])
+
+        self.assertEqual(await relay.relay_batch(), 2)
+        self.assertEqual(await relay.relay_batch(), 0)
+        self.assertEqual(queue_provider.published, payloads)
+        self.assertEqual(await self.get_pending_payloads(), [])
+        self.assertEqual(outbox_events_relayed_total.get(), relayed + 5)
+
+    async def test_relay_batch_publish_failed(self):
+        payloads = await self.create_events(2)
+        relay = OutboxRelay(RecordingQueueProvider(fail=True))
+
+        with self.assertRaises(ConnectionError):
+            await relay.relay_batch()
+        self.assertEqual(await self.get_pending_payloads(), payloads)
+
+    async def test_relay_batch_publish_timeout(self):
+        payloads = await self.create_events(2)
+        relay = OutboxRelay(
+            RecordingQueueProvider(delay=1), publish_timeout_seconds=0.01
+        )
+
+        # Locks are released instead of waiting for the broker
+        with self.assertRaises(TimeoutError):
+            await relay.relay_batch()
+        self.assertEqual(await self.get_pending_payloads(), payloads)
+
+    async def test_relay_batch_skip_locked(self):
+        payloads = await self.create_events(3)
+        queue_provider = RecordingQueueProvider()
+        relay = OutboxRelay(queue_provider)
+
+        # Another relay is publishing the first events
+        with set_database_session_context():
+            locked = await OutboxEvent.get_pending(limit=2)
+            self.assertEqual(await relay.relay_batch(), 1)
+            await db_session.remove()
+
+        self.assertEqual(len(locked), 2)
+        self.assertEqual(queue_provider.published, payloads[2:])
+        self.assertEqual(await self.get_pending_payloads(), payloads[:2])
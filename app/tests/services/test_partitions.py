@@ -0,0 +1,156 @@
+import random
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+from safe_eth.eth.utils import fast_to_checksum_address
+
+from app.datasources.cache.redis import get_redis
+from app.datasources.queue.queue_provider import BatchCallback, QueueProvider
+from app.services.partitions import (
+    WORKERS_REDIS_KEY,
+    PartitionCoordinator,
+    PartitionRouter,
+    assign_partitions,
+    get_partition,
+)
+
+
+class RecordingQueueProvider(QueueProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.routed: list[tuple[int, bytes]] = []
+        self.routed_message_ids: list[str | None] = []
+        self.consumed_partitions: set[int] = set()
+
+    async def publish_to_partitions(self, messages, message_ids=None) -> None:
+        self.routed.extend(messages)
+        self.routed_message_ids.extend(message_ids or [None] * len(messages))
+
+    async def consume_batch(
+        self,
+        callback: BatchCallback,
+        batch_size: int | None = None,
+        batch_timeout_ms: int | None = None,
+        partition: int | None = None,
+        retry_in_place: bool = False,
+    ):
+        assert partition is not None
+        self.consumed_partitions.add(partition)
+        return f"consumer-{partition}"
+
+    async def cancel_partition(self, partition: int) -> None:
+        self.consumed_partitions.remove(partition)
+
+
+async def process_events(messages: list[bytes], message_ids: list[str | None]) -> None:
+    pass
+
+
+class TestPartitions(unittest.TestCase):
+    def test_get_partition(self):
+        address = b"\x01" * 19 + b"\x07"
+        self.assertEqual(get_partition(address, 4), get_partition(address, 4))
+        self.assertEqual(get_partition(None, 4), 0)
+
+        counts = Counter(get_partition(random.randbytes(20), 4) for _ in range(4000))
+        self.assertEqual(set(counts), {0, 1, 2, 3})
+        self.assertTrue(all(count > 800 for count in counts.values()))
+
+    def test_assign_partitions(self):
+        self.assertEqual(assign_partitions([], 8), {})
+
+        assignment = assign_partitions(["worker-1", "worker-2", "worker-3"], 32)
+        self.assertEqual(
+            sorted(
+                partition
+                for partitions in assignment.values()
+                for partition in partitions
+            ),
+            list(range(32)),
+        )
+        self.assertTrue(all(assignment.values()))
+        # Same assignment whatever the order of the workers
+        self.assertEqual(
+            assign_partitions(["worker-3", "worker-1", "worker-2"], 32), assignment
+        )
+
+        # Only the partitions of the new worker are moved
+        with_new_worker = assign_partitions(
+            ["worker-1", "worker-2", "worker-3", "worker-4"], 32
+        )
+        for worker_id, partitions in assignment.items():
+            self.assertTrue(set(with_new_worker[worker_id]).issubset(partitions))
+
+        # Only the partitions of the removed worker are moved
+        without_worker = assign_partitions(["worker-1", "worker-2"], 32)
+        for worker_id in ("worker-1", "worker-2"):
+            self.assertTrue(
+                set(assignment[worker_id]).issubset(without_worker[worker_id])
+            )
+
+
+class TestPartitionRouter(unittest.IsolatedAsyncioTestCase):
+    @patch("app.config.settings.RABBITMQ_PARTITIONS", 4)
+    async def test_route(self):
+        safe = b"\x01" * 19 + b"\x07"
+        messages = [
+            f'{{"type": "NEW_CONFIRMATION", "address": "{fast_to_checksum_address(safe)}"}}'.encode(),
+            b'{"type": "UNKNOWN"}',
+        ]
+        queue_provider = RecordingQueueProvider()
+
+        await PartitionRouter(queue_provider).route(messages, ["1", "2"])
+
+        self.assertEqual(
+            queue_provider.routed,
+            [(get_partition(safe, 4), messages[0]), (0, messages[1])],
+        )
+        self.assertEqual(queue_provider.routed_message_ids, ["1", "2"])
+
+
+class TestPartitionCoordinator(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        get_redis.cache_clear()
+        await get_redis().flushdb()
+
+    async def asyncTearDown(self):
+        await get_redis().aclose()
+
+    @patch("app.config.settings.RABBITMQ_PARTITIONS", 8)
+    async def test_rebalance(self):
+        first = PartitionCoordinator(
+            RecordingQueueProvider(), process_events, "worker-1"
+        )
+        second = PartitionCoordinator(
+            RecordingQueueProvider(), process_events, "worker-2"
+        )
+
+        await first.rebalance()
+        self.assertEqual(first.partitions, set(range(8)))
+        self.assertEqual(first.queue_provider.consumed_partitions, set(range(8)))  # type: ignore[attr-defined]
+
+        # Partitions are split once every worker sent a heartbeat
+        await second.rebalance()
+        await first.rebalance()
+        self.assertTrue(first.partitions)
+        self.assertTrue(second.partitions)
+        self.assertEqual(first.partitions | second.partitions, set(range(8)))
+        self.assertFalse(first.partitions & second.partitions)
+        self.assertEqual(first.queue_provider.consumed_partitions, first.partitions)  # type: ignore[attr-defined]
+
+        # Partitions of a leaving worker are taken by the other ones
+        await second.leave()
+        self.assertEqual(second.queue_provider.consumed_partitions, set())  # type: ignore[attr-defined]
+        await first.rebalance()
+        self.assertEqual(first.partitions, set(range(8)))
+
+    @patch("app.config.settings.RABBITMQ_PARTITIONS", 8)
+    @patch("app.config.settings.PARTITIONS_WORKER_TTL_SECONDS", 10)
+    async def test_expired_workers_are_removed(self):
+        await get_redis().zadd(WORKERS_REDIS_KEY, {"stale-worker": 1})
+        coordinator = PartitionCoordinator(RecordingQueueProvider(), process_events)
+
+        self.assertEqual(await coordinator.get_worker_ids(), [coordinator.worker_id])
+        await coordinator.rebalance()
+        self.assertEqual(coordinator.partitions, set(range(8)))
@@ -0,0 +1,48 @@
+import unittest
+
+from ..metrics import Counter, Gauge, Histogram, Metric, MetricsRegistry
+
+
+class TestMetrics(unittest.TestCase):
+    def test_render(self):
+        registry = MetricsRegistry()
+        counter = registry.register(
+            Counter("messages_total", "Messages", ("consumer",))
+        )
+        gauge = registry.register(Gauge("connections", "Connections"))
+        histogram = registry.register(
+            Histogram("duration_seconds", "Duration", ("route",), buckets=(0.1, 1))
+        )
+        registry.add_collector(lambda: gauge.set(3))
+
+        counter.inc("batch", amount=2)
+        counter.inc("batch")
+        counter.inc('with "quotes"')
+        histogram.observe(0.05, "/a")
+        histogram.observe(0.1, "/a")
+        histogram.observe(5, "/a")
+
+        self.assertEqual(
+            registry.render(),
+            "# HELP messages_total Messages\n"
+            "# TYPE messages_total counter\n"
+            'messages_total{consumer="batch"} 3\n'
+            'messages_total{consumer="with \\"quotes\\""} 1\n'
+            "# HELP connections Connections\n"
+            "# TYPE connections gauge\n"
+            "connections 3\n"
+            "# HELP duration_seconds Duration\n"
+            "# TYPE duration_seconds histogram\n"
+            'duration_seconds_bucket{route="/a",le="0.1"} 2\n'
+            'duration_seconds_bucket{route="/a",le="1.0"} 2\n'
+            'duration_seconds_bucket{route="/a",le="+Inf"} 3\n'
+            'duration_seconds_sum{route="/a"} 5.15\n'
+            'duration_seconds_count{route="/a"} 3\n',
+        )
+
+    def test_incomplete_metric(self):
+        class IncompleteMetric(Metric):
+            type = "untyped"
+
+        with self.assertRaises(TypeError):
+            IncompleteMetric("incomplete", "Missing samples")  # type: ignore[abstract]
@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+from safe_eth.eth.utils import fast_to_checksum_address
+
+from ..datasources.db.database import get_read_engine
+from ..loggers.safe_logger import HttpRequestLog, HttpResponseLog
+from ..main import app
+from ..metrics import http_request_duration_seconds
+from .datasources.db.async_db_test_case import AsyncDbTestCase
+
+
+class TestLoggingMiddleware(unittest.TestCase):
+    client: TestClient
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+
+    def setUp(self):
+        http_request_duration_seconds.clear()
+
+    def test_request_is_logged(self):
+        with self.assertLogs("app.middlewares", level="INFO") as logs:
+            response = self.client.get("/api/v1/about")
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(len(logs.records), 1)
+        http_request = logs.records[0].http_request  # type: ignore[attr-defined]
+        http_response = logs.records[0].http_response  # type: ignore[attr-defined]
+        self.assertIsInstance(http_request, HttpRequestLog)
+        self.assertEqual(http_request.url, "http://testserver/api/v1/about")
+        self.assertEqual(http_request.method, "GET")
+        self.assertEqual(http_request.route, "/api/v1/about")
+        self.assertIsInstance(http_response, HttpResponseLog)
+        self.assertEqual(http_response.status, 200)
+        self.assertGreaterEqual(http_response.endTime, http_request.startTime)
+        self.assertGreaterEqual(http_response.totalTime, 0)
+        # About doesn't query the database
+        self.assertIsNone(logs.records[0].db_queries)  # type: ignore[attr-defined]
+
+    def test_route_template_histogram(self):
+        address = "0x" + "aa" * 20
+        self.client.get(f"/api/v1/safes/{address}/multisig-transactions")
+        self.client.get("/api/v1/about")
+        self.client.get("/api/v1/about")
+        self.client.get("/not-found")
+
+        values = http_request_duration_seconds.snapshot().values
+        self.assertEqual(values[("GET", "/api/v1/about")].count, 2)
+        self.assertEqual(
+            values[("GET", "/api/v1/safes/{address}/multisig-transactions")].count, 1
+        )
+        self.assertEqual(values[("GET", "unmatched")].count, 1)
+        self.assertEqual(
+            sum(values[("GET", "/api/v1/about")].bucket_counts),
+            values[("GET", "/api/v1/about")].count,
+        )
+
+    @patch("app.config.settings.HTTP_LOG_SAMPLE_RATE", 0.0)
+    def test_sampling(self):
+        with self.assertNoLogs("app.middlewares", level="INFO"):
+            self.client.get("/api/v1/about")
+        # Measured even if not logged
+        values = http_request_duration_seconds.snapshot().values
+        self.assertEqual(values[("GET", "/api/v1/about")].count, 1)
+
+        with (
+            patch("app.config.settings.HTTP_LOG_SLOW_REQUEST_MS", 0),
+            self.assertLogs("app.middlewares", level="INFO") as logs,
+        ):
+            self.client.get("/api/v1/about")
+        self.assertEqual(len(logs.records), 1)
+
+
+class TestDatabaseSessionMiddleware(AsyncDbTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.client = AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        )
+        safe_address = fast_to_checksum_address(b"\xaa" * 20)
+        self.url = f"/api/v1/safes/{safe_address}/multisig-transactions"
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        await super().asyncTearDown()
+
+    async def test_read_only_routes(self):
+        with patch(
+            "app.datasources.db.database.get_read_engine", wraps=get_read_engine
+        ) as get_read_engine_mock:
+            response = await self.client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+            get_read_engine_mock.assert_called()
+
+            # Read only routes are marked explicitly, not by the HTTP method
+            get_read_engine_mock.reset_mock()
+            response = await self.client.post(
+                "/api/v1/multisig-transactions/lookup",
+                json={"safeTxHashes": ["0x" + "ab" * 32]},
+            )
+            self.assertEqual(response.status_code, 200)
+            get_read_engine_mock.assert_called()
+
+    @patch("app.config.settings.DATABASE_CONNECTION_HOLD_WARNING_MS", 0)
+    async def test_connection_is_released(self):
+        with self.assertLogs(
+            "app.datasources.db.instrumentation", level="WARNING"
+        ) as logs:
+            response = await self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("Database connection held for", logs.output[0])
+        # Released inside the request session
+        self.assertIsNotNone(logs.records[0].db_session)  # type: ignore[attr-defined]
@@ -0,0 +1,64 @@
+"""
+Measure `EthereumAddressType` coercion of rows read from and written to the database,
+compared with the previous implementation copying every value.
+
+Doesn't need a database, processors are called like SQLAlchemy does for every row.
+
+Usage::
+
+    python -m benchmarks.address_coercion [rows]
+"""
+
+import random
+import sys
+import time
+from collections.abc import Callable
+
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from app.datasources.db.fields import EthereumAddressType
+
+
+class PreviousEthereumAddressType(EthereumAddressType):
+    cache_ok = True
+
+    def result_processor(self, dialect, coltype):
+        return super(EthereumAddressType, self).result_processor(dialect, coltype)
+
+    def _coerce_to_bytes(self, value):
+        if isinstance(value, (memoryview, bytes)):
+            raw = bytes(value)
+            if len(raw) != self.binary_size:
+                raise ValueError(
+                    f"{self.__class__.__name__} expects {self.binary_size}-byte values"
+                )
+            return raw
+        return self._hex_to_bytes(value)
+
+
+def measure(process: Callable, values: list) -> float:
+    start = time.perf_counter()
+    for value in values:
+        process(value)
+    return len(values) / (time.perf_counter() - start)
+
+
+def run(rows: int) -> None:
+    dialect = asyncpg_dialect()
+    # asyncpg returns `bytes`, some rows are `NULL`
+    values = [random.randbytes(20) if i % 4 else None for i in range(rows)]
+    for name, address_type in (
+        ("previous", PreviousEthereumAddressType()),
+        ("current", EthereumAddressType()),
+    ):
+        result_process = address_type.result_processor(dialect, None)
+        bind_process = address_type.bind_processor(dialect)
+        assert bind_process is not None
+        print(
+            f"{name:<10} decode {measure(result_process, values):>12.0f} rows/s  "
+            f"bind {measure(bind_process, values):>12.0f} rows/s"
+        )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
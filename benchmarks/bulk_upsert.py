@@ -0,0 +1,62 @@
+"""
+Compare `MultisigTransaction.bulk_upsert` with the per-row `create()` path.
+
+Rows are inserted in the configured `DATABASE_URL` and removed at the end.
+
+Usage::
+
+    python -m benchmarks.bulk_upsert [rows]
+"""
+
+import asyncio
+import sys
+import time
+
+from sqlalchemy import delete
+from sqlmodel import SQLModel
+
+from app.datasources.db.database import db_session, db_session_context, get_engine
+from app.datasources.db.models import MultisigTransaction
+from app.tests.datasources.db.factory import build_multisig_transaction
+
+
+@db_session_context
+async def run(rows: int) -> None:
+    async with get_engine().begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    per_row = [build_multisig_transaction() for _ in range(rows)]
+    bulk = [build_multisig_transaction() for _ in range(rows)]
+    try:
+        start = time.perf_counter()
+        for transaction in per_row:
+            await transaction.create()
+        per_row_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = await MultisigTransaction.bulk_upsert(bulk)
+        bulk_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await MultisigTransaction.bulk_upsert(bulk)
+        bulk_update_elapsed = time.perf_counter() - start
+    finally:
+        await db_session.execute(
+            delete(MultisigTransaction).where(
+                MultisigTransaction.safe_tx_hash.in_(  # type: ignore[attr-defined]
+                    [transaction.safe_tx_hash for transaction in per_row + bulk]
+                )
+            )
+        )
+        await db_session.commit()
+
+    print(f"create()            {rows / per_row_elapsed:>10.0f} rows/s")
+    print(
+        f"bulk_upsert insert  {rows / bulk_elapsed:>10.0f} rows/s "
+        f"(inserted={result.inserted})"
+    )
+    print(f"bulk_upsert update  {rows / bulk_update_elapsed:>10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -0,0 +1,89 @@
+"""
+Measure decoding of consumed RabbitMQ events, compared with the previous implementation
+decoding every body to `str` and parsing it with `json.loads`.
+
+Doesn't need RabbitMQ, a batch of bodies is decoded like the events consumer does.
+Most safe-transaction-service events (e.g. `INCOMING_ETHER`) are not multisig transaction
+events, `unknown_ratio` sets their share in the batch.
+
+Usage::
+
+    python -m benchmarks.event_decoding [events] [unknown_ratio]
+"""
+
+import json
+import random
+import sys
+import time
+from collections.abc import Callable
+
+from safe_eth.eth.utils import fast_to_checksum_address
+
+from app.services.event_models import (
+    MULTISIG_TRANSACTION_EVENT_TYPES,
+    decode_multisig_transaction_event,
+)
+
+UNKNOWN_EVENT_TYPES = (
+    "INCOMING_ETHER",
+    "INCOMING_TOKEN",
+    "OUTGOING_ETHER",
+    "MODULE_TRANSACTION",
+)
+
+
+def previous_decode(body: bytes) -> dict | None:
+    try:
+        event = json.loads(body.decode("utf-8"))
+    except json.JSONDecodeError:
+        return None
+    if (
+        not isinstance(event, dict)
+        or event.get("type") not in MULTISIG_TRANSACTION_EVENT_TYPES
+    ):
+        return None
+    return event
+
+
+def build_event(event_type: str) -> bytes:
+    return json.dumps(
+        {
+            "address": fast_to_checksum_address(random.randbytes(20)),
+            "type": event_type,
+            "safeTxHash": "0x" + random.randbytes(32).hex(),
+            "txHash": "0x" + random.randbytes(32).hex(),
+            "value": str(random.randint(0, 10**18)),
+            "chainId": "1",
+        }
+    ).encode()
+
+
+def measure(decode: Callable[[bytes], object], bodies: list[bytes]) -> float:
+    start = time.perf_counter()
+    for body in bodies:
+        decode(body)
+    return len(bodies) / (time.perf_counter() - start)
+
+
+def run(events: int, unknown_ratio: float) -> None:
+    known_event_types = sorted(MULTISIG_TRANSACTION_EVENT_TYPES)
+    bodies = [
+        build_event(
+            random.choice(UNKNOWN_EVENT_TYPES)
+            if random.random() < unknown_ratio
+            else random.choice(known_event_types)
+        )
+        for _ in range(events)
+    ]
+    for name, decode in (
+        ("previous", previous_decode),
+        ("current", decode_multisig_transaction_event),
+    ):
+        print(f"{name:<10} {measure(decode, bodies):>12.0f} events/s")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.8,
+    )
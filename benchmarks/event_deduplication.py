@@ -0,0 +1,84 @@
+"""
+Measure event dispatching when many messages are redeliveries (same AMQP `message_id`),
+like after a consumer restart, with and without the in-process `EventDeduplicator`.
+
+Doesn't need RabbitMQ nor Postgres, the handler waits `write_ms` per event like a database write.
+
+Usage::
+
+    python -m benchmarks.event_deduplication [events] [duplicate_ratio] [write_ms]
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+
+from safe_eth.eth.utils import fast_to_checksum_address
+
+from app.services.event_deduplicator import EventDeduplicator
+from app.services.event_dispatcher import EventDispatcher
+from app.services.event_models import (
+    MULTISIG_TRANSACTION_EVENT_TYPES,
+    MultisigTransactionEvent,
+)
+
+BATCH_SIZE = 100
+
+
+def build_event() -> bytes:
+    return json.dumps(
+        {
+            "address": fast_to_checksum_address(random.randbytes(20)),
+            "type": "NEW_CONFIRMATION",
+            "safeTxHash": "0x" + random.randbytes(32).hex(),
+            "owner": fast_to_checksum_address(random.randbytes(20)),
+            "chainId": "1",
+        }
+    ).encode()
+
+
+async def measure(
+    dispatcher: EventDispatcher, messages: list[tuple[str, bytes]]
+) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(messages), BATCH_SIZE):
+        batch = messages[i : i + BATCH_SIZE]
+        await dispatcher.dispatch(
+            [body for _, body in batch], [message_id for message_id, _ in batch]
+        )
+    return len(messages) / (time.perf_counter() - start)
+
+
+async def run(events: int, duplicate_ratio: float, write_ms: float) -> None:
+    unique_messages = [
+        (str(uuid.uuid4()), build_event())
+        for _ in range(max(int(events * (1 - duplicate_ratio)), 1))
+    ]
+    messages = unique_messages + [
+        random.choice(unique_messages) for _ in range(events - len(unique_messages))
+    ]
+    random.shuffle(messages)
+
+    async def handler(events: list[MultisigTransactionEvent]) -> None:
+        await asyncio.sleep(len(events) * write_ms / 1000)
+
+    for name, deduplicator in (
+        ("without dedup", None),
+        ("with dedup", EventDeduplicator(redis_enabled=False)),
+    ):
+        dispatcher = EventDispatcher(deduplicator=deduplicator)
+        dispatcher.register(sorted(MULTISIG_TRANSACTION_EVENT_TYPES), handler)
+        print(f"{name:<15} {await measure(dispatcher, messages):>12.0f} events/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        run(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 20_000,
+            float(sys.argv[2]) if len(sys.argv) > 2 else 0.9,
+            float(sys.argv[3]) if len(sys.argv) > 3 else 0.1,
+        )
+    )
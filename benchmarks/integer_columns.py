@@ -0,0 +1,85 @@
+"""
+Compare `Uint256Type` (`NUMERIC(78, 0)`) with `UintBigIntegerType` (`BIGINT`) for small
+integers like `nonce` and `chain_id`: index size, server side sort and row decoding.
+
+Temporary tables are created in the configured `DATABASE_URL`.
+
+Usage::
+
+    python -m benchmarks.integer_columns [rows]
+"""
+
+import asyncio
+import sys
+import time
+
+from sqlalchemy import Column, MetaData, Table, desc, func, select, text
+
+from app.datasources.db.database import get_engine
+from app.datasources.db.fields import Uint256Type, UintBigIntegerType
+
+metadata = MetaData()
+tables = {
+    "Uint256Type": Table("benchmark_uint256", metadata, Column("n", Uint256Type())),
+    "UintBigIntegerType": Table(
+        "benchmark_uint_bigint", metadata, Column("n", UintBigIntegerType())
+    ),
+}
+
+
+async def run(rows: int) -> None:
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+        await conn.run_sync(metadata.create_all)
+        for table in tables.values():
+            await conn.execute(
+                text(
+                    f"INSERT INTO {table.name} (n) "
+                    "SELECT (random() * 1000000)::bigint FROM generate_series(1, :rows)"
+                ),
+                {"rows": rows},
+            )
+            await conn.execute(
+                text(f"CREATE INDEX ix_{table.name} ON {table.name} (n)")
+            )
+            await conn.execute(text(f"ANALYZE {table.name}"))
+
+    try:
+        async with engine.connect() as conn:
+            for name, table in tables.items():
+                index_size = (
+                    await conn.execute(
+                        text(f"SELECT pg_relation_size('ix_{table.name}')")
+                    )
+                ).scalar_one()
+
+                # Sort in the database without sending the rows
+                sorted_rows = (
+                    select(table.c.n).order_by(desc(table.c.n)).offset(0).subquery()
+                )
+                start = time.perf_counter()
+                await conn.execute(select(func.count()).select_from(sorted_rows))
+                sort_elapsed = time.perf_counter() - start
+
+                start = time.perf_counter()
+                result = await conn.execute(select(table.c.n))
+                fetch_elapsed = time.perf_counter() - start
+                start = time.perf_counter()
+                values = result.scalars().all()
+                decode_elapsed = time.perf_counter() - start
+                assert type(values[0]) is int
+
+                print(
+                    f"{name:<20} index {index_size / 1024:>8.0f} KiB  "
+                    f"sort {sort_elapsed * 1000:>8.1f} ms  "
+                    f"fetch {fetch_elapsed * 1000:>8.1f} ms  "
+                    f"decode {decode_elapsed * 1000:>8.1f} ms"
+                )
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.drop_all)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000))
@@ -0,0 +1,45 @@
+"""
+Compare `SafeJsonFormatter.format` with the pydantic models based `format_with_models`.
+
+Usage::
+
+    python -m benchmarks.json_formatter [records]
+"""
+
+import datetime
+import functools
+import logging
+import sys
+import timeit
+
+from app.loggers.safe_logger import HttpRequestLog, HttpResponseLog, SafeJsonFormatter
+
+
+def get_records() -> dict[str, logging.LogRecord]:
+    record = logging.LogRecord(
+        "app", logging.INFO, __file__, 1, "Processing %s", ("event",), None
+    )
+    http_record = logging.makeLogRecord(record.__dict__)
+    now = datetime.datetime.now(datetime.UTC)
+    http_record.http_request = HttpRequestLog(
+        url="http://localhost/api/v1/about",
+        method="GET",
+        route="/api/v1/about",
+        startTime=now,
+    )
+    http_record.http_response = HttpResponseLog(status=200, endTime=now, totalTime=3)
+    return {"message": record, "http": http_record}
+
+
+def run(records: int) -> None:
+    formatter = SafeJsonFormatter()
+    for name, record in get_records().items():
+        for method in (formatter.format, formatter.format_with_models):
+            elapsed = timeit.timeit(functools.partial(method, record), number=records)
+            print(
+                f"{name:<8} {method.__name__:<20} {records / elapsed:>10.0f} records/s"
+            )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,105 @@
+"""
+Measure `QueueProvider.publish_many` throughput, compared with opening a channel per
+message and with waiting for every confirm before publishing the next message.
+
+Doesn't need RabbitMQ, an in-process stand-in adds a broker round trip of `rtt_ms`
+to opening channels, declaring exchanges and confirming every message.
+
+Usage::
+
+    python -m benchmarks.publish_throughput [messages] [rtt_ms]
+"""
+
+import asyncio
+import sys
+import time
+from collections.abc import Awaitable, Callable
+
+from app.datasources.queue.queue_provider import QueueProvider
+
+
+class StandInExchange:
+    def __init__(self, rtt: float) -> None:
+        self.rtt = rtt
+        self.published = 0
+
+    async def publish(self, message, routing_key: str) -> None:
+        # Message is sent right away, the confirm arrives after a round trip
+        await asyncio.sleep(self.rtt)
+        self.published += 1
+
+
+class StandInChannel:
+    def __init__(self, rtt: float) -> None:
+        self.rtt = rtt
+
+    async def declare_exchange(self, *args, **kwargs) -> StandInExchange:
+        await asyncio.sleep(self.rtt)
+        return StandInExchange(self.rtt)
+
+    async def close(self) -> None:
+        await asyncio.sleep(self.rtt)
+
+
+class StandInConnection:
+    def __init__(self, rtt: float) -> None:
+        self.rtt = rtt
+
+    async def channel(self, publisher_confirms: bool = True) -> StandInChannel:
+        await asyncio.sleep(self.rtt)
+        return StandInChannel(self.rtt)
+
+    async def ready(self) -> None:
+        pass
+
+
+async def channel_per_message(connection: StandInConnection, bodies: list[bytes]):
+    for body in bodies:
+        channel = await connection.channel()
+        exchange = await channel.declare_exchange()
+        await exchange.publish(body, routing_key="")
+        await channel.close()
+
+
+async def confirm_per_message(connection: StandInConnection, bodies: list[bytes]):
+    channel = await connection.channel()
+    exchange = await channel.declare_exchange()
+    for body in bodies:
+        await exchange.publish(body, routing_key="")
+
+
+async def pooled_publish_many(connection: StandInConnection, bodies: list[bytes]):
+    queue_provider = QueueProvider()
+    queue_provider._connection = connection  # type: ignore[assignment]
+    await queue_provider.publish_many(bodies)
+
+
+async def measure(
+    publish: Callable[[StandInConnection, list[bytes]], Awaitable[None]],
+    messages: int,
+    rtt: float,
+) -> float:
+    bodies = [b'{"type": "NEW_CONFIRMATION"}'] * messages
+    start = time.perf_counter()
+    await publish(StandInConnection(rtt), bodies)
+    return messages / (time.perf_counter() - start)
+
+
+async def run(messages: int, rtt_ms: float) -> None:
+    rtt = rtt_ms / 1000
+    for name, publish, count in (
+        # Slower strategies publish less messages to keep the benchmark short
+        ("channel per message", channel_per_message, max(messages // 100, 1)),
+        ("confirm per message", confirm_per_message, max(messages // 10, 1)),
+        ("publish_many", pooled_publish_many, messages),
+    ):
+        print(f"{name:<20} {await measure(publish, count, rtt):>12.0f} messages/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        run(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 20_000,
+            float(sys.argv[2]) if len(sys.argv) > 2 else 1.0,
+        )
+    )
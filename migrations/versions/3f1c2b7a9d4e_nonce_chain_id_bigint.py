@@ -0,0 +1,47 @@
+"""Store nonce and chain_id as BIGINT
+
+Revision ID: 3f1c2b7a9d4e
+Revises: 80d8da42b17a
+Create Date: 2026-10-18 09:12:44.318205
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+from app.datasources.db.fields import Uint256Type, UintBigIntegerType
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c2b7a9d4e"
+down_revision: str | Sequence[str] | None = "80d8da42b17a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Indexes on the columns (`ix_multisigtransaction_nonce`, `ix__multisigtransaction_safe_sorted`)
+    # are rebuilt by Postgres
+    for column in ("chain_id", "nonce"):
+        op.alter_column(
+            "multisigtransaction",
+            column,
+            existing_type=Uint256Type(),
+            type_=UintBigIntegerType(),
+            existing_nullable=False,
+            postgresql_using=f"{column}::bigint",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in ("chain_id", "nonce"):
+        op.alter_column(
+            "multisigtransaction",
+            column,
+            existing_type=UintBigIntegerType(),
+            type_=Uint256Type(),
+            existing_nullable=False,
+            postgresql_using=f"{column}::numeric(78, 0)",
+        )
@@ -0,0 +1,32 @@
+"""Index multisigtransaction by modified
+
+Revision ID: 9b4e6f0c2a51
+Revises: 3f1c2b7a9d4e
+Create Date: 2026-10-18 10:03:17.552914
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b4e6f0c2a51"
+down_revision: str | Sequence[str] | None = "3f1c2b7a9d4e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix__multisigtransaction_modified",
+        "multisigtransaction",
+        ["modified", "safe_tx_hash"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix__multisigtransaction_modified", table_name="multisigtransaction")
@@ -0,0 +1,35 @@
+"""Index multisigtransaction by safe, chain_id and modified
+
+Revision ID: c7d215e8f3a0
+Revises: 9b4e6f0c2a51
+Create Date: 2026-10-18 10:41:09.128736
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d215e8f3a0"
+down_revision: str | Sequence[str] | None = "9b4e6f0c2a51"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix__multisigtransaction_safe_chain_modified",
+        "multisigtransaction",
+        ["safe", "chain_id", "modified"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix__multisigtransaction_safe_chain_modified",
+        table_name="multisigtransaction",
+    )
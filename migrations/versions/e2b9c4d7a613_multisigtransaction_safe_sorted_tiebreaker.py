@@ -0,0 +1,49 @@
+"""Add safe_tx_hash to ix__multisigtransaction_safe_sorted
+
+Revision ID: e2b9c4d7a613
+Revises: d4a8e2f61b97
+Create Date: 2026-10-18 16:02:44.310529
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b9c4d7a613"
+down_revision: str | Sequence[str] | None = "d4a8e2f61b97"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index(
+        "ix__multisigtransaction_safe_sorted", table_name="multisigtransaction"
+    )
+    op.create_index(
+        "ix__multisigtransaction_safe_sorted",
+        "multisigtransaction",
+        [
+            "safe",
+            sa.literal_column("nonce DESC"),
+            sa.literal_column("created DESC"),
+            sa.literal_column("safe_tx_hash DESC"),
+        ],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix__multisigtransaction_safe_sorted", table_name="multisigtransaction"
+    )
+    op.create_index(
+        "ix__multisigtransaction_safe_sorted",
+        "multisigtransaction",
+        ["safe", sa.literal_column("nonce DESC"), sa.literal_column("created DESC")],
+        unique=False,
+    )